@@ -0,0 +1,60 @@
+"""Micro-benchmark: frontmatter codec versus plain PyYAML.
+
+Run with:  uv run python benchmarks/bench_frontmatter.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mcp_notes.lib.frontmatter import dump_frontmatter, load_frontmatter
+from mcp_notes.lib.markdown import create_default_frontmatter, format_markdown, parse_markdown
+
+
+FRONTMATTER = create_default_frontmatter(
+    "Python Async Patterns",
+    summary="Discussion about Python async/await patterns and best practices",
+    tags=["python", "async", "programming", "best-practices"],
+    conversation_id="conv_20250614_001",
+    ai_client="claude-desktop",
+)
+DATA = FRONTMATTER.model_dump(exclude_none=True)
+TEXT = yaml.dump(DATA, default_flow_style=False, sort_keys=False)
+NOTE = format_markdown(FRONTMATTER, "# Python Async Patterns\n\n" + "Some body text.\n" * 200)
+
+
+def bench(label: str, func, number: int = 2000) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    per_call = seconds / number * 1e6
+    print(f"{label:<40} {per_call:8.2f} us/call")
+    return per_call
+
+
+def main() -> None:
+    assert dump_frontmatter(DATA) == TEXT
+    assert load_frontmatter(TEXT) == yaml.safe_load(TEXT)
+
+    print(f"libyaml available: {yaml.__with_libyaml__}\n")
+
+    old = bench("load: yaml.safe_load", lambda: yaml.safe_load(TEXT))
+    if yaml.__with_libyaml__:
+        bench("load: yaml CSafeLoader", lambda: yaml.load(TEXT, Loader=yaml.CSafeLoader))
+    new = bench("load: load_frontmatter", lambda: load_frontmatter(TEXT))
+    print(f"{'':<40} {old / new:8.1f}x faster\n")
+
+    old = bench("dump: yaml.dump", lambda: yaml.dump(DATA, default_flow_style=False, sort_keys=False))
+    if yaml.__with_libyaml__:
+        bench("dump: yaml CSafeDumper", lambda: yaml.dump(
+            DATA, Dumper=yaml.CSafeDumper, default_flow_style=False, sort_keys=False))
+    new = bench("dump: dump_frontmatter", lambda: dump_frontmatter(DATA))
+    print(f"{'':<40} {old / new:8.1f}x faster\n")
+
+    bench("parse_markdown (whole note)", lambda: parse_markdown(NOTE), number=500)
+
+
+if __name__ == "__main__":
+    main()
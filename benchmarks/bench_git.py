@@ -0,0 +1,64 @@
+"""Cost of committing one note as the number of tracked files grows.
+
+Builds a repository with N tracked notes in nested folders (via git
+fast-import, so setup is quick), then times commits of new notes with
+the "index" (GitPython Repo.index) and "plumbing" backends.
+
+Run with:  uv run python benchmarks/bench_git.py [file_count ...]
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mcp_notes.lib.git import BACKENDS, GitManager
+
+
+COMMITS = 5
+
+
+def make_repo(path: Path, count: int) -> None:
+    """A repository whose HEAD and index track `count` notes."""
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    for key, value in (("user.name", "Bench"), ("user.email", "bench@example.com")):
+        subprocess.run(["git", "config", key, value], cwd=path, check=True)
+
+    content = b"# Note\n\nSome body text for the benchmark.\n"
+    lines = [b"blob\nmark :1\n", b"data %d\n" % len(content), content, b"\n"]
+    lines.append(b"commit refs/heads/master\ncommitter Bench <bench@example.com> 0 +0000\ndata 4\ninit\n")
+    for i in range(count):
+        lines.append(b"M 100644 :1 folder-%03d/note-%06d.md\n" % (i % 100, i))
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=b"".join(lines), check=True)
+    subprocess.run(["git", "read-tree", "HEAD"], cwd=path, check=True)
+
+
+def time_backend(path: Path, backend: str) -> float:
+    """Mean seconds per single-note commit."""
+    manager = GitManager(str(path), backend)
+    elapsed = 0.0
+    for i in range(COMMITS):
+        filename = f"new/{backend}-{i}.md"
+        (path / "new").mkdir(exist_ok=True)
+        (path / filename).write_text(f"# New note {i}\n", encoding='utf-8')
+        start = time.perf_counter()
+        manager.commit_notes([filename], f"Add note: {i}")
+        elapsed += time.perf_counter() - start
+    return elapsed / COMMITS
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for count in counts:
+        with tempfile.TemporaryDirectory() as temp:
+            path = Path(temp) / "vault"
+            make_repo(path, count)
+            for backend in BACKENDS:
+                print(f"{count:>7} files  {backend:<9} {time_backend(path, backend) * 1000:8.1f} ms/commit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Resident memory per indexed note.
+
+Compares a pydantic NoteFrontmatter with the slotted NoteHeader used
+internally, and reports the memory held by a NoteIndex per note.
+
+Run with:  uv run python benchmarks/bench_memory.py [note_count]
+"""
+
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mcp_notes.lib.file_manager import FileManager
+from mcp_notes.lib.index import NoteIndex
+from mcp_notes.lib.markdown import create_default_frontmatter, format_markdown
+from mcp_notes.lib.records import NoteHeader
+from mcp_notes.lib.types import NoteFrontmatter
+
+
+TAGS = ["python", "async", "programming", "meeting", "rust", "ideas"]
+
+
+def frontmatter_data(i: int) -> dict:
+    front = create_default_frontmatter(
+        f"Note {i}",
+        summary=f"Summary of note {i}",
+        tags=TAGS[i % 4:i % 4 + 3],
+        conversation_id=f"conv_{i}",
+        ai_client="claude-desktop",
+    )
+    return front.model_dump(exclude_none=True)
+
+
+def measure(build) -> int:
+    """Bytes still allocated after build() returns (kept alive by the result)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    # Copies so that both record types start from freshly loaded strings
+    data = [frontmatter_data(i) for i in range(count)]
+
+    models = measure(lambda: [NoteFrontmatter(**dict(d, tags=list(d['tags']))) for d in data])
+    headers = measure(lambda: [NoteHeader.from_dict(dict(d, tags=list(d['tags']))) for d in data])
+    print(f"NoteFrontmatter (pydantic)  {models / count:8.0f} bytes/note")
+    print(f"NoteHeader (__slots__)      {headers / count:8.0f} bytes/note")
+
+    with tempfile.TemporaryDirectory() as vault:
+        file_manager = FileManager(vault)
+        for i, d in enumerate(data):
+            content = format_markdown(NoteFrontmatter(**d), f"# Note {i}\n\nA short body for note {i}.")
+            file_manager.write_note(f"note-{i}.md", content)
+
+        index = NoteIndex(file_manager)
+        total = measure(lambda: index.refresh())
+        print(f"NoteIndex (all structures)  {total / count:8.0f} bytes/note")
+
+
+if __name__ == "__main__":
+    main()
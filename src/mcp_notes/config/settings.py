@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 def get_vault_path() -> str:
@@ -18,4 +18,102 @@ def get_vault_path() -> str:
 
 def get_git_commit_template() -> Optional[str]:
     """Get custom git commit message template."""
-    return os.getenv('GIT_COMMIT_TEMPLATE')
\ No newline at end of file
+    return os.getenv('GIT_COMMIT_TEMPLATE')
+
+
+def get_trigram_index_enabled() -> bool:
+    """Whether to maintain the trigram index used for substring search."""
+    return os.getenv('MCP_NOTES_TRIGRAM_INDEX', '1').lower() not in ('0', 'false', 'no')
+
+
+def get_fuzzy_index_enabled() -> bool:
+    """Whether to maintain the deletion dictionary used for fuzzy search."""
+    return os.getenv('MCP_NOTES_FUZZY_INDEX', '1').lower() not in ('0', 'false', 'no')
+
+
+def get_cache_dir(vault_path: str) -> str:
+    """Get the directory for persisted indexes (inside the vault by default)."""
+    cache_dir = os.getenv('MCP_NOTES_CACHE_DIR')
+    if cache_dir:
+        return str(Path(cache_dir).expanduser().absolute())
+    return str(Path(vault_path) / '.mcp-notes')
+
+
+def get_vector_index_enabled() -> bool:
+    """Whether to maintain the embedding matrix used for semantic search."""
+    return os.getenv('MCP_NOTES_VECTOR_INDEX', '1').lower() not in ('0', 'false', 'no')
+
+
+def get_vector_dim() -> int:
+    """Get the embedding dimension for semantic search."""
+    return int(os.getenv('MCP_NOTES_VECTOR_DIM', '256'))
+
+
+def get_result_cache_entries() -> int:
+    """Get the maximum number of cached tool results (0 disables the cache)."""
+    return int(os.getenv('MCP_NOTES_RESULT_CACHE_ENTRIES', '256'))
+
+
+def get_result_cache_bytes() -> int:
+    """Get the maximum total size of cached tool results in bytes."""
+    return int(os.getenv('MCP_NOTES_RESULT_CACHE_BYTES', str(8 * 1024 * 1024)))
+
+
+def get_header_bytes() -> int:
+    """Get how many bytes to read looking for a note's frontmatter and title
+    before falling back to reading the whole note."""
+    return int(os.getenv('MCP_NOTES_HEADER_BYTES', str(64 * 1024)))
+
+
+def get_content_cache_bytes() -> int:
+    """Get the memory budget for cached note contents in bytes (0 disables the cache)."""
+    return int(os.getenv('MCP_NOTES_CONTENT_CACHE_BYTES', '0'))
+
+
+def get_ignore_patterns() -> List[str]:
+    """Get fnmatch patterns for vault files and folders that are not notes.
+    
+    Hidden folders such as .git and .obsidian are always skipped.
+    """
+    patterns = os.getenv('MCP_NOTES_IGNORE', '')
+    return [pattern.strip() for pattern in patterns.split(',') if pattern.strip()]
+
+
+def get_watcher_backend() -> str:
+    """Get how to watch the vault for external changes (auto, inotify, poll or off)."""
+    return os.getenv('MCP_NOTES_WATCHER', 'auto').lower()
+
+
+def get_watch_debounce() -> float:
+    """Get how long to wait for a burst of file changes to settle, in seconds."""
+    return int(os.getenv('MCP_NOTES_WATCH_DEBOUNCE_MS', '200')) / 1000
+
+
+def get_watch_poll_interval() -> float:
+    """Get the polling interval used when inotify is unavailable, in seconds."""
+    return float(os.getenv('MCP_NOTES_WATCH_POLL_INTERVAL', '2'))
+
+
+def get_max_workers() -> int:
+    """Get how many tool calls may do blocking work at the same time."""
+    return max(1, int(os.getenv('MCP_NOTES_WORKERS', '4')))
+
+
+def get_commit_window() -> float:
+    """Get how long to collect notes into one git commit, in seconds."""
+    return int(os.getenv('MCP_NOTES_COMMIT_WINDOW_MS', '500')) / 1000
+
+
+def get_commit_batch_size() -> int:
+    """Get the most notes committed to git together."""
+    return int(os.getenv('MCP_NOTES_COMMIT_BATCH', '50'))
+
+
+def get_git_backend() -> str:
+    """Get how notes are committed: "plumbing" (direct object writes) or "index" (GitPython index)."""
+    return os.getenv('MCP_NOTES_GIT_BACKEND', 'index').lower()
+
+
+def get_git_catch_up_enabled() -> bool:
+    """Whether to bring the catalog up to date from git changes instead of rescanning the vault."""
+    return os.getenv('MCP_NOTES_GIT_CATCHUP', '1').lower() not in ('0', 'false', 'no')
@@ -0,0 +1,174 @@
+"""Caches for tool results and note contents."""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def make_cache_key(tool: str, arguments: Dict[str, Any]) -> str:
+    """Build a cache key from a tool name and its validated arguments.
+
+    Arguments should already have defaults applied (e.g. a params model's
+    model_dump()), so equivalent calls produce the same key. Tag filters
+    are order-insensitive and are sorted.
+    """
+    normalised = dict(arguments)
+    if normalised.get('tags'):
+        normalised['tags'] = sorted(normalised['tags'])
+    return f"{tool}:{json.dumps(normalised, sort_keys=True, default=str)}"
+
+
+class ResultCache:
+    """LRU cache of tool results tagged with the vault generation.
+
+    An entry is only served if it was stored at the current generation,
+    so any write, delete or detected external change invalidates every
+    cached result at once. Bounded by both entry count and total bytes.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[int, str, int]]' = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, generation: int) -> Optional[str]:
+        """Get a cached result if it is current."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != generation:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, generation: int, value: str) -> None:
+        """Store a result computed at the given generation."""
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (generation, value, size)
+        self.bytes += size
+
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+
+class ContentCache:
+    """LRU cache of note contents validated against each file's stat.
+
+    An entry is only served while the note's (st_mtime_ns, st_size,
+    st_ino) still match the values recorded when it was stored, so edits
+    made outside the server are never hidden. Bounded by total bytes.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int, int], str, int]]' = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, filename: str, key: Tuple[int, int, int]) -> Optional[str]:
+        """Get a note's cached content if the file is unchanged."""
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is None or entry[0] != key:
+                if entry is not None:
+                    self._remove(filename)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(filename)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, filename: str, key: Tuple[int, int, int], content: str) -> None:
+        """Store a note's content as read at the given stat key."""
+        size = len(content) if content.isascii() else len(content.encode('utf-8'))
+        with self._lock:
+            if filename in self._entries:
+                self._remove(filename)
+            if size > self.max_bytes:
+                return
+
+            self._entries[filename] = (key, content, size)
+            self.bytes += size
+
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def discard(self, filename: str) -> None:
+        """Drop a note's cached content, if any."""
+        with self._lock:
+            if filename in self._entries:
+                self._remove(filename)
+
+    def clear(self) -> None:
+        """Drop all cached contents."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, filename: str) -> None:
+        _, _, size = self._entries.pop(filename)
+        self.bytes -= size
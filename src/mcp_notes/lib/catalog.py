@@ -0,0 +1,300 @@
+"""SQLite catalog of note metadata for listing."""
+
+import base64
+import binascii
+import json
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from .database import open_sqlite
+from .file_manager import FileManager, stat_key
+from .markdown import scan_note
+from .records import NoteRecord
+
+
+CATALOG_FILENAME = "catalog.sqlite3"
+
+SCHEMA_VERSION = 2
+
+SORT_COLUMNS = ('created', 'updated', 'title')
+
+SCHEMA = """
+CREATE TABLE notes (
+    filename TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    conversation_id TEXT,
+    ai_client TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    valid INTEGER NOT NULL
+);
+CREATE INDEX notes_created ON notes (created, filename);
+CREATE INDEX notes_updated ON notes (updated, filename);
+CREATE INDEX notes_title ON notes (title, filename);
+CREATE TABLE note_tags (
+    tag TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    PRIMARY KEY (tag, filename)
+) WITHOUT ROWID;
+CREATE INDEX note_tags_filename ON note_tags (filename);
+CREATE TABLE unsynced (
+    filename TEXT PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def encode_cursor(sort_by: str, sort_order: str, key: str, filename: str) -> str:
+    """Opaque cursor for the position after (key, filename) in a listing."""
+    data = json.dumps([sort_by, sort_order, key, filename], separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, str, str]:
+    """Decode a cursor into (sort_by, sort_order, key, filename)."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_by, sort_order, key, filename = json.loads(data.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    return sort_by, sort_order, key, filename
+
+
+class NoteCatalog:
+    """Note metadata held in an embedded SQLite database.
+
+    Listing, tag filtering, sorting and pagination run as one indexed
+    query instead of parsing every note. The catalog is reconciled with
+    the vault by comparing each file's mtime and size with the stored
+    values, so only new or modified notes are parsed, and only their
+    headers are read from disk. Notes that fail
+    to parse are recorded as invalid so they are not reparsed until they
+    change.
+
+    A checkpoint records a git commit the catalog matches, apart from a
+    set of unsynced notes; every note stored or removed afterwards joins
+    that set. After a restart only the notes changed in git since the
+    checkpoint, the dirty ones and the unsynced ones need to be checked.
+
+    With a path the catalog persists across restarts; without one it is
+    kept in memory. The connection may be used from any thread, but
+    callers must not use the catalog from two threads at once.
+    """
+
+    def __init__(self, file_manager: FileManager, path: Optional[str] = None):
+        self.file_manager = file_manager
+        self.path = path
+        self.connection = open_sqlite(path, SCHEMA, SCHEMA_VERSION)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM notes WHERE valid").fetchone()[0]
+
+    def refresh(self, filenames: Optional[Iterable[str]] = None) -> bool:
+        """Bring the catalog up to date with the vault.
+
+        If filenames is given, only those notes are checked. Returns True
+        if any note was added, updated or removed, in which case the file
+        manager's generation is bumped.
+        """
+        if filenames is None:
+            current = self.file_manager.scan_notes()
+            stored = {
+                filename: (mtime_ns, size)
+                for filename, mtime_ns, size in self.connection.execute("SELECT filename, mtime_ns, size FROM notes")
+            }
+        else:
+            current = {}
+            stored = {}
+            for filename in dict.fromkeys(filenames):
+                try:
+                    current[filename] = stat_key(self.file_manager.get_note_path(filename).stat())
+                except OSError:
+                    pass
+                row = self.connection.execute(
+                    "SELECT mtime_ns, size FROM notes WHERE filename = ?", (filename,)
+                ).fetchone()
+                if row is not None:
+                    stored[filename] = tuple(row)
+
+        changed = False
+        with self.connection:
+            for filename, (mtime_ns, size, _) in current.items():
+                if stored.pop(filename, None) != (mtime_ns, size):
+                    self._store(filename)
+                    changed = True
+
+            # Whatever is left was not found on disk
+            for filename in stored:
+                self._delete(filename)
+                changed = True
+        if changed:
+            self.file_manager.bump_generation()
+        return changed
+
+    def update_note(self, filename: str, content: Optional[str] = None) -> None:
+        """Catalog a single note, reading it from disk if content is not given."""
+        with self.connection:
+            self._store(filename, content)
+
+    def remove_note(self, filename: str) -> None:
+        """Drop a note from the catalog."""
+        with self.connection:
+            self._delete(filename)
+
+    def checkpoint(self, ignore: Sequence[str] = ()) -> Optional[Tuple[str, List[str]]]:
+        """The commit recorded by set_checkpoint, and the notes that may
+        be cataloged differently from how they are in it.
+
+        Every other note is cataloged as it is in that commit. Returns
+        None if no checkpoint was recorded, or it was recorded with other
+        ignore patterns.
+        """
+        rows = dict(self.connection.execute("SELECT key, value FROM state"))
+        if 'commit' not in rows or rows.get('ignore') != json.dumps(list(ignore)):
+            return None
+        unsynced = [filename for (filename,) in self.connection.execute("SELECT filename FROM unsynced")]
+        return rows['commit'], unsynced
+
+    def set_checkpoint(self, commit: str, unsynced: Iterable[str], ignore: Sequence[str] = ()) -> None:
+        """Record that the catalog matches a commit, apart from the unsynced notes.
+
+        Notes stored or removed from now on are added to the unsynced set.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM unsynced")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO unsynced (filename) VALUES (?)", [(filename,) for filename in unsynced]
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                [('commit', commit), ('ignore', json.dumps(list(ignore)))]
+            )
+
+    def list_notes(
+        self,
+        tags: Optional[List[str]] = None,
+        tag_mode: str = "any",
+        sort_by: str = "created",
+        sort_order: str = "desc",
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[NoteRecord], int, Optional[str]]:
+        """A page of note metadata, the total number of matching notes and
+        a cursor for the next page (None on the last page).
+
+        Notes are ordered by sort_by (created, updated or title), with
+        the filename breaking ties. A cursor from a previous page seeks
+        straight past the last note returned (offset is then ignored), so
+        each page is an index range scan and notes created between pages
+        do not shift the results.
+        """
+        column = sort_by if sort_by in SORT_COLUMNS else 'created'
+        direction = 'DESC' if sort_order == 'desc' else 'ASC'
+
+        where, params = self._filter(tags, tag_mode)
+        total = self.connection.execute(f"SELECT COUNT(*) FROM notes WHERE {where}", params).fetchone()[0]
+
+        if cursor:
+            cursor_sort_by, cursor_sort_order, key, filename = decode_cursor(cursor)
+            if (cursor_sort_by, cursor_sort_order) != (column, direction.lower()):
+                raise ValueError("Cursor does not match the requested sort order")
+            comparison = '<' if direction == 'DESC' else '>'
+            where = f"{where} AND ({column}, filename) {comparison} (?, ?)"
+            params = params + [key, filename]
+            offset = 0
+
+        rows = self.connection.execute(
+            f"SELECT filename, title, summary, tags, created, updated, conversation_id, ai_client "
+            f"FROM notes WHERE {where} "
+            f"ORDER BY {column} {direction}, filename {direction} LIMIT ? OFFSET ?",
+            params + [limit + 1, offset]
+        ).fetchall()
+
+        notes = [self._row_to_note(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit and notes:
+            last = notes[-1]
+            next_cursor = encode_cursor(column, direction.lower(), getattr(last, column), last.filename)
+        return notes, total, next_cursor
+
+    def _filter(self, tags: Optional[List[str]], tag_mode: str) -> Tuple[str, List[Any]]:
+        """SQL condition and parameters for the tag filter."""
+        if not tags:
+            return "valid", []
+
+        tags = list(dict.fromkeys(tags))
+        placeholders = ", ".join("?" * len(tags))
+        if tag_mode == "any":
+            return f"valid AND filename IN (SELECT filename FROM note_tags WHERE tag IN ({placeholders}))", tags
+        if tag_mode == "all":
+            return (
+                f"valid AND filename IN (SELECT filename FROM note_tags WHERE tag IN ({placeholders}) "
+                f"GROUP BY filename HAVING COUNT(*) = ?)",
+                tags + [len(tags)]
+            )
+        if tag_mode == "none":
+            return f"valid AND filename NOT IN (SELECT filename FROM note_tags WHERE tag IN ({placeholders}))", tags
+        raise ValueError(f"Unknown tag mode: {tag_mode}")
+
+    def _row_to_note(self, row: Tuple) -> NoteRecord:
+        filename, title, summary, tags, created, updated, conversation_id, ai_client = row
+        return NoteRecord(filename, title, summary, json.loads(tags), created, updated, conversation_id, ai_client)
+
+    def _store(self, filename: str, content: Optional[str] = None) -> None:
+        self.connection.execute("INSERT OR IGNORE INTO unsynced (filename) VALUES (?)", (filename,))
+        try:
+            stat = self.file_manager.get_note_path(filename).stat()
+        except OSError:
+            self._delete(filename)
+            return
+
+        self.connection.execute("DELETE FROM note_tags WHERE filename = ?", (filename,))
+        try:
+            if content is None:
+                content = self.file_manager.read_header(filename)
+            scanned = scan_note(content)
+        except Exception:
+            # Remember the file so it is only retried once it changes
+            self.connection.execute(
+                "INSERT OR REPLACE INTO notes VALUES (?, '', '', '[]', '', '', NULL, NULL, ?, ?, 0)",
+                (filename, stat.st_size, stat.st_mtime_ns)
+            )
+            return
+
+        frontmatter = scanned.header
+        tags = list(dict.fromkeys(frontmatter.tags))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+            (
+                filename,
+                scanned.title or "Untitled Note",
+                frontmatter.summary,
+                json.dumps(list(frontmatter.tags)),
+                frontmatter.created,
+                frontmatter.updated,
+                frontmatter.conversation_id,
+                frontmatter.ai_client,
+                stat.st_size,
+                stat.st_mtime_ns,
+            )
+        )
+        self.connection.executemany(
+            "INSERT INTO note_tags (tag, filename) VALUES (?, ?)",
+            [(tag, filename) for tag in tags]
+        )
+
+    def _delete(self, filename: str) -> None:
+        self.connection.execute("INSERT OR IGNORE INTO unsynced (filename) VALUES (?)", (filename,))
+        self.connection.execute("DELETE FROM notes WHERE filename = ?", (filename,))
+        self.connection.execute("DELETE FROM note_tags WHERE filename = ?", (filename,))
@@ -0,0 +1,40 @@
+"""SQLite files for persisted indexes."""
+
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+
+def open_sqlite(path: Optional[str], schema: str, version: int) -> sqlite3.Connection:
+    """Open a database with the given schema, recreating it if it is unreadable or outdated.
+
+    The schema version is kept in PRAGMA user_version. A database without a
+    path is held in memory.
+    """
+    if path is None:
+        connection = sqlite3.connect(":memory:", check_same_thread=False)
+        _create_schema(connection, schema, version)
+        return connection
+
+    try:
+        connection = sqlite3.connect(path, check_same_thread=False)
+        found = connection.execute("PRAGMA user_version").fetchone()[0]
+    except sqlite3.DatabaseError:
+        connection = None
+        found = None
+
+    if found == version:
+        return connection
+
+    if connection is not None:
+        connection.close()
+    Path(path).unlink(missing_ok=True)
+    connection = sqlite3.connect(path, check_same_thread=False)
+    _create_schema(connection, schema, version)
+    return connection
+
+
+def _create_schema(connection: sqlite3.Connection, schema: str, version: int) -> None:
+    connection.executescript(schema)
+    connection.execute(f"PRAGMA user_version = {version}")
+    connection.commit()
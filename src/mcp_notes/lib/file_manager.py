@@ -2,17 +2,76 @@
 
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from .markdown import generate_filename, kebab_case
+from .cache import ContentCache
+from .markdown import generate_filename, header_length, kebab_case
+from .walker import VaultWalker
+
+
+HEADER_CHUNK_BYTES = 4096
+
+DEFAULT_HEADER_BYTES = 64 * 1024
+
+
+def stat_key(stat: os.stat_result) -> Tuple[int, int, int]:
+    """Identity of a file's contents: (st_mtime_ns, st_size, st_ino)."""
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def crlf_offsets(data: bytes) -> List[int]:
+    """Byte offsets in the newline-translated text of the line breaks that
+    are '\r\n' in data, in ascending order."""
+    offsets: List[int] = []
+    pos = data.find(b'\r\n')
+    while pos != -1:
+        offsets.append(pos - len(offsets))
+        pos = data.find(b'\r\n', pos + 2)
+    return offsets
+
+
+def prepare_cache_dir(cache_dir: str) -> Path:
+    """Create the index cache directory, keeping it out of git."""
+    path = Path(cache_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    gitignore = path / '.gitignore'
+    if not gitignore.exists():
+        gitignore.write_text('*\n', encoding='utf-8')
+    return path
 
 
 class FileManager:
-    """Manages file operations for notes."""
+    """Manages file operations for notes.
+    
+    The generation counter increases on every write or delete made through
+    the manager, and whenever an external change to the vault is detected,
+    so derived results can be tagged with the vault state they reflect.
+    
+    If content_cache_bytes is positive, note contents read or written
+    through the manager are kept in a ContentCache of that size.
+    
+    Notes are found recursively; filenames are paths relative to the vault
+    (e.g. "projects/plan.md"). ignore_patterns are passed to the VaultWalker.
+    """
     
-    def __init__(self, vault_path: str):
+    def __init__(
+        self,
+        vault_path: str,
+        header_bytes: int = DEFAULT_HEADER_BYTES,
+        content_cache_bytes: int = 0,
+        ignore_patterns: Sequence[str] = (),
+    ):
         self.vault_path = Path(vault_path)
         self.vault_path.mkdir(parents=True, exist_ok=True)
+        self.walker = VaultWalker(self.vault_path, ignore_patterns)
+        self.header_bytes = header_bytes
+        self.generation = 0
+        self.content_cache = ContentCache(content_cache_bytes) if content_cache_bytes > 0 else None
+    
+    def bump_generation(self) -> int:
+        """Record that the vault contents changed."""
+        self.generation += 1
+        return self.generation
     
     def generate_filename(self, title: str) -> str:
         """Generate a safe filename from title."""
@@ -30,26 +89,113 @@ class FileManager:
         """Write note content to file."""
         note_path = self.get_note_path(filename)
         note_path.write_text(content, encoding='utf-8')
+        self.bump_generation()
+        if self.content_cache is not None:
+            # Store what read_note would return for the file just written
+            self.content_cache.put(filename, stat_key(os.stat(note_path)), self._translate(content))
     
     def read_note(self, filename: str) -> str:
-        """Read note content from file."""
+        """Read note content from file, or from the content cache if enabled."""
+        note_path = self.get_note_path(filename)
+        if self.content_cache is None:
+            if not note_path.exists():
+                raise FileNotFoundError(f"Note not found: {filename}")
+            return note_path.read_text(encoding='utf-8')
+
+        try:
+            f = open(note_path, encoding='utf-8')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Note not found: {filename}") from None
+        with f:
+            # Stat the open file before reading, so a concurrent edit can
+            # only make the entry look stale, never make stale content current
+            key = stat_key(os.fstat(f.fileno()))
+            content = self.content_cache.get(filename, key)
+            if content is None:
+                content = f.read()
+                self.content_cache.put(filename, key, content)
+        return content
+    
+    def read_note_with_crlf(self, filename: str) -> Tuple[str, List[int]]:
+        """Read a note as read_note does, along with the crlf_offsets of the file.
+
+        The content cache is filled but not consulted, as it doesn't keep
+        the file's line endings.
+        """
+        note_path = self.get_note_path(filename)
+        try:
+            f = open(note_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Note not found: {filename}") from None
+        with f:
+            key = stat_key(os.fstat(f.fileno()))
+            data = f.read()
+        content = self._decode(data)
+        if self.content_cache is not None:
+            self.content_cache.put(filename, key, content)
+        return content, crlf_offsets(data)
+    
+    def read_header(self, filename: str) -> str:
+        """Read just the frontmatter and first heading of a note.
+
+        The file is read in small chunks until the header is complete. If
+        it isn't within header_bytes, the whole note is read instead, so
+        parsing the result always gives the same frontmatter and title as
+        parsing read_note(). Newlines are translated as read_note does.
+        """
         note_path = self.get_note_path(filename)
         if not note_path.exists():
             raise FileNotFoundError(f"Note not found: {filename}")
-        return note_path.read_text(encoding='utf-8')
+
+        data = b''
+        with open(note_path, 'rb') as f:
+            while len(data) < self.header_bytes:
+                chunk = f.read(HEADER_CHUNK_BYTES)
+                if not chunk:
+                    return self._decode(data)
+                data += chunk
+
+                # Only complete lines, so no character or \r\n is split
+                complete = data[:data.rfind(b'\n') + 1]
+                text = self._decode(complete)
+                end = header_length(text)
+                if end is not None:
+                    return text[:end]
+
+            data += f.read()
+        return self._decode(data)
+
+    def _decode(self, data: bytes) -> str:
+        return self._translate(data.decode('utf-8'))
+
+    def _translate(self, text: str) -> str:
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def read_note_range(self, filename: str, start: int, length: int) -> bytes:
+        """Read a byte range of a note without loading the whole file."""
+        note_path = self.get_note_path(filename)
+        if not note_path.exists():
+            raise FileNotFoundError(f"Note not found: {filename}")
+        with open(note_path, 'rb') as f:
+            f.seek(start)
+            return f.read(length)
     
     def list_notes(self) -> List[str]:
-        """List all markdown note files."""
-        notes = []
-        for file_path in self.vault_path.glob("*.md"):
-            notes.append(file_path.name)
-        return sorted(notes)
+        """List all markdown note files, including those in subfolders."""
+        return self.walker.list_notes()
+    
+    def scan_notes(self) -> Dict[str, Tuple[int, int, int]]:
+        """List all notes with their stat_key, from a single walk of the vault."""
+        return self.walker.scan()
     
     def delete_note(self, filename: str) -> None:
         """Delete a note file."""
         note_path = self.get_note_path(filename)
+        if self.content_cache is not None:
+            self.content_cache.discard(filename)
         if note_path.exists():
             note_path.unlink()
+            self.bump_generation()
     
     def get_note_stats(self, filename: str) -> dict:
         """Get file statistics for a note."""
@@ -0,0 +1,174 @@
+"""Fast YAML codec for note frontmatter."""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import yaml
+from yaml.emitter import Emitter
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+# libyaml is only used for loading: its emitter folds long scalars
+# differently from the pure-Python one yaml.dump uses
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader
+
+
+STR_TAG = 'tag:yaml.org,2002:str'
+
+# PyYAML's default line width; longer scalars may be folded
+LINE_WIDTH = 80
+
+# Strings that PyYAML's emitter analysis always allows as plain (in block
+# and flow context) or single-quoted scalars. Anything else is analysed
+# character by character.
+SAFE_PLAIN_PATTERN = re.compile(r'[A-Za-z0-9_](?:[A-Za-z0-9_ ./()+-]*[A-Za-z0-9_./()+-])?')
+SAFE_QUOTED_PATTERN = re.compile(r'[\x20-\x7e]*')
+
+KEY_PATTERN = re.compile(r'([A-Za-z_][A-Za-z0-9_]*):(?: +(.*))?')
+ITEM_PATTERN = re.compile(r'( *)- +(.*)')
+
+_resolver = Resolver()
+# analyze_scalar only needs allow_unicode; the stream is never written
+_dump_analyzer = Emitter(None)
+_load_analyzer = Emitter(None, allow_unicode=True)
+
+
+class _Fallback(Exception):
+    """Raised when the fast path can't be sure to match PyYAML."""
+
+
+def load_frontmatter(text: str) -> Any:
+    """Parse a frontmatter block.
+
+    Flat mappings of plain or single-quoted strings and string lists (the
+    NoteFrontmatter schema) are parsed directly. Anything else goes through
+    PyYAML's safe loader, so the result always matches yaml.safe_load.
+    """
+    try:
+        return _load_flat(text)
+    except _Fallback:
+        return yaml.load(text, Loader=SafeLoader)
+
+
+def dump_frontmatter(data: Dict[str, Any]) -> str:
+    """Serialise frontmatter exactly as yaml.dump(data, default_flow_style=False, sort_keys=False)."""
+    try:
+        return _dump_flat(data)
+    except _Fallback:
+        return yaml.dump(data, default_flow_style=False, sort_keys=False)
+
+
+def _dump_flat(data: Dict[str, Any]) -> str:
+    lines = []
+    for key, value in data.items():
+        if not isinstance(key, str) or not KEY_PATTERN.fullmatch(f"{key}:") or not _resolves_to_str(key):
+            raise _Fallback()
+
+        if isinstance(value, str):
+            lines.append(f"{key}: {_render_scalar(value, len(key) + 2)}")
+        elif isinstance(value, list) and all(isinstance(item, str) for item in value):
+            if not value:
+                lines.append(f"{key}: []")
+                continue
+            lines.append(f"{key}:")
+            lines.extend(f"- {_render_scalar(item, 2)}" for item in value)
+        else:
+            raise _Fallback()
+    if not lines:
+        raise _Fallback()
+    return '\n'.join(lines) + '\n'
+
+
+def _render_scalar(value: str, column: int) -> str:
+    """Render a block-context string scalar the way PyYAML's emitter would."""
+    if SAFE_PLAIN_PATTERN.fullmatch(value):
+        plain = _resolves_to_str(value)
+    elif SAFE_QUOTED_PATTERN.fullmatch(value) and not _resolves_to_str(value):
+        plain = False
+    else:
+        analysis = _dump_analyzer.analyze_scalar(value)
+        if analysis.multiline or not (analysis.allow_block_plain or analysis.allow_single_quoted):
+            # Double-quoted scalars need escaping
+            raise _Fallback()
+        plain = analysis.allow_block_plain and _resolves_to_str(value)
+
+    rendered = value if plain else "'" + value.replace("'", "''") + "'"
+
+    if column + len(rendered) > LINE_WIDTH:
+        raise _Fallback()
+    return rendered
+
+
+def _load_flat(text: str) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    list_key: Optional[str] = None
+    list_indent: Optional[int] = None
+    for line in text.split('\n'):
+        if not line.strip():
+            continue
+
+        match = ITEM_PATTERN.fullmatch(line)
+        if match:
+            if list_key is None:
+                raise _Fallback()
+            indent = len(match.group(1))
+            if result[list_key] is None:
+                result[list_key] = []
+                list_indent = indent
+            elif indent != list_indent:
+                # YAML reads these as a continuation or rejects them
+                raise _Fallback()
+            result[list_key].append(_parse_scalar(match.group(2).rstrip(' '), flow=False))
+            continue
+
+        match = KEY_PATTERN.fullmatch(line)
+        if not match or match.group(1) in result or not _resolves_to_str(match.group(1)):
+            raise _Fallback()
+
+        key, raw = match.group(1), (match.group(2) or '').rstrip(' ')
+        if not raw:
+            # Null unless a block sequence follows
+            result[key] = None
+            list_key = key
+        elif raw.startswith('[') and raw.endswith(']'):
+            result[key] = _parse_flow_list(raw[1:-1])
+            list_key = None
+        else:
+            result[key] = _parse_scalar(raw, flow=False)
+            list_key = None
+
+    if not result:
+        raise _Fallback()
+    return result
+
+
+def _parse_flow_list(inner: str) -> List[str]:
+    inner = inner.strip(' ')
+    if not inner:
+        return []
+    return [_parse_scalar(item.strip(' '), flow=True) for item in inner.split(',')]
+
+
+def _parse_scalar(raw: str, flow: bool) -> str:
+    if raw.startswith("'"):
+        inner = raw[1:-1]
+        if flow or len(raw) < 2 or not raw.endswith("'") or "'" in inner.replace("''", ""):
+            raise _Fallback()
+        return inner.replace("''", "'")
+
+    if not SAFE_PLAIN_PATTERN.fullmatch(raw):
+        analysis = _load_analyzer.analyze_scalar(raw)
+        allowed = analysis.allow_flow_plain if flow else analysis.allow_block_plain
+        if not allowed or analysis.empty or analysis.multiline:
+            raise _Fallback()
+    if not _resolves_to_str(raw):
+        raise _Fallback()
+    return raw
+
+
+def _resolves_to_str(value: str) -> bool:
+    """Whether a plain scalar is read back as a string (not a date, number, etc.)."""
+    return _resolver.resolve(ScalarNode, value, (True, False)) == STR_TAG
@@ -0,0 +1,138 @@
+"""Typo-tolerant term expansion over the index vocabulary."""
+
+from typing import Dict, List, Set
+
+from .index import IndexedNote, NoteIndex
+
+
+MAX_EDIT_DISTANCE = 2
+
+# Deletes are generated from this many leading characters only, so a term
+# contributes at most 29 keys however long it is
+PREFIX_LENGTH = 7
+
+# Longer terms (hashes, URLs, base64) are matched exactly only
+MAX_TERM_LENGTH = 24
+
+
+def max_edit_distance(term: str) -> int:
+    """Edit distance allowed for a term: none for short terms, up to 2 for long ones."""
+    if len(term) <= 2:
+        return 0
+    if len(term) <= 5:
+        return 1
+    return MAX_EDIT_DISTANCE
+
+
+def is_fuzzy_term(term: str) -> bool:
+    """Whether a term goes in the deletion dictionary: not too long, and mostly letters."""
+    if len(term) > MAX_TERM_LENGTH:
+        return False
+    digits = sum(1 for char in term if char.isdigit())
+    return digits * 3 <= len(term)
+
+
+def deletes(term: str, distance: int) -> Set[str]:
+    """All strings obtained by deleting up to `distance` characters."""
+    results = {term}
+    frontier = {term}
+    for _ in range(distance):
+        next_frontier = set()
+        for word in frontier:
+            for i in range(len(word)):
+                next_frontier.add(word[:i] + word[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 if it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """SymSpell-style deletion dictionary over the index vocabulary.
+
+    Every vocabulary term is stored under each string reachable by deleting
+    up to MAX_EDIT_DISTANCE characters from its first PREFIX_LENGTH
+    characters. A query term's own prefix deletes then find candidate
+    terms with a handful of dict lookups, instead of comparing the query
+    against the whole vocabulary; candidates are checked against the whole
+    term with edit_distance. Very long and digit-heavy terms, which would
+    bloat the dictionary and are rarely misspelt, are only matched exactly.
+
+    Terms are added as notes are indexed. Terms that disappear from the
+    index are skipped at lookup time and purged when the dictionary is
+    compacted.
+    """
+
+    def __init__(self, index: NoteIndex):
+        self.index = index
+        self.deletes: Dict[str, Set[str]] = {}
+        self._terms: Set[str] = set()
+
+    def add_note(self, doc: IndexedNote, content: str) -> None:
+        """Add any new vocabulary terms from an indexed note."""
+        for term in self.index.terms_for(doc.doc_id):
+            if term not in self._terms:
+                self._add_term(term)
+
+        if len(self._terms) > 2 * len(self.index.postings) + 1000:
+            self.compact()
+
+    def remove_note(self, doc_id: int) -> None:
+        """Nothing to do eagerly; stale terms are filtered at lookup."""
+
+    def compact(self) -> None:
+        """Rebuild the dictionary from the current vocabulary."""
+        self.deletes = {}
+        self._terms = set()
+        for term in self.index.postings:
+            self._add_term(term)
+
+    def expand(self, term: str) -> Dict[str, int]:
+        """Vocabulary terms within the allowed edit distance, with their distances."""
+        limit = max_edit_distance(term)
+        matches: Dict[str, int] = {}
+        if term in self.index.postings:
+            matches[term] = 0
+        if not limit or not is_fuzzy_term(term):
+            return matches
+
+        candidates = set()
+        for deleted in deletes(term[:PREFIX_LENGTH], limit):
+            candidates |= self.deletes.get(deleted, set())
+
+        for candidate in candidates:
+            if candidate in matches or candidate not in self.index.postings:
+                continue
+            distance = edit_distance(term, candidate, limit)
+            if distance <= limit:
+                matches[candidate] = distance
+        return matches
+
+    def _add_term(self, term: str) -> None:
+        self._terms.add(term)
+        if not is_fuzzy_term(term):
+            return
+        # Stored terms need deletes up to the largest distance any query may
+        # use against them, not the distance their own length would allow
+        prefix = term[:PREFIX_LENGTH]
+        for deleted in deletes(prefix, min(MAX_EDIT_DISTANCE, len(prefix) - 1)):
+            self.deletes.setdefault(deleted, set()).add(term)
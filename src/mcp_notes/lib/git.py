@@ -1,19 +1,58 @@
 """Git operations for note version control."""
 
 import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from git import Repo, InvalidGitRepositoryError
+from git.objects import Blob, Commit, Tree
+from git.objects.fun import tree_entries_from_data, tree_to_stream
+from gitdb import IStream
+
+from .history import HistoryIndex
+
+
+BACKENDS = ("index", "plumbing")
+
+FILE_MODE = 0o100644
+TREE_MODE = 0o040000
+
+# A changed path's new (mode, blob sha), or None if it was deleted
+TreeChange = Optional[Tuple[int, bytes]]
 
 
 class GitManager:
-    """Manages git operations for notes."""
+    """Manages git operations for notes.
     
-    def __init__(self, vault_path: str):
+    Commits are serialised with a lock, as GitPython's index is not
+    safe to use from several threads at once.
+    
+    With the "index" backend commits go through GitPython's Repo.index,
+    which parses and rewrites the whole .git/index each time. The
+    "plumbing" backend writes the changed blobs and only the trees on
+    their paths directly to the object database, builds the commit from
+    the parent's tree, updates .git/index and only then moves HEAD, so its
+    cost depends on the depth of the changed paths rather than the number
+    of tracked files.
+    
+    Per-file history is served from a HistoryIndex, kept in memory unless
+    history_path is given.
+    """
+    
+    def __init__(self, vault_path: str, backend: str = "index", history_path: Optional[str] = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown git backend: {backend}")
         self.vault_path = Path(vault_path)
+        self.backend = backend
         self._repo: Optional[Repo] = None
+        self._lock = threading.Lock()
         self._init_repo()
+        self.history = HistoryIndex(self._repo, history_path)
     
     def _init_repo(self) -> None:
         """Initialize or open git repository."""
@@ -50,27 +89,181 @@ class GitManager:
             return False
         
         try:
-            # Add the specific file
-            self._repo.index.add([filename])
-            
             # Create commit message
             if not message:
                 message = f"Add note: {filename}"
             
-            # Commit the changes
-            self._repo.index.commit(message)
+            self.commit_notes([filename], message)
             return True
             
         except Exception as e:
             print(f"Git commit failed: {e}")
             return False
     
+    def commit_notes(self, filenames: List[str], message: str) -> str:
+        """Commit several note files in one commit, returning its sha.
+        
+        Raises on failure.
+        """
+        if not self._repo:
+            raise RuntimeError("No git repository")
+        
+        with self._lock:
+            if self.backend == "plumbing":
+                return self._commit_plumbing(filenames, message)
+            self._repo.index.add(filenames)
+            commit = self._repo.index.commit(message)
+        return commit.hexsha
+    
+    def _commit_plumbing(self, filenames: List[str], message: str) -> str:
+        """Commit by writing objects directly, as hash-object/mktree/commit-tree would."""
+        repo = self._repo
+        try:
+            parent = repo.head.commit
+        except ValueError:
+            # No commits yet
+            parent = None
+        
+        changes: Dict[str, TreeChange] = {}
+        for filename in filenames:
+            path = self.vault_path / filename
+            if path.is_file():
+                data = path.read_bytes()
+                changes[filename] = (FILE_MODE, self._store(Blob.type, data))
+            else:
+                changes[filename] = None
+        
+        root = self._write_tree(parent.tree.binsha if parent is not None else None, changes)
+        if root is None:
+            root = self._store(Tree.type, b'')
+        
+        commit = Commit.create_from_tree(
+            repo, Tree(repo, root), message, parent_commits=[parent] if parent is not None else [], head=False
+        )
+        # The index is updated before HEAD moves, so if it is locked by
+        # another git process nothing has been committed yet
+        self._update_index(changes)
+        self._advance_head(commit, parent, message)
+        return commit.hexsha
+    
+    def _store(self, kind: bytes, data: bytes) -> bytes:
+        return self._repo.odb.store(IStream(kind, len(data), BytesIO(data))).binsha
+    
+    def _write_tree(self, binsha: Optional[bytes], changes: Dict[str, TreeChange]) -> Optional[bytes]:
+        """Write a copy of a tree with changes applied; None if it ends up empty.
+        
+        Only the subtrees containing changed paths are read and rewritten.
+        """
+        entries: Dict[str, Tuple[bytes, int]] = {}
+        if binsha is not None:
+            data = self._repo.odb.stream(binsha).read()
+            for entry_sha, mode, name in tree_entries_from_data(data):
+                entries[name] = (entry_sha, mode)
+        
+        subtrees: Dict[str, Dict[str, TreeChange]] = {}
+        for path, change in changes.items():
+            name, _, rest = path.partition('/')
+            if rest:
+                subtrees.setdefault(name, {})[rest] = change
+            elif change is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = (change[1], change[0])
+        
+        for name, subtree_changes in subtrees.items():
+            current = entries.get(name)
+            current_sha = current[0] if current is not None and current[1] == TREE_MODE else None
+            subtree = self._write_tree(current_sha, subtree_changes)
+            if subtree is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = (subtree, TREE_MODE)
+        
+        if not entries:
+            return None
+        
+        # Git orders tree entries by name, comparing directories as "name/"
+        ordered = sorted(entries.items(), key=lambda item: item[0] + '/' if item[1][1] == TREE_MODE else item[0])
+        stream = BytesIO()
+        tree_to_stream([(entry_sha, mode, name) for name, (entry_sha, mode) in ordered], stream.write)
+        return self._store(Tree.type, stream.getvalue())
+    
+    def _advance_head(self, commit: Commit, parent: Optional[Commit], message: str) -> None:
+        """Point HEAD's branch at the new commit, unless it moved since the parent was read."""
+        subject = message.split('\n', 1)[0]
+        if parent is None:
+            logmsg = f"commit (initial): {subject}"
+            expected = '0' * 40
+        else:
+            logmsg = f"commit: {subject}"
+            expected = parent.hexsha
+        subprocess.run(
+            ["git", "update-ref", "-m", logmsg, "HEAD", commit.hexsha, expected],
+            cwd=self.vault_path,
+            check=True,
+            capture_output=True,
+        )
+    
+    def _update_index(self, changes: Dict[str, TreeChange]) -> None:
+        """Record the committed paths in .git/index so the work tree shows as clean.
+        
+        Uses a single `git update-index --index-info` call; GitPython never
+        parses the index.
+        """
+        lines = []
+        for path, change in changes.items():
+            if change is None:
+                lines.append(f"0 {'0' * 40}\t{path}\n")
+            else:
+                lines.append(f"{change[0]:o} {change[1].hex()}\t{path}\n")
+        subprocess.run(
+            ["git", "update-index", "--index-info"],
+            cwd=self.vault_path,
+            input="".join(lines).encode('utf-8'),
+            check=True,
+            capture_output=True,
+        )
+    
     def is_repo_clean(self) -> bool:
         """Check if repository has no uncommitted changes."""
         if not self._repo:
             return True
         return not self._repo.is_dirty()
     
+    def head_commit(self) -> Optional[str]:
+        """The sha of HEAD, or None before the first commit."""
+        try:
+            return self._repo.head.commit.hexsha
+        except ValueError:
+            return None
+    
+    def changed_paths(self, since: str) -> Optional[Set[str]]:
+        """Paths that differ between a commit and HEAD, or None if either is missing."""
+        try:
+            result = subprocess.run(
+                ["git", "diff", "--name-status", "--no-renames", "-z", since, "HEAD", "--"],
+                cwd=self.vault_path,
+                check=True,
+                capture_output=True,
+            )
+        except subprocess.CalledProcessError:
+            return None
+        # Entries are status, path pairs
+        fields = result.stdout.decode('utf-8', 'surrogateescape').split('\0')
+        return set(fields[1::2]) - {''}
+    
+    def dirty_paths(self) -> Set[str]:
+        """Paths that differ from HEAD in the working tree, including untracked and ignored files."""
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "-z", "--untracked-files=all", "--ignored", "--no-renames"],
+            cwd=self.vault_path,
+            check=True,
+            capture_output=True,
+        )
+        # Each entry is two status letters, a space and the path
+        entries = result.stdout.decode('utf-8', 'surrogateescape').split('\0')
+        return {entry[3:] for entry in entries if entry}
+    
     def get_commit_history(self, filename: Optional[str] = None, limit: int = 10) -> list:
         """Get commit history for a file or entire repository."""
         if not self._repo:
@@ -78,10 +271,9 @@ class GitManager:
         
         try:
             if filename:
-                commits = list(self._repo.iter_commits(paths=filename, max_count=limit))
-            else:
-                commits = list(self._repo.iter_commits(max_count=limit))
+                return self.history.lookup(filename, limit)
             
+            commits = list(self._repo.iter_commits(max_count=limit))
             return [
                 {
                     'sha': commit.hexsha[:8],
@@ -92,4 +284,172 @@ class GitManager:
                 for commit in commits
             ]
         except Exception:
-            return []
\ No newline at end of file
+            return []
+
+
+class CommitTicket:
+    """Commit status of one queued note: pending, committed or failed."""
+    
+    __slots__ = ('filename', 'message', 'status', 'sha', 'error', '_done')
+    
+    def __init__(self, filename: str, message: str):
+        self.filename = filename
+        self.message = message
+        self.status = "pending"
+        self.sha: Optional[str] = None
+        self.error: Optional[str] = None
+        self._done = threading.Event()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the note's batch has been committed or has failed."""
+        return self._done.wait(timeout)
+    
+    def _finish(self, sha: Optional[str], error: Optional[str]) -> None:
+        self.status = "committed" if error is None else "failed"
+        self.sha = sha
+        self.error = error
+        self._done.set()
+
+
+class CommitQueue:
+    """Groups note commits into batches.
+    
+    Notes submitted within `window` seconds of the first pending one are
+    committed together, in one index update and one commit with a combined
+    message; a batch is committed early once it holds `max_batch` notes,
+    or when a caller waits for its commit. Commits run on a background
+    thread. The statuses of the most recent notes are kept for reporting.
+    """
+    
+    def __init__(self, git_manager: GitManager, window: float = 0.5, max_batch: int = 50, history: int = 1024):
+        self.git_manager = git_manager
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self.history = history
+        self.batches = 0
+        self.committed = 0
+        self.failed = 0
+        self._pending: List[CommitTicket] = []
+        self._first_pending: Optional[float] = None
+        self._urgent = False
+        self._closed = False
+        self._statuses: 'OrderedDict[str, CommitTicket]' = OrderedDict()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+    
+    def submit(self, filename: str, message: str, wait: bool = False) -> CommitTicket:
+        """Queue a note for commit; with wait, commit now and block until done."""
+        ticket = CommitTicket(filename, message)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Commit queue is closed")
+            if not self._pending:
+                self._first_pending = time.monotonic()
+            self._pending.append(ticket)
+            self._statuses.pop(filename, None)
+            self._statuses[filename] = ticket
+            while len(self._statuses) > self.history:
+                self._statuses.popitem(last=False)
+            self._urgent = self._urgent or wait
+            self._start()
+            self._condition.notify_all()
+        
+        if wait:
+            ticket.wait()
+        return ticket
+    
+    def status(self, filename: str) -> Optional[CommitTicket]:
+        """Latest commit status of a note, if it was queued recently."""
+        with self._condition:
+            return self._statuses.get(filename)
+    
+    def pending(self) -> List[CommitTicket]:
+        """Notes waiting to be committed."""
+        with self._condition:
+            return list(self._pending)
+    
+    def flush(self) -> None:
+        """Commit everything queued so far and wait for it."""
+        with self._condition:
+            tickets = list(self._pending)
+            if not tickets:
+                return
+            self._urgent = True
+            self._condition.notify_all()
+        for ticket in tickets:
+            ticket.wait()
+    
+    def close(self) -> None:
+        """Commit anything still queued and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._urgent = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Batch and note counters."""
+        with self._condition:
+            return {
+                'pending': len(self._pending),
+                'batches': self.batches,
+                'committed': self.committed,
+                'failed': self.failed,
+                'window': self.window,
+                'max_batch': self.max_batch,
+            }
+    
+    def _start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="mcp-notes-commits", daemon=True)
+            self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                
+                # Let the batch fill until the window closes
+                while not self._urgent and len(self._pending) < self.max_batch:
+                    remaining = self._first_pending + self.window - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                if self._pending:
+                    self._first_pending = time.monotonic()
+                else:
+                    self._urgent = False
+            
+            self._commit(batch)
+    
+    def _commit(self, batch: List[CommitTicket]) -> None:
+        filenames = list(dict.fromkeys(ticket.filename for ticket in batch))
+        try:
+            sha = self.git_manager.commit_notes(filenames, combine_messages([ticket.message for ticket in batch]))
+            error = None
+        except Exception as e:
+            sha, error = None, str(e)
+        
+        with self._condition:
+            self.batches += 1
+            if error is None:
+                self.committed += len(batch)
+            else:
+                self.failed += len(batch)
+        for ticket in batch:
+            ticket._finish(sha, error)
+
+
+def combine_messages(messages: List[str]) -> str:
+    """Commit message for a batch: a summary line listing each note's message."""
+    if len(messages) == 1:
+        return messages[0]
+    return f"Add {len(messages)} notes\n\n" + "\n".join(f"- {message}" for message in messages)
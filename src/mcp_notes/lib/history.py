@@ -0,0 +1,164 @@
+"""Persisted index of the commits that touched each note."""
+
+import subprocess
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from git import GitCommandError, Repo
+
+from .database import open_sqlite
+
+
+HISTORY_FILENAME = "history.sqlite3"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE commits (
+    seq INTEGER PRIMARY KEY,
+    sha TEXT NOT NULL,
+    author TEXT NOT NULL,
+    date TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE TABLE changes (
+    path TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (path, seq)
+) WITHOUT ROWID;
+CREATE TABLE state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Field and record separators for the git log format
+FIELD = '\x1f'
+RECORD = '\x1e'
+LOG_FORMAT = '--format=%x1e%H%x1f%an%x1f%cI%x1f%B%x1f'
+
+# (sha, author, date, message, changed paths)
+LogEntry = Tuple[str, str, str, str, List[str]]
+
+
+def parse_log(output: str) -> Iterator[LogEntry]:
+    """Parse `git log --name-only -z` output written with LOG_FORMAT."""
+    for record in output.split(RECORD)[1:]:
+        sha, author, date, message, names = record.split(FIELD, 4)
+        paths = [name.strip('\n') for name in names.split('\0')]
+        yield sha, author, date, message.strip(), [path for path in paths if path]
+
+
+class HistoryIndex:
+    """Maps each path to the commits that changed it, in a SQLite file.
+
+    The index remembers the last commit it has read. Before a lookup it
+    reads only the commits between that one and HEAD, with a single
+    `git log` call, so a note's history costs as much as the number of
+    commits that touched it rather than a walk of the whole repository.
+    If HEAD no longer descends from the indexed commit (a reset or a
+    rewritten branch) the index is rebuilt.
+
+    Like `git log -- <path>` without flags, merge commits are not
+    recorded against the files they bring in; the commits on the merged
+    branch are.
+    """
+
+    def __init__(self, repo: Repo, path: Optional[str] = None):
+        self.repo = repo
+        self.path = path
+        self.connection = open_sqlite(path, SCHEMA, SCHEMA_VERSION)
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, filename: str, limit: int = 10) -> List[Dict[str, str]]:
+        """The most recent commits that changed a file, newest first."""
+        with self._lock:
+            self._update()
+            rows = self.connection.execute(
+                "SELECT c.sha, c.message, c.author, c.date FROM changes h "
+                "JOIN commits c ON c.seq = h.seq "
+                "WHERE h.path = ? ORDER BY h.seq DESC LIMIT ?",
+                (filename, limit)
+            ).fetchall()
+        return [
+            {'sha': sha[:8], 'message': message, 'author': author, 'date': date}
+            for sha, message, author, date in rows
+        ]
+
+    def update(self) -> int:
+        """Index the commits made since the last update; returns how many."""
+        with self._lock:
+            return self._update()
+
+    def stats(self) -> Dict[str, Any]:
+        """Index counters."""
+        with self._lock:
+            commits = self.connection.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+            head = self._indexed_head()
+        return {
+            'indexed_commits': commits,
+            'indexed_head': head[:8] if head else None,
+            'updates': self.updates,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def _update(self) -> int:
+        try:
+            head = self.repo.head.commit.hexsha
+        except ValueError:
+            # No commits yet
+            return 0
+
+        indexed = self._indexed_head()
+        if indexed == head:
+            return 0
+        if indexed is not None and not self._is_ancestor(indexed, head):
+            self._clear()
+            indexed = None
+
+        revision = f"{indexed}..{head}" if indexed else head
+        result = subprocess.run(
+            ["git", "log", "--reverse", "--no-renames", "--name-only", "-z", LOG_FORMAT, revision],
+            cwd=self.repo.working_dir,
+            check=True,
+            capture_output=True,
+        )
+
+        count = 0
+        with self.connection:
+            for sha, author, date, message, paths in parse_log(result.stdout.decode('utf-8', 'replace')):
+                seq = self.connection.execute(
+                    "INSERT INTO commits (sha, author, date, message) VALUES (?, ?, ?, ?)",
+                    (sha, author, date, message)
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO changes (path, seq) VALUES (?, ?)",
+                    [(path, seq) for path in paths]
+                )
+                count += 1
+            self.connection.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES ('head', ?)", (head,)
+            )
+        self.updates += 1
+        return count
+
+    def _is_ancestor(self, ancestor: str, head: str) -> bool:
+        try:
+            return self.repo.is_ancestor(ancestor, head)
+        except GitCommandError:
+            # The indexed commit no longer exists
+            return False
+
+    def _indexed_head(self) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM state WHERE key = 'head'").fetchone()
+        return row[0] if row else None
+
+    def _clear(self) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM commits")
+            self.connection.execute("DELETE FROM changes")
+            self.connection.execute("DELETE FROM state")
@@ -0,0 +1,283 @@
+"""In-memory inverted index over vault notes."""
+
+import re
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .file_manager import FileManager, stat_key
+from .markdown import scan_note
+from .records import NoteHeader
+from .tags import TagIndex
+
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+FIELDS = ('title', 'summary', 'tags', 'body')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def tokenize_with_offsets(
+    content: str, body_start: int, crlf: Sequence[int] = ()
+) -> Tuple[List[str], 'array[int]']:
+    """Tokenize a note body, recording each token's byte offset in the file.
+
+    The body is content from body_start onwards; it is never copied out.
+    If content was newline-translated, crlf holds the crlf_offsets of the
+    file, and offsets are shifted past the '\r' removed at each of them.
+    """
+    is_ascii = content.isascii()
+    byte_pos = body_start if is_ascii else len(content[:body_start].encode('utf-8'))
+    char_pos = body_start
+
+    tokens = []
+    offsets = array('I')
+    shift = 0
+    for match in TOKEN_PATTERN.finditer(content, body_start):
+        start = match.start()
+        if is_ascii:
+            offset = start
+        else:
+            byte_pos += len(content[char_pos:start].encode('utf-8'))
+            char_pos = start
+            offset = byte_pos
+        while shift < len(crlf) and crlf[shift] < offset:
+            shift += 1
+        offsets.append(offset + shift)
+        tokens.append(match.group().lower())
+    return tokens, offsets
+
+
+class IndexedNote:
+    """Metadata and field lengths for a note held in the index.
+
+    body_offsets holds the byte offset in the file of every body token,
+    indexed by the token positions stored in the postings.
+    """
+
+    __slots__ = (
+        'doc_id', 'filename', 'title', 'frontmatter', 'mtime_ns', 'size', 'field_lengths', 'body_offsets'
+    )
+
+    def __init__(
+        self,
+        doc_id: int,
+        filename: str,
+        title: str,
+        frontmatter: NoteHeader,
+        mtime_ns: int,
+        size: int,
+        field_lengths: Dict[str, int],
+        body_offsets: 'array[int]',
+    ):
+        self.doc_id = doc_id
+        self.filename = filename
+        self.title = title
+        self.frontmatter = frontmatter
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.field_lengths = field_lengths
+        self.body_offsets = body_offsets
+
+
+class NoteIndex:
+    """Inverted index mapping terms to per-field postings.
+
+    Postings are stored as ``term -> {doc_id: {field: [positions]}}`` so a
+    query only touches the documents that contain its terms. Notes are
+    reindexed individually when their mtime or size changes on disk.
+
+    Tags are kept in a bitmap TagIndex, registered as the first extension.
+    Extensions (secondary indexes such as the trigram index) are fed the
+    content of every note that is indexed, and told when a note is removed.
+    They implement ``add_note(doc, content)`` and ``remove_note(doc_id)``.
+    """
+
+    def __init__(self, file_manager: FileManager):
+        self.file_manager = file_manager
+        self.postings: Dict[str, Dict[int, Dict[str, List[int]]]] = {}
+        self.docs: Dict[int, IndexedNote] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._doc_terms: Dict[int, List[str]] = {}
+        self._next_doc_id = 0
+        self._free_doc_ids: List[int] = []
+        self.total_field_lengths: Dict[str, int] = {field: 0 for field in FIELDS}
+        self.tag_index = TagIndex()
+        self.extensions: List[Any] = [self.tag_index]
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def get(self, filename: str) -> Optional[IndexedNote]:
+        """Get the indexed entry for a note, if any."""
+        doc_id = self._doc_ids.get(filename)
+        if doc_id is None:
+            return None
+        return self.docs[doc_id]
+
+    def add_extension(self, extension: Any) -> None:
+        """Attach a secondary index, feeding it every note already indexed."""
+        self.extensions.append(extension)
+        for doc in list(self.docs.values()):
+            self.update_note(doc.filename)
+
+    def refresh(self, filenames: Optional[Iterable[str]] = None) -> bool:
+        """Bring the index up to date with the vault.
+
+        Only notes whose mtime or size differ from the indexed values are
+        reread. If filenames is given (e.g. by a file watcher), only those
+        notes are checked instead of the whole vault. Returns True if
+        anything was added, updated or removed, in which case the file
+        manager's generation is bumped.
+        """
+        changed = False
+
+        if filenames is None:
+            stats = self.file_manager.scan_notes()
+            missing = [filename for filename in self._doc_ids if filename not in stats]
+        else:
+            stats = {}
+            missing = []
+            for filename in dict.fromkeys(filenames):
+                try:
+                    stats[filename] = stat_key(self.file_manager.get_note_path(filename).stat())
+                except OSError:
+                    missing.append(filename)
+
+        for filename, (mtime_ns, size, _) in stats.items():
+            doc = self.get(filename)
+            if doc and doc.mtime_ns == mtime_ns and doc.size == size:
+                continue
+
+            self.update_note(filename)
+            changed = True
+
+        for filename in missing:
+            if filename in self._doc_ids:
+                self.remove_note(filename)
+                changed = True
+
+        if changed:
+            self.file_manager.bump_generation()
+        return changed
+
+    def update_note(self, filename: str, content: Optional[str] = None) -> Optional[IndexedNote]:
+        """Index or reindex a single note.
+
+        If content is not given the note is read from disk. Notes that
+        cannot be read are dropped from the index.
+        """
+        crlf: List[int] = []
+        try:
+            stat = self.file_manager.get_note_path(filename).stat()
+            if content is None:
+                content, crlf = self.file_manager.read_note_with_crlf(filename)
+            scanned = scan_note(content)
+        except Exception:
+            self.remove_note(filename)
+            return None
+
+        self.remove_note(filename)
+
+        header = scanned.header
+        title = scanned.title or filename.replace('.md', '')
+
+        body_tokens, body_offsets = tokenize_with_offsets(content, scanned.body_offset, crlf)
+        fields = {
+            'title': tokenize(title),
+            'summary': tokenize(header.summary),
+            'tags': tokenize(' '.join(header.tags)),
+            'body': body_tokens,
+        }
+
+        # Recycle ids so that a reindexed note usually keeps its id and
+        # doc-id bitmaps stay dense
+        if self._free_doc_ids:
+            doc_id = self._free_doc_ids.pop()
+        else:
+            doc_id = self._next_doc_id
+            self._next_doc_id += 1
+
+        doc = IndexedNote(
+            doc_id=doc_id,
+            filename=filename,
+            title=title,
+            frontmatter=header,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            field_lengths={field: len(tokens) for field, tokens in fields.items()},
+            body_offsets=body_offsets,
+        )
+        self.docs[doc_id] = doc
+        self._doc_ids[filename] = doc_id
+        for field, length in doc.field_lengths.items():
+            self.total_field_lengths[field] += length
+
+        terms = set()
+        for field, tokens in fields.items():
+            for position, term in enumerate(tokens):
+                self.postings.setdefault(term, {}).setdefault(doc_id, {}).setdefault(field, []).append(position)
+                terms.add(term)
+        self._doc_terms[doc_id] = list(terms)
+
+        for extension in self.extensions:
+            extension.add_note(doc, content)
+
+        return doc
+
+    def remove_note(self, filename: str) -> None:
+        """Remove a note and its postings from the index."""
+        doc_id = self._doc_ids.pop(filename, None)
+        if doc_id is None:
+            return
+
+        for term in self._doc_terms.pop(doc_id, []):
+            term_postings = self.postings.get(term)
+            if term_postings is None:
+                continue
+            term_postings.pop(doc_id, None)
+            if not term_postings:
+                del self.postings[term]
+
+        doc = self.docs.pop(doc_id)
+        for field, length in doc.field_lengths.items():
+            self.total_field_lengths[field] -= length
+        self._free_doc_ids.append(doc_id)
+
+        for extension in self.extensions:
+            extension.remove_note(doc_id)
+
+    def terms_for(self, doc_id: int) -> List[str]:
+        """Distinct terms of an indexed note."""
+        return self._doc_terms.get(doc_id, [])
+
+    def postings_for(self, term: str) -> Dict[int, Dict[str, List[int]]]:
+        """Get the postings for a term (empty if the term is not indexed)."""
+        return self.postings.get(term, {})
+
+    def document_frequency(self, term: str) -> int:
+        """Number of documents containing a term."""
+        return len(self.postings.get(term, ()))
+
+    def average_field_length(self, field: str) -> float:
+        """Average length in tokens of a field across indexed notes."""
+        if not self.docs:
+            return 0.0
+        return self.total_field_lengths[field] / len(self.docs)
+
+    def match_all(self, terms: Iterable[str]) -> List[int]:
+        """Doc ids containing every term, intersecting rarest postings first."""
+        ordered = sorted(set(terms), key=self.document_frequency)
+        if not ordered:
+            return []
+
+        candidates = set(self.postings_for(ordered[0]))
+        for term in ordered[1:]:
+            if not candidates:
+                break
+            term_postings = self.postings_for(term)
+            candidates = {doc_id for doc_id in candidates if doc_id in term_postings}
+        return sorted(candidates)
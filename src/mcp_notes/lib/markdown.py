@@ -4,8 +4,8 @@ import re
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 
-import yaml
-
+from .frontmatter import dump_frontmatter, load_frontmatter
+from .records import NoteHeader
 from .types import NoteFrontmatter
 
 
@@ -17,40 +17,74 @@ class ParsedMarkdown:
         self.body = body
 
 
-def parse_markdown(content: str) -> ParsedMarkdown:
-    """Parse markdown content with YAML frontmatter."""
-    # Match frontmatter pattern: ---\n...yaml...\n---
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n(.*)$'
-    match = re.match(frontmatter_pattern, content, re.DOTALL)
+# Match frontmatter pattern: ---\n...yaml...\n---
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
+# First line that is a "# " heading once stripped of surrounding whitespace
+HEADING_PATTERN = re.compile(r'^[^\S\n]*# (?=[^\n]*\S)([^\n]*)$', re.MULTILINE)
+
+
+class ScannedNote:
+    """Structure of a note found in a single pass over its text.
+
+    frontmatter_span is the (start, end) of the YAML text, if the note has
+    a frontmatter block. body_offset is where the body starts: after the
+    frontmatter, or 0 if there is none or it is invalid. The body itself
+    is only sliced out when asked for.
+    """
+
+    __slots__ = ('content', 'frontmatter_span', 'header', 'title', 'body_offset')
+
+    def __init__(
+        self,
+        content: str,
+        frontmatter_span: Optional[Tuple[int, int]],
+        header: NoteHeader,
+        title: Optional[str],
+        body_offset: int,
+    ):
+        self.content = content
+        self.frontmatter_span = frontmatter_span
+        self.header = header
+        self.title = title
+        self.body_offset = body_offset
+
+    @property
+    def body(self) -> str:
+        """The note body, without frontmatter."""
+        return self.content[self.body_offset:] if self.body_offset else self.content
+
+
+def scan_note(content: str) -> ScannedNote:
+    """Find a note's frontmatter, parsed header, first-heading title and body.
+
+    Notes without valid frontmatter get a default header and the whole
+    content as body. The title is None if the note has no "# " heading.
+    """
+    frontmatter_span = None
+    match = FRONTMATTER_PATTERN.match(content)
+    if match:
+        frontmatter_span = match.span(1)
+        try:
+            header = NoteHeader.from_dict(load_frontmatter(match.group(1)) or {})
+            body_offset = match.end()
+        except Exception:
+            # If YAML parsing fails, treat as regular content
+            header = None
     
-    if not match:
+    if not match or header is None:
         # No frontmatter found, create default
-        frontmatter_data = {
-            'created': datetime.now().isoformat(),
-            'updated': datetime.now().isoformat(),
-            'tags': [],
-            'summary': 'Note content'
-        }
-        frontmatter = NoteFrontmatter(**frontmatter_data)
-        return ParsedMarkdown(frontmatter, content)
+        now = datetime.now().isoformat()
+        header = NoteHeader(created=now, updated=now, tags=[], summary='Note content')
+        body_offset = 0
     
-    yaml_content = match.group(1)
-    body_content = match.group(2)
-    
-    try:
-        frontmatter_data = yaml.safe_load(yaml_content) or {}
-        frontmatter = NoteFrontmatter(**frontmatter_data)
-        return ParsedMarkdown(frontmatter, body_content)
-    except Exception as e:
-        # If YAML parsing fails, treat as regular content
-        frontmatter_data = {
-            'created': datetime.now().isoformat(),
-            'updated': datetime.now().isoformat(),
-            'tags': [],
-            'summary': 'Note content'
-        }
-        frontmatter = NoteFrontmatter(**frontmatter_data)
-        return ParsedMarkdown(frontmatter, content)
+    return ScannedNote(content, frontmatter_span, header, find_title(content), body_offset)
+
+
+def parse_markdown(content: str) -> ParsedMarkdown:
+    """Parse markdown content with YAML frontmatter."""
+    scanned = scan_note(content)
+    return ParsedMarkdown(scanned.header.to_frontmatter(), scanned.body)
 
 
 def format_markdown(frontmatter: NoteFrontmatter, content: str) -> str:
@@ -59,7 +93,7 @@ def format_markdown(frontmatter: NoteFrontmatter, content: str) -> str:
     frontmatter_dict = frontmatter.model_dump(exclude_none=True)
     
     # Format YAML
-    yaml_content = yaml.dump(frontmatter_dict, default_flow_style=False, sort_keys=False)
+    yaml_content = dump_frontmatter(frontmatter_dict)
     
     return f"""---
 {yaml_content.strip()}
@@ -94,14 +128,37 @@ def create_default_frontmatter(
     return NoteFrontmatter(**frontmatter_data)
 
 
+def find_title(content: str) -> Optional[str]:
+    """First "# " heading of markdown content, or None."""
+    match = HEADING_PATTERN.search(content)
+    return match.group(1).strip() if match else None
+
+
 def extract_title_from_content(content: str) -> str:
     """Extract title from markdown content (first heading)."""
-    lines = content.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line.startswith('# '):
-            return line[2:].strip()
-    return "Untitled Note"
+    return find_title(content) or "Untitled Note"
+
+
+def header_length(text: str) -> Optional[int]:
+    """Length of the header (frontmatter and first heading) at the start of text.
+
+    text must consist of complete lines from the start of a note. Returns
+    None if the header may continue beyond text. Parsing the header gives
+    the same frontmatter and title as parsing the whole note.
+    """
+    if text.startswith('---'):
+        match = FRONTMATTER_PATTERN.match(text)
+        if not match:
+            return None
+        frontmatter_end = match.end()
+    else:
+        frontmatter_end = 0
+
+    heading = HEADING_PATTERN.search(text)
+    if not heading or heading.end() == len(text):
+        # No heading yet, or its line may continue
+        return None
+    return max(frontmatter_end, heading.end() + 1)
 
 
 def kebab_case(text: str) -> str:
@@ -0,0 +1,181 @@
+"""Query language for note search.
+
+Supported syntax:
+
+- ``asyncio deadlock`` - every term must match
+- ``"event loop"`` - terms must appear next to each other
+- ``-threading`` / ``-"thread pool"`` - exclude matching notes
+- ``python OR rust`` - either side may match
+- ``tag:python`` / ``-tag:draft`` - require or exclude an exact tag
+- ``title:asyncio`` - restrict a term or phrase to one field
+  (``title``, ``summary``, ``tags`` or ``body``)
+"""
+
+import re
+from typing import List, Optional, Set
+
+from .index import NoteIndex, FIELDS, tokenize
+
+
+QUERY_TOKEN_PATTERN = re.compile(r'(-)?(?:([A-Za-z_]+):(?=\S))?(?:"([^"]*)"?|(\S+))')
+
+
+class Clause:
+    """A term or phrase, optionally restricted to a single field."""
+
+    def __init__(self, terms: List[str], field: Optional[str] = None):
+        self.terms = terms
+        self.field = field
+
+    @property
+    def is_phrase(self) -> bool:
+        return len(self.terms) > 1
+
+
+class Query:
+    """Parsed search query.
+
+    ``groups`` is a conjunction of disjunctions: a note matches when, for
+    every group, at least one clause in the group matches.
+    """
+
+    def __init__(self):
+        self.groups: List[List[Clause]] = []
+        self.excluded: List[Clause] = []
+        self.tags: List[str] = []
+        self.excluded_tags: List[str] = []
+
+    def terms(self) -> List[str]:
+        """All positive terms, used for relevance scoring."""
+        return [term for group in self.groups for clause in group for term in clause.terms]
+
+    def is_empty(self) -> bool:
+        return not (self.groups or self.excluded or self.tags or self.excluded_tags)
+
+
+def parse_query(text: str) -> Query:
+    """Parse a search query string."""
+    query = Query()
+    join_next = False
+
+    for match in QUERY_TOKEN_PATTERN.finditer(text):
+        negated, qualifier, quoted, word = match.groups()
+
+        if word == 'OR' and not negated and not qualifier:
+            join_next = bool(query.groups)
+            continue
+
+        if qualifier and qualifier.lower() == 'tag':
+            tag = quoted if quoted is not None else word
+            (query.excluded_tags if negated else query.tags).append(tag)
+            join_next = False
+            continue
+
+        field = None
+        if qualifier:
+            if qualifier.lower() in FIELDS:
+                field = qualifier.lower()
+            else:
+                # Not a field name (e.g. "http:"), keep it as text
+                word = f"{qualifier}:{word if word is not None else quoted}"
+                quoted = None
+
+        terms = tokenize(quoted if quoted is not None else word)
+        if not terms:
+            continue
+        clause = Clause(terms, field)
+
+        if negated:
+            query.excluded.append(clause)
+        elif join_next:
+            query.groups[-1].append(clause)
+        else:
+            query.groups.append([clause])
+        join_next = False
+
+    return query
+
+
+class QueryEvaluator:
+    """Evaluates parsed queries against a NoteIndex.
+
+    The cheapest group (by document frequency) produces the candidate set;
+    every other group, exclusion and tag filter is then checked per
+    candidate, so work stops as soon as the candidate set is empty.
+    """
+
+    def __init__(self, index: NoteIndex):
+        self.index = index
+
+    def evaluate(self, query: Query) -> List[int]:
+        """Doc ids of notes matching a query."""
+        groups = sorted(query.groups, key=self._group_cost)
+
+        if groups:
+            candidates = self._group_docs(groups[0])
+            groups = groups[1:]
+        else:
+            candidates = set(self.index.docs)
+
+        for group in groups:
+            if not candidates:
+                return []
+            candidates = {
+                doc_id for doc_id in candidates
+                if any(self.clause_matches(clause, doc_id) for clause in group)
+            }
+
+        for clause in query.excluded:
+            candidates = {doc_id for doc_id in candidates if not self.clause_matches(clause, doc_id)}
+
+        if query.tags or query.excluded_tags:
+            allowed = self.index.tag_index.match(all_tags=query.tags, none_tags=query.excluded_tags)
+            candidates = {doc_id for doc_id in candidates if allowed >> doc_id & 1}
+
+        return sorted(candidates)
+
+    def clause_matches(self, clause: Clause, doc_id: int) -> bool:
+        """Check whether a single note matches a clause."""
+        postings = []
+        for term in clause.terms:
+            fields = self.index.postings_for(term).get(doc_id)
+            if not fields or (clause.field and clause.field not in fields):
+                return False
+            postings.append(fields)
+
+        if not clause.is_phrase:
+            return True
+
+        for field in ([clause.field] if clause.field else FIELDS):
+            position_lists = [fields.get(field) for fields in postings]
+            if any(positions is None for positions in position_lists):
+                continue
+
+            starts = set(position_lists[0])
+            for offset, positions in enumerate(position_lists[1:], 1):
+                starts &= {position - offset for position in positions}
+                if not starts:
+                    break
+            if starts:
+                return True
+
+        return False
+
+    def _clause_cost(self, clause: Clause) -> int:
+        return min(self.index.document_frequency(term) for term in clause.terms)
+
+    def _group_cost(self, group: List[Clause]) -> int:
+        return sum(self._clause_cost(clause) for clause in group)
+
+    def _clause_docs(self, clause: Clause) -> Set[int]:
+        rarest = min(clause.terms, key=self.index.document_frequency)
+        return {
+            doc_id for doc_id in self.index.postings_for(rarest)
+            if self.clause_matches(clause, doc_id)
+        }
+
+    def _group_docs(self, group: List[Clause]) -> Set[int]:
+        docs: Set[int] = set()
+        for clause in group:
+            docs |= self._clause_docs(clause)
+        return docs
@@ -0,0 +1,112 @@
+"""Relevance scoring for indexed notes."""
+
+import math
+from typing import Dict, List, Optional
+
+from .index import NoteIndex, FIELDS
+
+
+DEFAULT_FIELD_WEIGHTS = {
+    'title': 3.0,
+    'summary': 2.0,
+    'tags': 1.5,
+    'body': 1.0,
+}
+
+
+class ClassicScorer:
+    """Fixed-weight scoring: title +10, summary +5, tag +3, capped body hits."""
+
+    def __init__(self, index: NoteIndex):
+        self.index = index
+
+    def term_weights(self, terms: List[str]) -> Dict[str, float]:
+        """Per-term weights for a query (all terms count equally)."""
+        return {term: 1.0 for term in terms}
+
+    def score(self, weights: Dict[str, float], doc_id: int) -> float:
+        """Score an indexed note against weighted query terms."""
+        score = 0.0
+        for term, weight in weights.items():
+            fields = self.index.postings_for(term).get(doc_id, {})
+
+            term_score = 0.0
+            if 'title' in fields:
+                term_score += 10.0
+            if 'summary' in fields:
+                term_score += 5.0
+            term_score += len(fields.get('tags', ())) * 3.0
+
+            body_matches = len(fields.get('body', ()))
+            term_score += min(body_matches * 0.5, 5.0) + body_matches * 1.0
+
+            score += weight * term_score
+
+        return score
+
+
+class BM25FScorer:
+    """BM25F scoring over the index's precomputed corpus statistics.
+
+    Term frequencies are length-normalised per field, combined with the
+    field weights and saturated once per term, so a term repeated across
+    fields is not counted as several independent matches.
+    """
+
+    def __init__(
+        self,
+        index: NoteIndex,
+        field_weights: Optional[Dict[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.index = index
+        self.field_weights = field_weights or DEFAULT_FIELD_WEIGHTS
+        self.k1 = k1
+        self.b = b
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of a term."""
+        total = len(self.index)
+        df = self.index.document_frequency(term)
+        return math.log(1.0 + (total - df + 0.5) / (df + 0.5))
+
+    def term_weights(self, terms: List[str]) -> Dict[str, float]:
+        """Per-term IDF weights for a query."""
+        weights: Dict[str, float] = {}
+        for term in terms:
+            weights[term] = weights.get(term, 0.0) + self.idf(term)
+        return weights
+
+    def score(self, weights: Dict[str, float], doc_id: int) -> float:
+        """Score an indexed note against IDF-weighted query terms."""
+        doc = self.index.docs[doc_id]
+
+        # Per-field length normalisation is the same for every term
+        norms = {}
+        for field in FIELDS:
+            average = self.index.average_field_length(field)
+            if average:
+                norms[field] = 1.0 - self.b + self.b * doc.field_lengths[field] / average
+            else:
+                norms[field] = 1.0
+
+        score = 0.0
+        for term, idf in weights.items():
+            fields = self.index.postings_for(term).get(doc_id)
+            if not fields:
+                continue
+
+            tf = 0.0
+            for field, positions in fields.items():
+                tf += self.field_weights.get(field, 0.0) * len(positions) / norms[field]
+
+            score += idf * tf / (self.k1 + tf)
+
+        return score
+
+
+SCORERS = {
+    'bm25f': BM25FScorer,
+    'classic': ClassicScorer,
+}
@@ -0,0 +1,105 @@
+"""Compact internal records for note metadata.
+
+Pydantic models validate tool arguments and results at the MCP boundary;
+metadata held by the index and catalog uses these plain slotted classes,
+which are several times smaller and need no validation on construction.
+"""
+
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .types import NoteFrontmatter
+
+
+def intern_tags(tags: Iterable[str]) -> Tuple[str, ...]:
+    """Tags as a tuple of interned strings, so each distinct tag is stored once."""
+    return tuple(sys.intern(tag) for tag in tags)
+
+
+class NoteHeader:
+    """Frontmatter of a note.
+
+    Mirrors NoteFrontmatter field for field, with tags held as a tuple of
+    interned strings.
+    """
+
+    __slots__ = ('created', 'updated', 'tags', 'summary', 'conversation_id', 'ai_client')
+
+    def __init__(
+        self,
+        created: str,
+        updated: str,
+        tags: Iterable[str],
+        summary: str,
+        conversation_id: Optional[str] = None,
+        ai_client: Optional[str] = None,
+    ):
+        self.created = created
+        self.updated = updated
+        self.tags = intern_tags(tags)
+        self.summary = summary
+        self.conversation_id = conversation_id
+        self.ai_client = ai_client
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NoteHeader':
+        """Build a header from loaded YAML, accepting what NoteFrontmatter accepts.
+
+        Raises ValueError for missing or mistyped fields.
+        """
+        for field in ('created', 'updated', 'summary'):
+            if not isinstance(data.get(field), str):
+                raise ValueError(f"Frontmatter field '{field}' must be a string")
+        for field in ('conversation_id', 'ai_client'):
+            if data.get(field) is not None and not isinstance(data[field], str):
+                raise ValueError(f"Frontmatter field '{field}' must be a string")
+
+        tags = data.get('tags', [])
+        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            raise ValueError("Frontmatter field 'tags' must be a list of strings")
+
+        return cls(
+            data['created'],
+            data['updated'],
+            tags,
+            data['summary'],
+            data.get('conversation_id'),
+            data.get('ai_client'),
+        )
+
+    def to_frontmatter(self) -> NoteFrontmatter:
+        """Validated model for use at the tool boundary."""
+        return NoteFrontmatter(
+            created=self.created,
+            updated=self.updated,
+            tags=list(self.tags),
+            summary=self.summary,
+            conversation_id=self.conversation_id,
+            ai_client=self.ai_client,
+        )
+
+
+class NoteRecord:
+    """Catalogued metadata for one note, as returned by listings."""
+
+    __slots__ = ('filename', 'title', 'summary', 'tags', 'created', 'updated', 'conversation_id', 'ai_client')
+
+    def __init__(
+        self,
+        filename: str,
+        title: str,
+        summary: str,
+        tags: Iterable[str],
+        created: str,
+        updated: str,
+        conversation_id: Optional[str] = None,
+        ai_client: Optional[str] = None,
+    ):
+        self.filename = filename
+        self.title = title
+        self.summary = summary
+        self.tags = intern_tags(tags)
+        self.created = created
+        self.updated = updated
+        self.conversation_id = conversation_id
+        self.ai_client = ai_client
@@ -1,82 +1,260 @@
 """Search functionality for notes."""
 
+import heapq
 import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from datetime import datetime
 
-from .types import SearchResult, NoteFrontmatter
-from .markdown import parse_markdown
+from .types import SearchResult, SearchResponse
+from .records import NoteHeader
 from .file_manager import FileManager
+from .index import NoteIndex, tokenize
+from .fuzzy import FuzzyIndex
+from .query import Clause, Query, QueryEvaluator, parse_query
+from .ranking import SCORERS
+from .snippets import SnippetBuilder
+from .trigram import TrigramIndex
+from .vectors import VectorIndex
 
 
 class SearchEngine:
     """Search engine for notes with relevance scoring."""
     
-    def __init__(self, file_manager: FileManager):
+    def __init__(
+        self,
+        file_manager: FileManager,
+        index: Optional[NoteIndex] = None,
+        trigrams: Optional[TrigramIndex] = None,
+        fuzzy: Optional[FuzzyIndex] = None,
+        vectors: Optional[VectorIndex] = None
+    ):
         self.file_manager = file_manager
+        self.index = index if index is not None else NoteIndex(file_manager)
+        self.trigrams = trigrams
+        if trigrams is not None:
+            self.index.add_extension(trigrams)
+        self.fuzzy = fuzzy
+        if fuzzy is not None:
+            self.index.add_extension(fuzzy)
+        self.vectors = vectors
+        if vectors is not None:
+            self.index.add_extension(vectors)
+        self.scorers = {name: scorer(self.index) for name, scorer in SCORERS.items()}
+        self.evaluator = QueryEvaluator(self.index)
+        self.snippets = SnippetBuilder(self.index, self.file_manager)
+        # Turned off when the caller keeps the index up to date itself
+        self.auto_refresh = True
     
     def search_notes(
         self, 
         query: str, 
         limit: int = 10, 
-        tags: List[str] = None
+        tags: List[str] = None,
+        ranking: str = "bm25f",
+        mode: str = "terms",
+        tag_mode: str = "any"
     ) -> List[SearchResult]:
         """Search notes with relevance scoring."""
+        return self.search(query, limit, tags, ranking, mode, tag_mode=tag_mode).results
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        tags: List[str] = None,
+        ranking: str = "bm25f",
+        mode: str = "terms",
+        snippet_count: int = 3,
+        snippet_length: int = 160,
+        tag_mode: str = "any"
+    ) -> SearchResponse:
+        """Search notes, returning the top results and the total match count.
+        
+        In "terms" mode the query supports terms, "quoted phrases",
+        -exclusions, OR, tag: filters and field: qualifiers (see the query
+        module). "fuzzy" mode accepts the same syntax but also matches
+        terms within a small edit distance, scored below exact matches.
+        In "substring" mode the query is matched as a literal,
+        case-insensitive substring of the note. "semantic" mode ranks
+        notes by vector similarity to the query text.
+        
+        The tags filter keeps notes with any, all or none of the given tags
+        depending on tag_mode, and is resolved against the tag index.
+        
+        Matches are ranked with a bounded heap, so SearchResult objects
+        (and their snippets) are only built for the notes that are returned.
+        """
+        if ranking not in self.scorers:
+            raise ValueError(f"Unknown ranking: {ranking}")
+        
+        if self.auto_refresh:
+            self.index.refresh()
+        
+        allowed = set(self.index.tag_index.filter(tags, tag_mode)) if tags else None
+        
+        snippet_terms = tokenize(query)
+        if mode == "semantic":
+            ranked, total = self._semantic_search(query, limit, allowed)
+        else:
+            if mode in ("terms", "fuzzy"):
+                parsed_query = parse_query(query)
+                matches = self._term_matches(parsed_query, self.scorers[ranking], mode == "fuzzy", allowed)
+                snippet_terms = parsed_query.terms()
+            elif mode == "substring":
+                matches = self._substring_matches(query, allowed)
+            else:
+                raise ValueError(f"Unknown search mode: {mode}")
+            ranked, total = self._select_top_k(matches, limit, allowed)
+        
         results = []
-        notes = self.file_manager.list_notes()
+        for score, doc_id in ranked:
+            doc = self.index.docs[doc_id]
+            results.append(SearchResult(
+                filename=doc.filename,
+                title=doc.title,
+                summary=doc.frontmatter.summary,
+                relevance_score=score,
+                tags=list(doc.frontmatter.tags),
+                created=doc.frontmatter.created,
+                snippets=self.snippets.build(doc_id, snippet_terms, snippet_length, snippet_count)
+            ))
         
-        for filename in notes:
-            try:
-                content = self.file_manager.read_note(filename)
-                parsed = parse_markdown(content)
-                
-                # Skip notes that don't match tag filter
-                if tags and not any(tag in parsed.frontmatter.tags for tag in tags):
+        return SearchResponse(results=results, total=total)
+    
+    def _select_top_k(
+        self,
+        matches: Iterator[Tuple[int, float]],
+        limit: int,
+        allowed: Optional[Set[int]]
+    ) -> Tuple[List[Tuple[float, int]], int]:
+        """Best (score, doc_id) pairs in descending order, and the match count.
+        
+        If allowed is given, matches outside it are skipped.
+        """
+        total = 0
+        heap: List[Tuple[float, int]] = []
+        for doc_id, score in matches:
+            # Skip notes that don't match tag filter
+            if allowed is not None and doc_id not in allowed:
+                continue
+            
+            total += 1
+            # Negated doc id breaks ties in favour of earlier notes
+            entry = (score, -doc_id)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif heap and entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        
+        ranked = [(score, -neg_doc_id) for score, neg_doc_id in sorted(heap, reverse=True)]
+        return ranked, total
+    
+    def _semantic_search(
+        self,
+        query: str,
+        limit: int,
+        allowed: Optional[Set[int]]
+    ) -> Tuple[List[Tuple[float, int]], int]:
+        """Rank notes by vector similarity to the query."""
+        if self.vectors is None:
+            raise ValueError("Semantic search is disabled")
+        
+        return self.vectors.search(query, limit, allowed)
+    
+    def _term_matches(
+        self,
+        parsed_query: Query,
+        scorer: Any,
+        fuzzy: bool = False,
+        allowed: Optional[Set[int]] = None
+    ) -> Iterator[Tuple[int, float]]:
+        """Evaluate a parsed query against the inverted index.
+        
+        Fuzzy expansion rewrites parsed_query in place, so its terms reflect
+        what was actually matched. Only matches in allowed (if given) are scored.
+        """
+        if parsed_query.is_empty():
+            return iter(())
+        
+        penalties = self._expand_query(parsed_query) if fuzzy else {}
+        weights = scorer.term_weights(parsed_query.terms())
+        for term, penalty in penalties.items():
+            weights[term] *= penalty
+        
+        doc_ids = self.evaluator.evaluate(parsed_query)
+        if allowed is not None:
+            doc_ids = [doc_id for doc_id in doc_ids if doc_id in allowed]
+        return ((doc_id, scorer.score(weights, doc_id)) for doc_id in doc_ids)
+    
+    def _expand_query(self, parsed_query: Query) -> Dict[str, float]:
+        """Replace single-term clauses with their fuzzy expansions.
+        
+        Returns a score multiplier per term so that expanded matches rank
+        below exact ones. Phrases are left exact.
+        """
+        if self.fuzzy is None:
+            raise ValueError("Fuzzy search is disabled")
+        
+        penalties: Dict[str, float] = {}
+        for group in parsed_query.groups:
+            expanded = []
+            for clause in group:
+                if clause.is_phrase:
+                    expanded.append(clause)
+                    for term in clause.terms:
+                        penalties[term] = 1.0
                     continue
                 
-                # Calculate relevance score
-                score = self._calculate_relevance(query, parsed, content)
-                
-                if score > 0:
-                    # Extract title from content or use filename
-                    title = self._extract_title(content) or filename.replace('.md', '')
-                    
-                    result = SearchResult(
-                        filename=filename,
-                        title=title,
-                        summary=parsed.frontmatter.summary,
-                        relevance_score=score,
-                        tags=parsed.frontmatter.tags,
-                        created=parsed.frontmatter.created
-                    )
-                    results.append(result)
-                    
-            except Exception as e:
+                for term, distance in self.fuzzy.expand(clause.terms[0]).items():
+                    expanded.append(Clause([term], clause.field))
+                    penalties[term] = max(penalties.get(term, 0.0), 1.0 / (1 + distance))
+            group[:] = expanded
+        
+        return penalties
+    
+    def _substring_matches(self, query: str, allowed: Optional[Set[int]] = None) -> Iterator[Tuple[int, float]]:
+        """Match a literal substring, narrowing candidates by trigrams and the tag filter.
+        
+        Only candidates in allowed (if given) are read from disk.
+        """
+        if not query:
+            return
+        
+        candidates = self.trigrams.candidates(query) if self.trigrams else None
+        if candidates is None:
+            candidates = self.index.docs
+        if allowed is not None:
+            candidates = allowed.intersection(candidates)
+        
+        for doc_id in sorted(candidates):
+            doc = self.index.docs[doc_id]
+            try:
+                content = self.file_manager.read_note(doc.filename)
+            except Exception:
                 # Skip files that can't be processed
                 continue
-        
-        # Sort by relevance score (descending) and limit results
-        results.sort(key=lambda x: x.relevance_score, reverse=True)
-        return results[:limit]
+            
+            score = self._calculate_relevance(query, doc.title, doc.frontmatter, content)
+            if score > 0:
+                yield doc_id, score
     
-    def _calculate_relevance(self, query: str, parsed: 'ParsedMarkdown', content: str) -> float:
-        """Calculate relevance score for a note."""
+    def _calculate_relevance(self, query: str, title: str, frontmatter: NoteHeader, content: str) -> float:
+        """Calculate relevance score for a note, given its indexed title and header."""
         score = 0.0
         query_lower = query.lower()
         content_lower = content.lower()
         
         # Title matches (highest weight)
-        title = self._extract_title(content)
         if title and query_lower in title.lower():
             score += 10.0
         
         # Summary matches
-        if query_lower in parsed.frontmatter.summary.lower():
+        if query_lower in frontmatter.summary.lower():
             score += 5.0
         
         # Tag matches
-        for tag in parsed.frontmatter.tags:
+        for tag in frontmatter.tags:
             if query_lower in tag.lower():
                 score += 3.0
         
@@ -91,40 +269,23 @@ class SearchEngine:
         
         return score
     
-    def _extract_title(self, content: str) -> str:
-        """Extract title from markdown content."""
-        lines = content.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('# '):
-                return line[2:].strip()
-        return ""
-    
-    def get_notes_by_tags(self, tags: List[str]) -> List[Dict[str, Any]]:
-        """Get all notes that match any of the given tags."""
-        results = []
-        notes = self.file_manager.list_notes()
+    def get_notes_by_tags(self, tags: List[str], tag_mode: str = "any") -> List[Dict[str, Any]]:
+        """Get all notes that match the given tags (any, all or none of them)."""
+        if self.auto_refresh:
+            self.index.refresh()
         
-        for filename in notes:
-            try:
-                content = self.file_manager.read_note(filename)
-                parsed = parse_markdown(content)
-                
-                # Check if note has any matching tags
-                if any(tag in parsed.frontmatter.tags for tag in tags):
-                    title = self._extract_title(content) or filename.replace('.md', '')
-                    
-                    results.append({
-                        'filename': filename,
-                        'title': title,
-                        'summary': parsed.frontmatter.summary,
-                        'tags': parsed.frontmatter.tags,
-                        'created': parsed.frontmatter.created,
-                        'updated': parsed.frontmatter.updated
-                    })
-            except Exception:
-                continue
+        results = []
+        for doc_id in self.index.tag_index.filter(tags, tag_mode):
+            doc = self.index.docs[doc_id]
+            results.append({
+                'filename': doc.filename,
+                'title': doc.title,
+                'summary': doc.frontmatter.summary,
+                'tags': list(doc.frontmatter.tags),
+                'created': doc.frontmatter.created,
+                'updated': doc.frontmatter.updated
+            })
         
         # Sort by creation date (newest first)
         results.sort(key=lambda x: x['created'], reverse=True)
-        return results
\ No newline at end of file
+        return results
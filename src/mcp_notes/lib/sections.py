@@ -0,0 +1,264 @@
+"""Reading parts of a note: byte ranges, line ranges and sections."""
+
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
+
+from .file_manager import FileManager, stat_key
+
+
+# An ATX heading or a code fence line (headings inside fences are code)
+HEADING_LINE_PATTERN = re.compile(
+    rb'^ {0,3}(?:(#{1,6})[ \t]+([^\r\n]*)|(`{3,}|~{3,})[^\r\n]*)$', re.MULTILINE
+)
+CLOSING_HASHES_PATTERN = re.compile(r'(?:^|[ \t]+)#+[ \t]*$')
+FRONTMATTER_BYTES_PATTERN = re.compile(rb'\A---[ \t\r]*\n.*?\n---[ \t\r]*(?:\n|\Z)', re.DOTALL)
+NEWLINE_PATTERN = re.compile(rb'\n')
+
+DEFAULT_OUTLINE_ENTRIES = 256
+
+
+class Heading:
+    """A heading and the byte span of its section in the note file.
+
+    The section runs from the heading line up to the next heading of the
+    same or a higher level, or the end of the file.
+    """
+
+    __slots__ = ('level', 'title', 'start', 'end')
+
+    def __init__(self, level: int, title: str, start: int, end: int):
+        self.level = level
+        self.title = title
+        self.start = start
+        self.end = end
+
+
+class NoteExcerpt:
+    """Decoded text of a byte span of a note.
+
+    end is where the text stops; if it was cut short by max_chars, the
+    rest of the requested span runs from end to requested_end.
+    """
+
+    __slots__ = ('text', 'start', 'end', 'requested_end', 'size')
+
+    def __init__(self, text: str, start: int, end: int, requested_end: int, size: int):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.requested_end = requested_end
+        self.size = size
+
+    @property
+    def truncated(self) -> bool:
+        return self.end < self.requested_end
+
+
+def find_headings(data) -> List[Heading]:
+    """Heading table of a note's raw bytes (bytes or an mmap).
+
+    Skips the frontmatter and fenced code blocks, where lines starting
+    with '#' are comments.
+    """
+    frontmatter = FRONTMATTER_BYTES_PATTERN.match(data)
+    position = frontmatter.end() if frontmatter else 0
+
+    headings: List[Heading] = []
+    fence: Optional[bytes] = None
+    for match in HEADING_LINE_PATTERN.finditer(data, position):
+        marker = match.group(3)
+        if marker is not None:
+            if fence is None:
+                fence = marker
+            elif marker[:1] == fence[:1] and len(marker) >= len(fence):
+                fence = None
+            continue
+        if fence is not None:
+            continue
+
+        level = len(match.group(1))
+        title = match.group(2).decode('utf-8', 'replace').rstrip('\r')
+        title = CLOSING_HASHES_PATTERN.sub('', title).strip()
+        headings.append(Heading(level, title, match.start(), len(data)))
+
+    # Close each section at the next heading of the same or higher level
+    open_headings: List[Heading] = []
+    for heading in headings:
+        while open_headings and open_headings[-1].level >= heading.level:
+            open_headings.pop().end = heading.start
+        open_headings.append(heading)
+    return headings
+
+
+def normalise_heading(title: str) -> str:
+    """Heading text for matching: without leading '#', case and spacing folded."""
+    return ' '.join(title.lstrip('#').split()).casefold()
+
+
+def find_section(headings: List[Heading], section: str) -> Optional[Heading]:
+    """First heading matching a section name."""
+    wanted = normalise_heading(section)
+    for heading in headings:
+        if normalise_heading(heading.title) == wanted:
+            return heading
+    return None
+
+
+def line_span(data, start_line: int = 1, end_line: Optional[int] = None) -> Tuple[int, int]:
+    """Byte span of 1-based, inclusive lines start_line..end_line."""
+    if start_line < 1 or (end_line is not None and end_line < start_line):
+        raise ValueError("Line ranges are 1-based and end_line must not precede start_line")
+
+    newlines: Iterator[re.Match] = NEWLINE_PATTERN.finditer(data)
+    start = 0
+    for _ in range(start_line - 1):
+        match = next(newlines, None)
+        if match is None:
+            return len(data), len(data)
+        start = match.end()
+
+    if end_line is None:
+        return start, len(data)
+
+    end = start
+    for _ in range(end_line - start_line + 1):
+        match = next(newlines, None)
+        if match is None:
+            return start, len(data)
+        end = match.end()
+    return start, end
+
+
+def decode_span(data, start: int, end: int, max_chars: Optional[int] = None) -> Tuple[str, int]:
+    """Decode data[start:end], stopping after max_chars characters.
+
+    Only the bytes needed are decoded. Returns the text with newlines
+    translated as read_note does, and the byte offset where decoding
+    stopped.
+    """
+    limit = end
+    if max_chars is not None:
+        # A character is at most 4 bytes; keep one more for a trailing \r\n
+        limit = min(end, start + max_chars * 4 + 1)
+    raw = data[start:_char_boundary(data, limit, end)]
+    text = raw.decode('utf-8')
+    stop = start + len(raw)
+    if max_chars is not None and len(text) > max_chars:
+        # Don't split a \r\n pair, which would read as two line breaks
+        cut = max_chars + 1 if text[max_chars - 1:max_chars + 1] == '\r\n' else max_chars
+        text = text[:cut]
+        stop = start + len(text.encode('utf-8'))
+
+    return text.replace('\r\n', '\n').replace('\r', '\n'), stop
+
+
+def _char_boundary(data, offset: int, end: int) -> int:
+    """Move offset back so it doesn't split a UTF-8 character."""
+    while offset < end and offset > 0 and data[offset] & 0xC0 == 0x80:
+        offset -= 1
+    return offset
+
+
+class SectionReader:
+    """Serves byte ranges, line ranges and sections of notes.
+
+    Notes are memory-mapped, so only the requested region is read and
+    decoded. Heading tables are kept per note and reused while the
+    file's (st_mtime_ns, st_size, st_ino) are unchanged. Safe to use from
+    several threads.
+    """
+
+    def __init__(self, file_manager: FileManager, max_entries: int = DEFAULT_OUTLINE_ENTRIES):
+        self.file_manager = file_manager
+        self.max_entries = max_entries
+        self._outlines: 'OrderedDict[str, Tuple[Tuple[int, int, int], List[Heading]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(
+        self,
+        filename: str,
+        start_byte: Optional[int] = None,
+        end_byte: Optional[int] = None,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        section: Optional[str] = None,
+        max_chars: Optional[int] = None,
+    ) -> NoteExcerpt:
+        """Read part of a note.
+
+        At most one of a byte range, a line range or a section may be
+        given; without any, the whole note is read. max_chars caps the
+        characters returned. Raises FileNotFoundError for missing notes
+        and ValueError for bad ranges or unknown sections.
+        """
+        selectors = [
+            start_byte is not None or end_byte is not None,
+            start_line is not None or end_line is not None,
+            section is not None,
+        ]
+        if sum(selectors) > 1:
+            raise ValueError("Give only one of a byte range, a line range or a section")
+        if max_chars is not None and max_chars <= 0:
+            raise ValueError("max_chars must be positive")
+
+        note_path = self.file_manager.get_note_path(filename)
+        try:
+            f = open(note_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Note not found: {filename}") from None
+
+        with f:
+            stat = stat_key(os.fstat(f.fileno()))
+            size = stat[1]
+            if size == 0:
+                if section is not None:
+                    raise ValueError(f"Section not found: {section}")
+                return NoteExcerpt('', 0, 0, 0, 0)
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if section is not None:
+                    heading = find_section(self._headings(filename, stat, data), section)
+                    if heading is None:
+                        raise ValueError(f"Section not found: {section}")
+                    start, end = heading.start, heading.end
+                elif selectors[1]:
+                    start, end = line_span(data, start_line or 1, end_line)
+                else:
+                    start = start_byte or 0
+                    end = size if end_byte is None else min(end_byte, size)
+                    if start < 0 or end < start:
+                        raise ValueError("Byte ranges must satisfy 0 <= start_byte <= end_byte")
+                    start = _char_boundary(data, min(start, size), size)
+                    end = _char_boundary(data, end, size)
+
+                text, stop = decode_span(data, start, end, max_chars)
+        return NoteExcerpt(text, start, stop, end, size)
+
+    def headings(self, filename: str) -> List[Heading]:
+        """Heading table of a note."""
+        note_path = self.file_manager.get_note_path(filename)
+        with open(note_path, 'rb') as f:
+            stat = stat_key(os.fstat(f.fileno()))
+            if stat[1] == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._headings(filename, stat, data)
+
+    def _headings(self, filename: str, stat: Tuple[int, int, int], data) -> List[Heading]:
+        with self._lock:
+            entry = self._outlines.get(filename)
+            if entry is not None and entry[0] == stat:
+                self._outlines.move_to_end(filename)
+                return entry[1]
+
+        headings = find_headings(data)
+        with self._lock:
+            self._outlines[filename] = (stat, headings)
+            self._outlines.move_to_end(filename)
+            while len(self._outlines) > self.max_entries:
+                self._outlines.popitem(last=False)
+        return headings
@@ -0,0 +1,123 @@
+"""Match snippets for search results."""
+
+from typing import Dict, List, Optional, Tuple
+
+from .file_manager import FileManager
+from .index import NoteIndex, TOKEN_PATTERN
+from .types import SearchSnippet
+
+
+class SnippetBuilder:
+    """Builds match snippets from stored body token offsets.
+
+    Hits come from the postings (token position -> byte offset in the file),
+    so the note is never rescanned for matches. Only the byte window around
+    each chosen cluster of hits is read from disk.
+    """
+
+    def __init__(self, index: NoteIndex, file_manager: FileManager):
+        self.index = index
+        self.file_manager = file_manager
+
+    def build(self, doc_id: int, terms: List[str], length: int = 160, count: int = 3) -> List[SearchSnippet]:
+        """Up to `count` snippets of about `length` bytes around query term hits."""
+        hits = self._body_hits(doc_id, terms)
+        if not hits or count <= 0 or length <= 0:
+            return []
+
+        snippets = []
+        for window in self._select_windows(hits, length, count):
+            try:
+                snippet = self._read_snippet(doc_id, window, length)
+            except OSError:
+                break
+            if snippet is not None:
+                snippets.append(snippet)
+
+        snippets.sort(key=lambda snippet: snippet.offset)
+        return snippets
+
+    def _body_hits(self, doc_id: int, terms: List[str]) -> List[Tuple[int, str]]:
+        """(byte offset, term) for every body occurrence of the query terms."""
+        offsets = self.index.docs[doc_id].body_offsets
+        hits = []
+        for term in set(terms):
+            positions = self.index.postings_for(term).get(doc_id, {}).get('body', ())
+            hits.extend((offsets[position], term) for position in positions)
+        hits.sort()
+        return hits
+
+    def _select_windows(self, hits: List[Tuple[int, str]], length: int, count: int) -> List[List[Tuple[int, str]]]:
+        """Greedily pick the windows covering the most distinct terms, then most hits."""
+        windows = []
+        remaining = hits
+        while remaining and len(windows) < count:
+            best = (0, 0, 0, 0)
+            term_counts: Dict[str, int] = {}
+            end = 0
+            for start in range(len(remaining)):
+                while end < len(remaining) and remaining[end][0] - remaining[start][0] < length:
+                    term = remaining[end][1]
+                    term_counts[term] = term_counts.get(term, 0) + 1
+                    end += 1
+
+                best = max(best, (len(term_counts), end - start, -start, end))
+
+                term = remaining[start][1]
+                term_counts[term] -= 1
+                if not term_counts[term]:
+                    del term_counts[term]
+
+            _, _, neg_start, end = best
+            windows.append(remaining[-neg_start:end])
+            remaining = remaining[:-neg_start] + remaining[end:]
+        return windows
+
+    def _read_snippet(self, doc_id: int, window: List[Tuple[int, str]], length: int) -> Optional[SearchSnippet]:
+        first = window[0][0]
+        last = window[-1][0]
+        start = max(0, first - max(0, length - (last - first)) // 2)
+        read_length = max(length, last - start + 64)
+
+        filename = self.index.docs[doc_id].filename
+        data = self.file_manager.read_note_range(filename, start, read_length)
+
+        # Start on a character boundary so offsets stay exact
+        skip = 0
+        while skip < len(data) and 0x80 <= data[skip] < 0xC0:
+            skip += 1
+        data = data[skip:]
+        start += skip
+        read_length -= skip
+
+        text = data.decode('utf-8', errors='ignore').replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
+
+        highlights = []
+        for offset, _ in window:
+            char_start = len(data[:offset - start].decode('utf-8', errors='ignore'))
+            match = TOKEN_PATTERN.match(text, char_start)
+            if match:
+                highlights.append((match.start(), match.end()))
+        if not highlights:
+            return None
+
+        # Trim partial words at the edges without cutting into highlights
+        left = 0
+        if start > 0:
+            space = text.find(' ', 0, highlights[0][0])
+            left = space + 1 if space != -1 else 0
+        right = len(text)
+        if len(data) == read_length:
+            space = text.rfind(' ', highlights[-1][1])
+            right = space if space != -1 else len(text)
+
+        trimmed = text[left:right]
+        stripped = trimmed.lstrip()
+        left += len(trimmed) - len(stripped)
+        trimmed = stripped.rstrip()
+
+        return SearchSnippet(
+            text=trimmed,
+            offset=start + len(text[:left].encode('utf-8')),
+            highlights=[(s - left, e - left) for s, e in highlights],
+        )
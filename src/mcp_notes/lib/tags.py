@@ -0,0 +1,84 @@
+"""Tag index backed by doc-id bitmaps."""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from .index import IndexedNote
+
+
+def bitmap_ids(bitmap: int) -> List[int]:
+    """Doc ids set in a bitmap, in ascending order."""
+    return [doc_id for doc_id, bit in enumerate(reversed(bin(bitmap)[2:])) if bit == '1']
+
+
+class TagIndex:
+    """Maps each tag to a bitmap of the doc ids carrying it.
+
+    Tag filters become bitwise operations: OR for any, AND for all and
+    AND NOT for none. Doc ids are small and recycled by the index, so the
+    bitmaps stay dense.
+    """
+
+    def __init__(self):
+        self.bitmaps: Dict[str, int] = {}
+        self.all_docs = 0
+        self._doc_tags: Dict[int, List[str]] = {}
+
+    def add_note(self, doc: 'IndexedNote', content: str) -> None:
+        """Record a note's tags."""
+        bit = 1 << doc.doc_id
+        tags = list(dict.fromkeys(doc.frontmatter.tags))
+        for tag in tags:
+            self.bitmaps[tag] = self.bitmaps.get(tag, 0) | bit
+        self._doc_tags[doc.doc_id] = tags
+        self.all_docs |= bit
+
+    def remove_note(self, doc_id: int) -> None:
+        """Forget a note's tags."""
+        bit = 1 << doc_id
+        for tag in self._doc_tags.pop(doc_id, []):
+            bitmap = self.bitmaps.get(tag, 0) & ~bit
+            if bitmap:
+                self.bitmaps[tag] = bitmap
+            else:
+                self.bitmaps.pop(tag, None)
+        self.all_docs &= ~bit
+
+    def tags(self) -> Dict[str, int]:
+        """Every tag with the number of notes carrying it."""
+        return {tag: bin(bitmap).count('1') for tag, bitmap in self.bitmaps.items()}
+
+    def match(
+        self,
+        any_tags: Optional[Iterable[str]] = None,
+        all_tags: Optional[Iterable[str]] = None,
+        none_tags: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Bitmap of notes matching the tag filters (all notes if none given)."""
+        result = self.all_docs
+
+        if any_tags is not None:
+            union = 0
+            for tag in any_tags:
+                union |= self.bitmaps.get(tag, 0)
+            result &= union
+
+        for tag in all_tags or ():
+            result &= self.bitmaps.get(tag, 0)
+            if not result:
+                return 0
+
+        for tag in none_tags or ():
+            result &= ~self.bitmaps.get(tag, 0)
+
+        return result
+
+    def filter(self, tags: List[str], mode: str = "any") -> List[int]:
+        """Doc ids whose tags match a filter with any/all/none semantics."""
+        if mode == "any":
+            return bitmap_ids(self.match(any_tags=tags))
+        if mode == "all":
+            return bitmap_ids(self.match(all_tags=tags))
+        if mode == "none":
+            return bitmap_ids(self.match(none_tags=tags))
+        raise ValueError(f"Unknown tag mode: {mode}")
@@ -0,0 +1,61 @@
+"""Trigram index for substring search."""
+
+from typing import Dict, List, Optional, Set
+
+from .index import IndexedNote
+
+
+def trigrams(text: str) -> Set[str]:
+    """All three-character substrings of a text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Maps lowercase trigrams of note content and titles to the notes containing them.
+
+    Any note containing a substring must contain all of the substring's
+    trigrams, so intersecting their postings gives a candidate set that
+    can then be verified with an exact substring check.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = {}
+        self._doc_grams: Dict[int, List[str]] = {}
+
+    def add_note(self, doc: IndexedNote, content: str) -> None:
+        """Index the trigrams of a note's content and its indexed title.
+
+        The title may come from the filename, which the content lacks.
+        """
+        grams = trigrams(content.lower()) | trigrams(doc.title.lower())
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(doc.doc_id)
+        self._doc_grams[doc.doc_id] = list(grams)
+
+    def remove_note(self, doc_id: int) -> None:
+        """Drop a note from the index."""
+        for gram in self._doc_grams.pop(doc_id, []):
+            docs = self.postings.get(gram)
+            if docs is None:
+                continue
+            docs.discard(doc_id)
+            if not docs:
+                del self.postings[gram]
+
+    def candidates(self, query: str) -> Optional[Set[int]]:
+        """Notes that may contain a substring.
+
+        Returns None when the query is too short to narrow the search, in
+        which case every note is a candidate.
+        """
+        grams = trigrams(query.lower())
+        if not grams:
+            return None
+
+        ordered = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+        candidates = set(self.postings.get(ordered[0], ()))
+        for gram in ordered[1:]:
+            if not candidates:
+                break
+            candidates &= self.postings.get(gram, set())
+        return candidates
@@ -1,7 +1,7 @@
 """Type definitions for MCP Notes."""
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from pydantic import BaseModel
 
 
@@ -22,6 +22,13 @@ class Note(BaseModel):
     content: str
     
 
+class SearchSnippet(BaseModel):
+    """Excerpt of a note around matching terms."""
+    text: str
+    offset: int  # Byte offset of the excerpt in the note file
+    highlights: List[Tuple[int, int]]  # Character ranges of matches within text
+
+
 class SearchResult(BaseModel):
     """Search result with relevance scoring."""
     filename: str
@@ -30,6 +37,13 @@ class SearchResult(BaseModel):
     relevance_score: float
     tags: List[str]
     created: str
+    snippets: List[SearchSnippet] = []
+
+
+class SearchResponse(BaseModel):
+    """Top search results with the total number of matching notes."""
+    results: List[SearchResult]
+    total: int
 
 
 class CreateNoteParams(BaseModel):
@@ -41,6 +55,7 @@ class CreateNoteParams(BaseModel):
     conversation_id: Optional[str] = None
     ai_client: Optional[str] = None
     date_for: Optional[str] = None  # Natural language date like "2 days ago", "last friday"
+    wait_for_commit: Optional[bool] = False  # Return only once the git commit is done
 
 
 class SearchNotesParams(BaseModel):
@@ -48,17 +63,41 @@ class SearchNotesParams(BaseModel):
     query: str
     limit: Optional[int] = 10
     tags: Optional[List[str]] = None
+    tag_mode: Optional[str] = "any"  # any, all, none
+    ranking: Optional[str] = "bm25f"  # bm25f, classic
+    mode: Optional[str] = "terms"  # terms, fuzzy, substring, semantic
+    snippet_count: Optional[int] = 3
+    snippet_length: Optional[int] = 160
 
 
 class ListNotesParams(BaseModel):
     """Parameters for listing notes."""
     limit: Optional[int] = 20
     offset: Optional[int] = 0
+    cursor: Optional[str] = None  # next_cursor from a previous page
     tags: Optional[List[str]] = None
+    tag_mode: Optional[str] = "any"  # any, all, none
     sort_by: Optional[str] = "created"  # created, updated, title
     sort_order: Optional[str] = "desc"  # asc, desc
 
 
 class GetNoteParams(BaseModel):
     """Parameters for getting a specific note."""
-    filename: str
\ No newline at end of file
+    filename: str
+    start_byte: Optional[int] = None  # Byte range [start_byte, end_byte) of the file
+    end_byte: Optional[int] = None
+    start_line: Optional[int] = None  # 1-based, inclusive line range
+    end_line: Optional[int] = None
+    section: Optional[str] = None  # Heading whose section to return
+    max_chars: Optional[int] = None
+
+
+class CommitStatusParams(BaseModel):
+    """Parameters for checking notes' git commit status."""
+    filenames: Optional[List[str]] = None  # Defaults to the notes still pending
+
+
+class NoteHistoryParams(BaseModel):
+    """Parameters for getting the git history of a note."""
+    filename: Optional[str] = None  # Omit for the history of the whole vault
+    limit: Optional[int] = 10
@@ -0,0 +1,262 @@
+"""Offline vector similarity search over notes."""
+
+import json
+import math
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .index import IndexedNote, NoteIndex, tokenize
+from .ranking import BM25FScorer, DEFAULT_FIELD_WEIGHTS
+
+
+MATRIX_FILENAME = "vectors.npy"
+ROWS_FILENAME = "vectors.json"
+
+
+def vectors_available() -> bool:
+    """Whether NumPy is installed, which semantic search requires."""
+    return np is not None
+
+
+def hash_term(term: str, dim: int) -> Tuple[int, float]:
+    """Map a term to a vector component and a sign (the hashing trick)."""
+    digest = zlib.crc32(term.encode('utf-8'))
+    return digest % dim, 1.0 if digest & 0x80000000 else -1.0
+
+
+class VectorIndex:
+    """Hashed term-frequency embeddings held in one float32 matrix.
+
+    Each note is embedded as a signed, hashed bag of words with sublinear
+    field-weighted term frequencies, L2-normalised. Queries are weighted by
+    IDF at query time, so stored vectors never go stale as the corpus
+    statistics change. Scoring is a single matrix-vector product followed
+    by argpartition for the top k.
+
+    When a directory is given, the matrix is persisted there as a .npy
+    file and memory-mapped on load, with rows updated in place; the file
+    is only rewritten when the matrix has to grow. Each row records the
+    mtime and size of the note it was embedded from, so a loaded row is
+    reused as is when its note is indexed again unchanged.
+    """
+
+    def __init__(self, index: NoteIndex, directory: Optional[str] = None, dim: int = 256):
+        if np is None:
+            raise ImportError("Semantic search requires numpy (pip install 'mcp-notes[semantic]')")
+
+        self.index = index
+        self.dim = dim
+        self.directory = Path(directory) if directory else None
+        self.idf = BM25FScorer(index).idf
+
+        self.matrix = np.zeros((0, dim), dtype=np.float32)
+        self.active = np.zeros(0, dtype=bool)
+        self.rows: Dict[str, int] = {}
+        self.filenames: List[Optional[str]] = []
+        self.keys: List[Optional[Tuple[int, int]]] = []
+        self.free_rows: List[int] = []
+        self._doc_filenames: Dict[int, str] = {}
+        self.dirty = False
+
+        if self.directory:
+            self._load()
+
+    def add_note(self, doc: IndexedNote, content: str) -> None:
+        """Embed an indexed note and store its row."""
+        key = (doc.mtime_ns, doc.size)
+        row = self.rows.get(doc.filename)
+        if row is None:
+            row = self._allocate_row(doc.filename)
+        elif not self.active[row] and self.keys[row] == key:
+            # Loaded from disk and the note is unchanged since
+            self.active[row] = True
+            self._doc_filenames[doc.doc_id] = doc.filename
+            return
+
+        self.matrix[row] = self.embed_document(doc.doc_id)
+        self.active[row] = True
+        self.keys[row] = key
+        self._doc_filenames[doc.doc_id] = doc.filename
+        self.dirty = True
+
+    def remove_note(self, doc_id: int) -> None:
+        """Release a note's row for reuse."""
+        filename = self._doc_filenames.pop(doc_id, None)
+        if filename is not None:
+            self._free_row(filename)
+
+    def embed_document(self, doc_id: int) -> 'np.ndarray':
+        """Embed an indexed note from its postings."""
+        components = []
+        values = []
+        for term in self.index.terms_for(doc_id):
+            fields = self.index.postings_for(term)[doc_id]
+            tf = sum(DEFAULT_FIELD_WEIGHTS.get(field, 1.0) * len(positions) for field, positions in fields.items())
+            component, sign = hash_term(term, self.dim)
+            components.append(component)
+            values.append(sign * (1.0 + math.log(tf)))
+        return self._normalise(np.bincount(np.asarray(components, dtype=np.intp), weights=values, minlength=self.dim))
+
+    def embed_query(self, query: str) -> 'np.ndarray':
+        """Embed query text, weighting terms by inverse document frequency."""
+        components = []
+        values = []
+        for term in tokenize(query):
+            component, sign = hash_term(term, self.dim)
+            components.append(component)
+            values.append(sign * self.idf(term))
+        return self._normalise(np.bincount(np.asarray(components, dtype=np.intp), weights=values, minlength=self.dim))
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        doc_ids: Optional[Iterable[int]] = None
+    ) -> Tuple[List[Tuple[float, int]], int]:
+        """Top-k (score, doc_id) pairs by cosine similarity, and the match count.
+
+        If doc_ids is given, only those notes are considered.
+        """
+        used = len(self.filenames)
+        vector = self.embed_query(query)
+        if not used or k <= 0 or not vector.any():
+            return [], 0
+
+        scores = self.matrix[:used] @ vector
+        if doc_ids is not None:
+            allowed = np.zeros(used, dtype=bool)
+            for doc_id in doc_ids:
+                row = self.rows.get(self._doc_filenames.get(doc_id))
+                if row is not None:
+                    allowed[row] = True
+            allowed &= self.active[:used]
+        else:
+            allowed = self.active[:used]
+        scores = np.where(allowed, scores, 0.0)
+
+        total = int(np.count_nonzero(scores > 0))
+        k = min(k, total)
+        if not k:
+            return [], total
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        results = []
+        for row in top:
+            doc = self.index.get(self.filenames[row])
+            if doc is not None:
+                results.append((float(scores[row]), doc.doc_id))
+        return results, total
+
+    def save(self) -> None:
+        """Persist pending row changes.
+
+        Rows loaded from disk for notes that are no longer indexed are
+        released first.
+        """
+        if not self.directory or not self.dirty:
+            return
+
+        for row in np.flatnonzero(~self.active[:len(self.filenames)]):
+            filename = self.filenames[row]
+            if filename is not None and self.index.get(filename) is None:
+                self._free_row(filename)
+
+        if isinstance(self.matrix, np.memmap):
+            self.matrix.flush()
+        else:
+            self._write_matrix(self.matrix)
+
+        self._write_rows()
+        self.dirty = False
+
+    def _allocate_row(self, filename: str) -> int:
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self.filenames[row] = filename
+        else:
+            row = len(self.filenames)
+            if row >= self.matrix.shape[0]:
+                self._grow(max(64, 2 * self.matrix.shape[0]))
+            self.filenames.append(filename)
+            self.keys.append(None)
+        self.rows[filename] = row
+        return row
+
+    def _free_row(self, filename: str) -> None:
+        row = self.rows.pop(filename, None)
+        if row is None:
+            return
+        self.matrix[row] = 0.0
+        self.active[row] = False
+        self.filenames[row] = None
+        self.keys[row] = None
+        self.free_rows.append(row)
+        self.dirty = True
+
+    def _grow(self, capacity: int) -> None:
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:self.matrix.shape[0]] = self.matrix
+        active = np.zeros(capacity, dtype=bool)
+        active[:self.active.shape[0]] = self.active
+        self.active = active
+        if self.directory:
+            self._write_matrix(matrix)
+        else:
+            self.matrix = matrix
+
+    def _normalise(self, vector: 'np.ndarray') -> 'np.ndarray':
+        vector = vector.astype(np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector
+
+    def _load(self) -> None:
+        matrix_path = self.directory / MATRIX_FILENAME
+        rows_path = self.directory / ROWS_FILENAME
+        if not matrix_path.exists() or not rows_path.exists():
+            return
+
+        try:
+            meta = json.loads(rows_path.read_text(encoding='utf-8'))
+            matrix = np.load(matrix_path, mmap_mode='r+')
+        except Exception:
+            # Corrupt or unreadable cache, rebuild from scratch
+            return
+
+        if meta.get('dim') != self.dim or matrix.shape[1] != self.dim:
+            return
+
+        self.matrix = matrix
+        # Loaded rows stay inactive until their note is indexed again
+        self.active = np.zeros(matrix.shape[0], dtype=bool)
+        self.filenames = meta['filenames']
+        keys = meta.get('keys') or [None] * len(self.filenames)
+        self.keys = [tuple(key) if key else None for key in keys]
+        self.rows = {filename: row for row, filename in enumerate(self.filenames) if filename is not None}
+        self.free_rows = [row for row, filename in enumerate(self.filenames) if filename is None]
+
+    def _write_matrix(self, matrix: 'np.ndarray') -> None:
+        """Write the matrix to disk and memory-map it for in-place updates."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        matrix_path = self.directory / MATRIX_FILENAME
+        temp_path = self.directory / (MATRIX_FILENAME + '.tmp')
+        with open(temp_path, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(temp_path, matrix_path)
+        self.matrix = np.load(matrix_path, mmap_mode='r+')
+
+    def _write_rows(self) -> None:
+        rows_path = self.directory / ROWS_FILENAME
+        temp_path = self.directory / (ROWS_FILENAME + '.tmp')
+        temp_path.write_text(json.dumps({'dim': self.dim, 'filenames': self.filenames, 'keys': self.keys}), encoding='utf-8')
+        os.replace(temp_path, rows_path)
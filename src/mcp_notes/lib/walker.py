@@ -0,0 +1,163 @@
+"""Recursive listing of the notes in a vault."""
+
+import fnmatch
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# A directory modified this close to when it was scanned may change again
+# within the same mtime tick, so its snapshot isn't trusted
+RACY_WINDOW_NS = 1_000_000_000
+
+StatKey = Tuple[int, int, int]
+
+
+class DirSnapshot:
+    """Notes and subdirectories of one directory as of its last scan."""
+
+    __slots__ = ('mtime_ns', 'notes', 'subdirs', 'settled')
+
+    def __init__(self, mtime_ns: int, notes: Tuple[str, ...], subdirs: Tuple[str, ...], settled: bool):
+        self.mtime_ns = mtime_ns
+        self.notes = notes
+        self.subdirs = subdirs
+        self.settled = settled
+
+
+class VaultWalker:
+    """Lists notes in the vault and its subfolders using os.scandir.
+
+    Notes are identified by their path relative to the vault, with '/'
+    separators. Hidden files and directories (.git, .obsidian, .trash, the
+    index cache) are skipped, as is anything matching the ignore patterns,
+    which are fnmatch patterns tested against both the name and the
+    relative path of each entry.
+
+    Each directory's mtime and entries are remembered between walks. A
+    directory's mtime changes whenever an entry is added, removed or
+    renamed in it, so a directory whose mtime is unchanged is not
+    rescanned; only its own stat is taken. Walks are serialised, so the
+    walker can be shared between threads.
+    """
+
+    def __init__(self, root: str, ignore: Sequence[str] = ()):
+        self.root = os.fspath(root)
+        self.ignore = tuple(ignore)
+        self._snapshot: Dict[str, DirSnapshot] = {}
+        self.dirs_scanned = 0
+        self.dirs_reused = 0
+        self._lock = threading.Lock()
+
+    def list_notes(self) -> List[str]:
+        """Relative paths of all notes, sorted."""
+        return sorted(self._walk(None))
+
+    def scan(self) -> Dict[str, StatKey]:
+        """All notes with their (st_mtime_ns, st_size, st_ino).
+
+        For directories that are rescanned, stats come from the scandir
+        entries; notes in unchanged directories are stat'ed directly.
+        """
+        stats: Dict[str, StatKey] = {}
+        self._walk(stats)
+        return stats
+
+    def directories(self) -> List[str]:
+        """Relative paths of all walked directories ('' is the vault itself)."""
+        with self._lock:
+            self._walk_locked(None)
+            return list(self._snapshot)
+
+    def is_ignored(self, relpath: str) -> bool:
+        """Whether a path relative to the vault is skipped by the walker."""
+        parts = relpath.split('/')
+        for depth, name in enumerate(parts, 1):
+            if name.startswith('.') or self._matches('/'.join(parts[:depth]), name):
+                return True
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        """Directory counters."""
+        return {
+            'directories': len(self._snapshot),
+            'dirs_scanned': self.dirs_scanned,
+            'dirs_reused': self.dirs_reused,
+        }
+
+    def _matches(self, relpath: str, name: str) -> bool:
+        return any(
+            fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(relpath, pattern)
+            for pattern in self.ignore
+        )
+
+    def _walk(self, stats: Optional[Dict[str, StatKey]]) -> List[str]:
+        with self._lock:
+            return self._walk_locked(stats)
+
+    def _walk_locked(self, stats: Optional[Dict[str, StatKey]]) -> List[str]:
+        notes: List[str] = []
+        snapshot: Dict[str, DirSnapshot] = {}
+        pending = ['']
+        while pending:
+            reldir = pending.pop()
+            path = os.path.join(self.root, reldir) if reldir else self.root
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+            entry = self._snapshot.get(reldir)
+            if entry is not None and entry.settled and entry.mtime_ns == mtime_ns:
+                self.dirs_reused += 1
+                if stats is not None:
+                    self._stat_notes(entry.notes, stats)
+            else:
+                try:
+                    entry = self._scan_dir(reldir, path, mtime_ns, stats)
+                except OSError:
+                    continue
+                self.dirs_scanned += 1
+
+            snapshot[reldir] = entry
+            notes.extend(entry.notes)
+            pending.extend(entry.subdirs)
+
+        self._snapshot = snapshot
+        return notes
+
+    def _scan_dir(
+        self, reldir: str, path: str, mtime_ns: int, stats: Optional[Dict[str, StatKey]]
+    ) -> DirSnapshot:
+        settled = time.time_ns() - mtime_ns > RACY_WINDOW_NS
+        notes = []
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                relpath = f"{reldir}/{name}" if reldir else name
+                if self.ignore and self._matches(relpath, name):
+                    continue
+                try:
+                    # Don't follow directory symlinks, which may form cycles
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(relpath)
+                    elif name.endswith('.md') and entry.is_file():
+                        if stats is not None:
+                            stat = entry.stat()
+                            stats[relpath] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+                        notes.append(relpath)
+                except OSError:
+                    continue
+        return DirSnapshot(mtime_ns, tuple(notes), tuple(subdirs), settled)
+
+    def _stat_notes(self, notes: Sequence[str], stats: Dict[str, StatKey]) -> None:
+        for relpath in notes:
+            try:
+                stat = os.stat(os.path.join(self.root, relpath))
+            except OSError:
+                continue
+            stats[relpath] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
@@ -0,0 +1,401 @@
+"""Vault change watching with inotify or polling."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .file_manager import FileManager
+
+
+# inotify event masks (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+# Events on the vault directory after which its watch is gone
+ROOT_GONE_MASK = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+# Directory events that change which directories need watching
+TREE_CHANGE_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# Passed to the change callback when the whole vault must be rescanned
+RESCAN = None
+
+ChangeCallback = Callable[[Optional[Set[str]]], None]
+
+
+def inotify_available() -> bool:
+    """Whether the inotify backend can be used on this system."""
+    return sys.platform.startswith('linux') and _libc() is not None
+
+
+def _libc() -> Optional[ctypes.CDLL]:
+    name = ctypes.util.find_library('c')
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class InotifyBackend:
+    """Reports changed note filenames from Linux inotify events.
+
+    Every directory the vault walker visits gets its own watch, since
+    inotify is not recursive. When directories are created, removed or
+    renamed the backend is marked stale; the watcher then brings the
+    watches in line with the walker and requests a rescan, as notes may
+    have appeared before their folder was watched or vanished with it.
+    """
+
+    def __init__(self, file_manager: FileManager):
+        self.file_manager = file_manager
+        self.libc = _libc()
+        self.fd = -1
+        self.watches: Dict[int, str] = {}
+        # Directories were added or removed since the watches were synced
+        self.stale = False
+
+    def open(self) -> None:
+        """Create the inotify instance and watch the vault's directories."""
+        fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        try:
+            self.sync_watches()
+        except OSError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        self.watches = {}
+
+    def sync_watches(self, directories: Optional[Iterable[str]] = None) -> None:
+        """Watch exactly the given directories, by default those the walker sees.
+
+        Raises OSError if a watch can't be added (e.g. the
+        max_user_watches limit is reached).
+        """
+        if directories is None:
+            directories = self.file_manager.walker.directories()
+        directories = set(directories)
+        for wd, reldir in list(self.watches.items()):
+            if reldir not in directories:
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+        watched = set(self.watches.values())
+        for reldir in directories - watched:
+            path = self.file_manager.vault_path / reldir if reldir else self.file_manager.vault_path
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(path)), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error == errno.ENOENT:
+                    continue
+                raise OSError(error, f"inotify_add_watch failed for {path}")
+            self.watches[wd] = reldir
+
+    def read_changes(self) -> Tuple[Set[str], bool]:
+        """Drain queued events: (changed note filenames, whether to rescan)."""
+        changed: Set[str] = set()
+        rescan = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+
+                reldir = self.watches.get(wd)
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                elif reldir is None:
+                    # A watch that was removed; its directory is handled
+                    # through its parent's events
+                    continue
+                elif mask & IN_IGNORED:
+                    del self.watches[wd]
+                    rescan = rescan or reldir == ''
+                elif mask & ROOT_GONE_MASK:
+                    rescan = rescan or reldir == ''
+                elif mask & IN_ISDIR:
+                    if mask & TREE_CHANGE_MASK:
+                        self.stale = True
+                elif name.endswith('.md'):
+                    relpath = f"{reldir}/{name}" if reldir else name
+                    if not self.file_manager.walker.is_ignored(relpath):
+                        changed.add(relpath)
+
+        return changed, rescan
+
+
+class PollingBackend:
+    """Reports changed note filenames by comparing stat snapshots."""
+
+    def __init__(self, file_manager: FileManager):
+        self.file_manager = file_manager
+        self.snapshot: Dict[str, Tuple[int, int, int]] = {}
+
+    def open(self) -> None:
+        self.snapshot = self._take_snapshot()
+
+    def close(self) -> None:
+        self.snapshot = {}
+
+    def read_changes(self) -> Tuple[Set[str], bool]:
+        """Compare the vault with the previous snapshot."""
+        snapshot = self._take_snapshot()
+        changed = {
+            filename for filename in snapshot.keys() | self.snapshot.keys()
+            if snapshot.get(filename) != self.snapshot.get(filename)
+        }
+        self.snapshot = snapshot
+        return changed, False
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int, int]]:
+        return self.file_manager.scan_notes()
+
+
+class VaultWatcher:
+    """Watches the vault and reports changed notes in debounced batches.
+
+    Runs inside the asyncio event loop: the inotify descriptor is read
+    with loop.add_reader, and the polling fallback runs as a task. Work
+    that walks the whole vault (polling scans, and re-syncing inotify
+    watches after folders change) runs in the loop's default executor.
+    Changes are collected until no new event has arrived for `debounce`
+    seconds (but at most `max_delay` seconds after the first), then passed
+    to on_change as one set of filenames, so a burst such as a git pull
+    becomes a single batch. on_change receives RESCAN (None) when events
+    may have been lost and the whole vault has to be checked.
+    """
+
+    def __init__(
+        self,
+        file_manager: FileManager,
+        on_change: ChangeCallback,
+        backend: str = "auto",
+        debounce: float = 0.2,
+        max_delay: float = 2.0,
+        poll_interval: float = 2.0,
+    ):
+        self.file_manager = file_manager
+        self.on_change = on_change
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.backend_name = backend
+        self.backend = None
+        self.pending: Set[str] = set()
+        self.rescan_pending = False
+        self.batches = 0
+        self.events = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._first_pending: Optional[float] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.backend is not None
+
+    async def start(self) -> None:
+        """Start watching. Falls back to polling if inotify is unavailable."""
+        self._loop = asyncio.get_running_loop()
+
+        if self.backend_name in ("auto", "inotify") and inotify_available():
+            backend = InotifyBackend(self.file_manager)
+            try:
+                await self._loop.run_in_executor(None, backend.open)
+            except OSError:
+                if self.backend_name == "inotify":
+                    raise
+            else:
+                self.backend = backend
+                self._loop.add_reader(backend.fd, self._on_readable)
+                return
+
+        if self.backend_name == "inotify":
+            raise OSError("inotify is not available")
+
+        self.backend = PollingBackend(self.file_manager)
+        await self._loop.run_in_executor(None, self.backend.open)
+        self._poll_task = self._loop.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop watching, dropping any batch that has not been delivered."""
+        if self.backend is None:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for task in (self._poll_task, self._sync_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._poll_task = None
+        self._sync_task = None
+        if isinstance(self.backend, InotifyBackend):
+            self._loop.remove_reader(self.backend.fd)
+        self.backend.close()
+        self.backend = None
+        self.pending = set()
+        self.rescan_pending = False
+        self._first_pending = None
+
+    def flush(self) -> None:
+        """Deliver pending changes now, including events not yet read.
+
+        Called before serving a request so results never lag behind
+        changes the watcher already knows about. Polling is not forced.
+        """
+        if isinstance(self.backend, InotifyBackend):
+            self._read_inotify()
+        self._deliver()
+
+    def stats(self) -> Dict[str, object]:
+        """Backend in use and event counters."""
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'events': self.events,
+            'batches': self.batches,
+            'pending': len(self.pending),
+        }
+
+    def _on_readable(self) -> None:
+        if self._read_inotify():
+            self._schedule()
+
+    def _read_inotify(self) -> bool:
+        try:
+            collected = self._collect()
+        except OSError:
+            self._fall_back_to_polling()
+            return True
+        if self.backend.stale and self._sync_task is None:
+            self._sync_task = self._loop.create_task(self._sync_watches())
+        return collected
+
+    async def _sync_watches(self) -> None:
+        """Re-sync inotify watches with the walker, walking the vault off the loop."""
+        backend = self.backend
+        try:
+            while backend.stale:
+                backend.stale = False
+                directories = await self._loop.run_in_executor(None, self.file_manager.walker.directories)
+                if self.backend is not backend:
+                    return
+                try:
+                    backend.sync_watches(directories)
+                except OSError:
+                    self._fall_back_to_polling()
+                    self._schedule()
+                    return
+                # Notes may have appeared before their folder was watched
+                self._request_rescan()
+                self._schedule()
+        finally:
+            self._sync_task = None
+
+    def _fall_back_to_polling(self) -> None:
+        """Switch to polling when inotify can no longer cover the vault."""
+        self._loop.remove_reader(self.backend.fd)
+        self.backend.close()
+        self.backend = PollingBackend(self.file_manager)
+        self._poll_task = self._loop.create_task(self._poll(opened=False))
+        # Changes may have been missed while switching
+        self._request_rescan()
+
+    def _request_rescan(self) -> None:
+        self.rescan_pending = True
+        if self._first_pending is None:
+            self._first_pending = self._loop.time()
+
+    async def _poll(self, opened: bool = True) -> None:
+        backend = self.backend
+        if not opened:
+            await self._loop.run_in_executor(None, backend.open)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            # A scan stats every note, so keep it off the event loop
+            changed, rescan = await self._loop.run_in_executor(None, backend.read_changes)
+            if self._add_changes(changed, rescan):
+                self._schedule()
+
+    def _collect(self) -> bool:
+        """Read changes from the backend into the pending batch."""
+        return self._add_changes(*self.backend.read_changes())
+
+    def _add_changes(self, changed: Set[str], rescan: bool) -> bool:
+        self.events += len(changed)
+        self.pending |= changed
+        self.rescan_pending = self.rescan_pending or rescan
+        if (changed or rescan) and self._first_pending is None:
+            self._first_pending = self._loop.time()
+        return bool(changed or rescan)
+
+    def _schedule(self) -> None:
+        """(Re)arm the debounce timer, without exceeding max_delay."""
+        if self._timer is not None:
+            self._timer.cancel()
+        deadline = self._first_pending + self.max_delay
+        delay = max(0.0, min(self.debounce, deadline - self._loop.time()))
+        self._timer = self._loop.call_later(delay, self._deliver)
+
+    def _deliver(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.pending and not self.rescan_pending:
+            return
+
+        changes = RESCAN if self.rescan_pending else self.pending
+        self.pending = set()
+        self.rescan_pending = False
+        self._first_pending = None
+        self.batches += 1
+        self.on_change(changes)
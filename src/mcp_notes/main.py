@@ -1,8 +1,12 @@
 """MCP Notes server main entry point."""
 
 import asyncio
+import functools
+import json
 import sys
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -15,15 +19,42 @@ from pathlib import Path
 src_path = Path(__file__).parent.parent
 sys.path.insert(0, str(src_path))
 
-from mcp_notes.config.settings import get_vault_path
-from mcp_notes.lib.file_manager import FileManager
-from mcp_notes.lib.git import GitManager
+from mcp_notes.config.settings import (
+    get_vault_path,
+    get_trigram_index_enabled,
+    get_fuzzy_index_enabled,
+    get_cache_dir,
+    get_vector_index_enabled,
+    get_vector_dim,
+    get_result_cache_entries,
+    get_result_cache_bytes,
+    get_header_bytes,
+    get_content_cache_bytes,
+    get_ignore_patterns,
+    get_watcher_backend,
+    get_watch_debounce,
+    get_watch_poll_interval,
+    get_max_workers,
+    get_commit_window,
+    get_commit_batch_size,
+    get_git_backend,
+    get_git_catch_up_enabled
+)
+from mcp_notes.lib.cache import ResultCache, make_cache_key
+from mcp_notes.lib.catalog import CATALOG_FILENAME, NoteCatalog
+from mcp_notes.lib.file_manager import FileManager, prepare_cache_dir
+from mcp_notes.lib.git import CommitQueue, GitManager
+from mcp_notes.lib.history import HISTORY_FILENAME
+from mcp_notes.lib.fuzzy import FuzzyIndex
+from mcp_notes.lib.index import NoteIndex
 from mcp_notes.lib.search import SearchEngine
+from mcp_notes.lib.sections import SectionReader
+from mcp_notes.lib.trigram import TrigramIndex
+from mcp_notes.lib.vectors import VectorIndex, vectors_available
+from mcp_notes.lib.watcher import VaultWatcher
 from mcp_notes.lib.markdown import (
     create_default_frontmatter, 
     format_markdown, 
-    parse_markdown,
-    extract_title_from_content,
     generate_filename
 )
 from mcp_notes.lib.date_parser import (
@@ -36,17 +67,72 @@ from mcp_notes.lib.types import (
     SearchNotesParams, 
     ListNotesParams,
     GetNoteParams,
-    NoteFrontmatter
+    CommitStatusParams,
+    NoteHistoryParams,
+    NoteFrontmatter,
+    SearchSnippet
 )
 
 
+T = TypeVar('T')
+
+
 class MCPNotesServer:
-    """MCP Notes server implementation."""
+    """MCP Notes server implementation.
+    
+    Tool handlers run their file, YAML, index and git work on a bounded
+    thread pool, so a slow search or commit doesn't hold up other calls.
+    The index, catalog and result cache are shared, so work touching them
+    holds index_lock; reading notes does not, and overlaps with it.
+    """
     
     def __init__(self, vault_path: str):
-        self.file_manager = FileManager(vault_path)
-        self.git_manager = GitManager(vault_path)
-        self.search_engine = SearchEngine(self.file_manager)
+        self.file_manager = FileManager(
+            vault_path, get_header_bytes(), get_content_cache_bytes(), get_ignore_patterns()
+        )
+        self.cache_dir = prepare_cache_dir(get_cache_dir(vault_path))
+        self.git_manager = GitManager(vault_path, get_git_backend(), str(self.cache_dir / HISTORY_FILENAME))
+        self.commit_queue = CommitQueue(self.git_manager, get_commit_window(), get_commit_batch_size())
+        self.note_index = NoteIndex(self.file_manager)
+        self.catalog = NoteCatalog(self.file_manager, str(self.cache_dir / CATALOG_FILENAME))
+        
+        vectors = None
+        if get_vector_index_enabled() and vectors_available():
+            vectors = VectorIndex(self.note_index, str(self.cache_dir), get_vector_dim())
+        
+        self.search_engine = SearchEngine(
+            self.file_manager,
+            self.note_index,
+            TrigramIndex() if get_trigram_index_enabled() else None,
+            FuzzyIndex(self.note_index) if get_fuzzy_index_enabled() else None,
+            vectors
+        )
+        # Requests sync the index themselves (see _sync_vault)
+        self.search_engine.auto_refresh = False
+        self.section_reader = SectionReader(self.file_manager)
+        self.result_cache = ResultCache(get_result_cache_entries(), get_result_cache_bytes())
+        
+        self.git_catch_up = get_git_catch_up_enabled()
+        # Set when startup left the search index to be built by the first search
+        self._index_deferred = False
+        self.max_workers = get_max_workers()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mcp-notes")
+        self.index_lock = threading.RLock()
+        # Notes reported by the watcher and not yet reindexed (None: rescan all)
+        self._pending_changes: Optional[Set[str]] = set()
+        self._pending_lock = threading.Lock()
+        
+        self.watcher = None
+        backend = get_watcher_backend()
+        if backend != "off":
+            self.watcher = VaultWatcher(
+                self.file_manager,
+                self._queue_vault_changes,
+                backend,
+                debounce=get_watch_debounce(),
+                poll_interval=get_watch_poll_interval()
+            )
+        
         self.server = Server("mcp-notes")
         self._register_tools()
     
@@ -72,7 +158,8 @@ class MCPNotesServer:
                             },
                             "conversation_id": {"type": "string", "description": "ID of related conversation"},
                             "ai_client": {"type": "string", "description": "AI client that created the note"},
-                            "date_for": {"type": "string", "description": "Natural language date for the note (e.g., '2 days ago', 'last friday', 'yesterday')"}
+                            "date_for": {"type": "string", "description": "Natural language date for the note (e.g., '2 days ago', 'last friday', 'yesterday')"},
+                            "wait_for_commit": {"type": "boolean", "description": "Wait for the git commit before returning (default: commit in the background)"}
                         },
                         "required": ["title", "content"]
                     }
@@ -89,7 +176,12 @@ class MCPNotesServer:
                                 "type": "array",
                                 "items": {"type": "string"},
                                 "description": "Filter by tags"
-                            }
+                            },
+                            "tag_mode": {"type": "string", "description": "Tag filter mode (any/all/none)", "default": "any"},
+                            "ranking": {"type": "string", "description": "Ranking mode (bm25f/classic)", "default": "bm25f"},
+                            "mode": {"type": "string", "description": "Match mode (terms/fuzzy/substring/semantic)", "default": "terms"},
+                            "snippet_count": {"type": "integer", "description": "Match snippets per result (0 to disable)", "default": 3},
+                            "snippet_length": {"type": "integer", "description": "Approximate snippet length in bytes", "default": 160}
                         },
                         "required": ["query"]
                     }
@@ -102,11 +194,13 @@ class MCPNotesServer:
                         "properties": {
                             "limit": {"type": "integer", "description": "Maximum results", "default": 20},
                             "offset": {"type": "integer", "description": "Results offset", "default": 0},
+                            "cursor": {"type": "string", "description": "Cursor from a previous page's next_cursor (overrides offset)"},
                             "tags": {
                                 "type": "array",
                                 "items": {"type": "string"},
                                 "description": "Filter by tags"
                             },
+                            "tag_mode": {"type": "string", "description": "Tag filter mode (any/all/none)", "default": "any"},
                             "sort_by": {"type": "string", "description": "Sort field", "default": "created"},
                             "sort_order": {"type": "string", "description": "Sort order (asc/desc)", "default": "desc"}
                         }
@@ -114,14 +208,53 @@ class MCPNotesServer:
                 ),
                 Tool(
                     name="get_note",
-                    description="Retrieve complete note content by filename",
+                    description="Retrieve note content by filename, optionally just a section, line range or byte range",
                     inputSchema={
                         "type": "object", 
                         "properties": {
-                            "filename": {"type": "string", "description": "Note filename"}
+                            "filename": {"type": "string", "description": "Note filename"},
+                            "section": {"type": "string", "description": "Return only the section under this heading"},
+                            "start_line": {"type": "integer", "description": "First line to return (1-based)"},
+                            "end_line": {"type": "integer", "description": "Last line to return (inclusive)"},
+                            "start_byte": {"type": "integer", "description": "Byte offset to start at"},
+                            "end_byte": {"type": "integer", "description": "Byte offset to stop before"},
+                            "max_chars": {"type": "integer", "description": "Maximum number of characters to return"}
                         },
                         "required": ["filename"]
                     }
+                ),
+                Tool(
+                    name="get_commit_status",
+                    description="Check whether created notes have been committed to git",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "filenames": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Notes to check (default: notes still waiting to be committed)"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="get_note_history",
+                    description="List the git commits that changed a note, newest first",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "filename": {"type": "string", "description": "Note filename (default: the whole vault)"},
+                            "limit": {"type": "integer", "description": "Maximum number of commits", "default": 10}
+                        }
+                    }
+                ),
+                Tool(
+                    name="get_server_stats",
+                    description="Report cache hit/miss counters and index statistics",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {}
+                    }
                 )
             ]
         
@@ -135,69 +268,26 @@ class MCPNotesServer:
                 return await self._list_notes(arguments)
             elif name == "get_note":
                 return await self._get_note(arguments)
+            elif name == "get_commit_status":
+                return await self._get_commit_status(arguments)
+            elif name == "get_note_history":
+                return await self._get_note_history(arguments)
+            elif name == "get_server_stats":
+                return await self._get_server_stats(arguments)
             else:
                 raise ValueError(f"Unknown tool: {name}")
     
+    async def _run_blocking(self, func: Callable[..., T], *args: Any) -> T:
+        """Run blocking work on the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+    
     async def _create_note(self, args: Dict[str, Any]) -> List[TextContent]:
         """Create a new note."""
         try:
             params = CreateNoteParams(**args)
-            
-            # Determine the date to use for the note
-            from datetime import datetime
-            
-            if params.date_for:
-                # Parse natural language date
-                target_date = parse_natural_date(params.date_for)
-                if target_date is None:
-                    return [TextContent(
-                        type="text",
-                        text=f"Error: Could not parse date '{params.date_for}'. Please use formats like '2 days ago', 'last friday', 'yesterday', etc."
-                    )]
-            else:
-                # Use current date
-                target_date = datetime.now()
-            
-            # Generate filename with target date
-            filename_date = format_date_for_filename(target_date)
-            filename = generate_filename(params.title, filename_date)
-            
-            # Check if note already exists
-            if self.file_manager.note_exists(filename):
-                return [TextContent(
-                    type="text",
-                    text=f"Error: Note with filename '{filename}' already exists"
-                )]
-            
-            # Create frontmatter
-            frontmatter = create_default_frontmatter(
-                params.title,
-                params.summary,
-                params.tags,
-                params.conversation_id,
-                params.ai_client
-            )
-            
-            # Add date backlink to content
-            backlink_date = format_date_for_backlink(target_date)
-            content_with_date = f"{params.content}\n\nCreated: [[{backlink_date}]]"
-            
-            # Format complete markdown
-            full_content = format_markdown(frontmatter, content_with_date)
-            
-            # Write note
-            self.file_manager.write_note(filename, full_content)
-            
-            # Commit to git
-            commit_msg = f"Add note: {params.title}"
-            success = self.git_manager.commit_note(filename, commit_msg)
-            
-            git_status = "committed to git" if success else "saved but git commit failed"
-            
-            return [TextContent(
-                type="text",
-                text=f"Note created successfully: {filename} ({git_status})"
-            )]
+            result_text = await self._run_blocking(self._create_note_blocking, params)
+            return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
             return [TextContent(
@@ -205,32 +295,111 @@ class MCPNotesServer:
                 text=f"Error creating note: {str(e)}"
             )]
     
+    def _create_note_blocking(self, params: CreateNoteParams) -> str:
+        """Write, index and commit a new note."""
+        # Determine the date to use for the note
+        from datetime import datetime
+        
+        if params.date_for:
+            # Parse natural language date
+            target_date = parse_natural_date(params.date_for)
+            if target_date is None:
+                return f"Error: Could not parse date '{params.date_for}'. Please use formats like '2 days ago', 'last friday', 'yesterday', etc."
+        else:
+            # Use current date
+            target_date = datetime.now()
+        
+        # Generate filename with target date
+        filename_date = format_date_for_filename(target_date)
+        filename = generate_filename(params.title, filename_date)
+        
+        # Create frontmatter
+        frontmatter = create_default_frontmatter(
+            params.title,
+            params.summary,
+            params.tags,
+            params.conversation_id,
+            params.ai_client
+        )
+        
+        # Add date backlink to content
+        backlink_date = format_date_for_backlink(target_date)
+        content_with_date = f"{params.content}\n\nCreated: [[{backlink_date}]]"
+        
+        # Format complete markdown
+        full_content = format_markdown(frontmatter, content_with_date)
+        
+        with self.index_lock:
+            # Check if note already exists
+            if self.file_manager.note_exists(filename):
+                return f"Error: Note with filename '{filename}' already exists"
+            
+            # Write note
+            self.file_manager.write_note(filename, full_content)
+            self.note_index.update_note(filename, full_content)
+            self.catalog.update_note(filename, full_content)
+        
+        # Commit to git, batched with other notes created around the same time
+        commit_msg = f"Add note: {params.title}"
+        ticket = self.commit_queue.submit(filename, commit_msg, wait=bool(params.wait_for_commit))
+        
+        if ticket.status == "pending":
+            git_status = "queued for git commit"
+        elif ticket.status == "committed":
+            git_status = "committed to git"
+        else:
+            git_status = "saved but git commit failed"
+        return f"Note created successfully: {filename} ({git_status})"
+    
+    @property
+    def watching(self) -> bool:
+        """Whether the vault watcher is keeping the indexes up to date."""
+        return self.watcher is not None and self.watcher.running
+    
+    def _flush_watcher(self) -> None:
+        """Queue changes the watcher knows about. Runs on the event loop."""
+        if self.watching:
+            self.watcher.flush()
+    
+    def _sync_vault(self) -> None:
+        """Bring the note index up to date before serving a request.
+        
+        With a watcher running only its queued changes are applied;
+        otherwise the vault is rescanned by stat.
+        """
+        if self._index_deferred:
+            self._index_deferred = False
+            self.note_index.refresh()
+        if self.watching:
+            self._apply_vault_changes()
+        else:
+            self.note_index.refresh()
+    
+    def _queue_vault_changes(self, filenames: Optional[Set[str]]) -> None:
+        """Queue a batch of changed notes reported by the watcher (None means all)."""
+        with self._pending_lock:
+            if filenames is None or self._pending_changes is None:
+                self._pending_changes = None
+            else:
+                self._pending_changes |= filenames
+        # Reindex in the background, so the next request rarely waits for it
+        self.executor.submit(self._apply_vault_changes)
+    
+    def _apply_vault_changes(self) -> None:
+        """Apply queued watcher changes to the index and catalog."""
+        with self.index_lock:
+            with self._pending_lock:
+                changes, self._pending_changes = self._pending_changes, set()
+            if changes is None or changes:
+                self.note_index.refresh(changes)
+                self.catalog.refresh(changes)
+    
     async def _search_notes(self, args: Dict[str, Any]) -> List[TextContent]:
         """Search notes with relevance scoring."""
         try:
             params = SearchNotesParams(**args)
-            results = self.search_engine.search_notes(
-                params.query,
-                params.limit or 10,
-                params.tags or []
-            )
-            
-            if not results:
-                return [TextContent(
-                    type="text",
-                    text="No notes found matching your search."
-                )]
-            
-            # Format results
-            result_text = f"Found {len(results)} note(s):\n\n"
-            for result in results:
-                result_text += f"**{result.title}** (score: {result.relevance_score:.2f})\n"
-                result_text += f"File: {result.filename}\n"
-                result_text += f"Summary: {result.summary}\n"
-                if result.tags:
-                    result_text += f"Tags: {', '.join(result.tags)}\n"
-                result_text += f"Created: {result.created}\n\n"
-            
+            self._flush_watcher()
+            result_text = await self._run_blocking(self._search_notes_blocking, params)
             return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
@@ -239,103 +408,310 @@ class MCPNotesServer:
                 text=f"Error searching notes: {str(e)}"
             )]
     
+    def _search_notes_blocking(self, params: SearchNotesParams) -> str:
+        """Run a search, or serve it from the result cache."""
+        with self.index_lock:
+            self._sync_vault()
+            generation = self.file_manager.generation
+            cache_key = make_cache_key("search_notes", params.model_dump())
+            cached = self.result_cache.get(cache_key, generation)
+            if cached is not None:
+                return cached
+            
+            response = self.search_engine.search(
+                params.query,
+                params.limit or 10,
+                params.tags or [],
+                params.ranking or "bm25f",
+                params.mode or "terms",
+                3 if params.snippet_count is None else params.snippet_count,
+                params.snippet_length or 160,
+                params.tag_mode or "any"
+            )
+            
+            if not response.results:
+                result_text = "No notes found matching your search."
+            else:
+                # Format results
+                result_text = f"Found {response.total} note(s), showing {len(response.results)}:\n\n"
+                for result in response.results:
+                    result_text += f"**{result.title}** (score: {result.relevance_score:.2f})\n"
+                    result_text += f"File: {result.filename}\n"
+                    result_text += f"Summary: {result.summary}\n"
+                    if result.tags:
+                        result_text += f"Tags: {', '.join(result.tags)}\n"
+                    result_text += f"Created: {result.created}\n"
+                    for snippet in result.snippets:
+                        result_text += f"Match (byte {snippet.offset}): {self._highlight_snippet(snippet)}\n"
+                    result_text += "\n"
+            
+            self.result_cache.put(cache_key, generation, result_text)
+            return result_text
+    
+    def _highlight_snippet(self, snippet: SearchSnippet) -> str:
+        """Render a snippet with its matches in bold."""
+        text = snippet.text
+        for start, end in reversed(snippet.highlights):
+            text = f"{text[:start]}**{text[start:end]}**{text[end:]}"
+        return f"...{text}..."
+    
     async def _list_notes(self, args: Dict[str, Any]) -> List[TextContent]:
         """List notes with filtering and sorting."""
         try:
             params = ListNotesParams(**args)
-            notes = self.file_manager.list_notes()
-            
-            # Filter and collect note metadata
-            note_data = []
-            for filename in notes:
-                try:
-                    content = self.file_manager.read_note(filename)
-                    parsed = parse_markdown(content)
-                    
-                    # Filter by tags if specified
-                    if params.tags:
-                        if not any(tag in parsed.frontmatter.tags for tag in params.tags):
-                            continue
-                    
-                    title = extract_title_from_content(content) or filename.replace('.md', '')
-                    
-                    note_data.append({
-                        'filename': filename,
-                        'title': title,
-                        'summary': parsed.frontmatter.summary,
-                        'tags': parsed.frontmatter.tags,
-                        'created': parsed.frontmatter.created,
-                        'updated': parsed.frontmatter.updated
-                    })
-                except Exception:
-                    continue
+            self._flush_watcher()
+            result_text = await self._run_blocking(self._list_notes_blocking, params)
+            return [TextContent(type="text", text=result_text)]
             
-            # Sort notes
-            reverse = params.sort_order == "desc"
-            if params.sort_by == "title":
-                note_data.sort(key=lambda x: x['title'], reverse=reverse)
-            elif params.sort_by == "updated":
-                note_data.sort(key=lambda x: x['updated'], reverse=reverse)
-            else:  # created (default)
-                note_data.sort(key=lambda x: x['created'], reverse=reverse)
+        except Exception as e:
+            return [TextContent(
+                type="text",
+                text=f"Error listing notes: {str(e)}"
+            )]
+    
+    def _list_notes_blocking(self, params: ListNotesParams) -> str:
+        """Query the catalog for a page of notes, or serve it from the result cache.
+        
+        Only the catalog is brought up to date, so changed notes are read
+        up to their headers and not tokenised into the search index.
+        """
+        with self.index_lock:
+            if self.watching:
+                self._apply_vault_changes()
+            else:
+                self.catalog.refresh()
+            generation = self.file_manager.generation
+            cache_key = make_cache_key("list_notes", params.model_dump())
+            cached = self.result_cache.get(cache_key, generation)
+            if cached is not None:
+                return cached
             
-            # Apply pagination
-            start = params.offset or 0
-            end = start + (params.limit or 20)
-            page_notes = note_data[start:end]
+            # Sorting, tag filtering and pagination run as one catalog query
+            page_notes, total, next_cursor = self.catalog.list_notes(
+                params.tags,
+                params.tag_mode or "any",
+                params.sort_by or "created",
+                params.sort_order or "desc",
+                params.limit or 20,
+                params.offset or 0,
+                params.cursor
+            )
             
             if not page_notes:
-                return [TextContent(
-                    type="text",
-                    text="No notes found."
-                )]
-            
-            # Format results
-            result_text = f"Found {len(note_data)} total note(s), showing {len(page_notes)}:\n\n"
-            for note in page_notes:
-                result_text += f"**{note['title']}**\n"
-                result_text += f"File: {note['filename']}\n"
-                result_text += f"Summary: {note['summary']}\n"
-                if note['tags']:
-                    result_text += f"Tags: {', '.join(note['tags'])}\n"
-                result_text += f"Created: {note['created']}\n\n"
+                result_text = "No notes found."
+            else:
+                # Format results
+                result_text = f"Found {total} total note(s), showing {len(page_notes)}:\n\n"
+                for note in page_notes:
+                    result_text += f"**{note.title}**\n"
+                    result_text += f"File: {note.filename}\n"
+                    result_text += f"Summary: {note.summary}\n"
+                    if note.tags:
+                        result_text += f"Tags: {', '.join(note.tags)}\n"
+                    result_text += f"Created: {note.created}\n\n"
+                if next_cursor:
+                    result_text += f"Next cursor: {next_cursor}\n"
             
+            self.result_cache.put(cache_key, generation, result_text)
+            return result_text
+    
+    async def _get_note(self, args: Dict[str, Any]) -> List[TextContent]:
+        """Get complete note content."""
+        try:
+            params = GetNoteParams(**args)
+            result_text = await self._run_blocking(self._get_note_blocking, params)
             return [TextContent(type="text", text=result_text)]
             
         except Exception as e:
             return [TextContent(
                 type="text",
-                text=f"Error listing notes: {str(e)}"
+                text=f"Error retrieving note: {str(e)}"
             )]
     
-    async def _get_note(self, args: Dict[str, Any]) -> List[TextContent]:
-        """Get complete note content."""
+    def _get_note_blocking(self, params: GetNoteParams) -> str:
+        """Read a note, or the requested part of it. Needs no index lock."""
+        if not self.file_manager.note_exists(params.filename):
+            return f"Note not found: {params.filename}"
+        
+        ranged = params.model_dump(exclude={'filename'}, exclude_none=True)
+        if not ranged:
+            content = self.file_manager.read_note(params.filename)
+            return f"Content of {params.filename}:\n\n{content}"
+        
+        # Only the requested part of the note is read and decoded
+        excerpt = self.section_reader.read(params.filename, **ranged)
+        description = f"bytes {excerpt.start}-{excerpt.end} of {excerpt.size}"
+        if params.section:
+            description = f"section '{params.section}', {description}"
+        result_text = f"Content of {params.filename} ({description}):\n\n{excerpt.text}"
+        if excerpt.truncated:
+            result_text += (
+                f"\n\n[Truncated; continue with start_byte={excerpt.end}, end_byte={excerpt.requested_end}]"
+            )
+        return result_text
+    
+    async def _get_commit_status(self, args: Dict[str, Any]) -> List[TextContent]:
+        """Report the git commit status of notes."""
         try:
-            params = GetNoteParams(**args)
+            params = CommitStatusParams(**args)
             
-            if not self.file_manager.note_exists(params.filename):
-                return [TextContent(
-                    type="text",
-                    text=f"Note not found: {params.filename}"
-                )]
+            if params.filenames is None:
+                tickets = {ticket.filename: ticket for ticket in self.commit_queue.pending()}
+                if not tickets:
+                    return [TextContent(type="text", text="No notes are waiting to be committed.")]
+            else:
+                tickets = {filename: self.commit_queue.status(filename) for filename in params.filenames}
             
-            content = self.file_manager.read_note(params.filename)
+            lines = []
+            for filename, ticket in tickets.items():
+                if ticket is None:
+                    lines.append(f"{filename}: unknown (not created recently by this server)")
+                elif ticket.status == "committed":
+                    lines.append(f"{filename}: committed ({ticket.sha[:8]})")
+                elif ticket.status == "failed":
+                    lines.append(f"{filename}: failed ({ticket.error})")
+                else:
+                    lines.append(f"{filename}: pending")
+            
+            return [TextContent(type="text", text="Commit status:\n\n" + "\n".join(lines))]
             
+        except Exception as e:
             return [TextContent(
                 type="text",
-                text=f"Content of {params.filename}:\n\n{content}"
+                text=f"Error checking commit status: {str(e)}"
+            )]
+    
+    async def _get_note_history(self, args: Dict[str, Any]) -> List[TextContent]:
+        """List the commits that changed a note."""
+        try:
+            params = NoteHistoryParams(**args)
+            commits = await self._run_blocking(
+                self.git_manager.get_commit_history, params.filename, params.limit or 10
+            )
+            
+            subject = params.filename or "the vault"
+            if not commits:
+                return [TextContent(type="text", text=f"No commits found for {subject}.")]
+            
+            lines = []
+            for commit in commits:
+                first_line = commit['message'].split('\n', 1)[0]
+                lines.append(f"- {commit['sha']} {commit['date']} {commit['author']}: {first_line}")
+            return [TextContent(
+                type="text",
+                text=f"History of {subject} ({len(commits)} commit(s)):\n\n" + "\n".join(lines)
             )]
             
         except Exception as e:
             return [TextContent(
                 type="text",
-                text=f"Error retrieving note: {str(e)}"
+                text=f"Error retrieving history: {str(e)}"
             )]
     
+    async def _get_server_stats(self, args: Dict[str, Any]) -> List[TextContent]:
+        """Report cache and index statistics."""
+        stats = await self._run_blocking(self._collect_stats)
+        return [TextContent(
+            type="text",
+            text=f"Server statistics:\n\n{json.dumps(stats, indent=2)}"
+        )]
+    
+    def _collect_stats(self) -> Dict[str, Any]:
+        """Gather statistics while no request is changing them."""
+        with self.index_lock:
+            return {
+                'vault_generation': self.file_manager.generation,
+                'indexed_notes': len(self.note_index),
+                'cataloged_notes': len(self.catalog),
+                'result_cache': self.result_cache.stats(),
+                'content_cache': (
+                    self.file_manager.content_cache.stats() if self.file_manager.content_cache is not None else None
+                ),
+                'walker': self.file_manager.walker.stats(),
+                'watcher': self.watcher.stats() if self.watcher is not None else None,
+                'workers': self.max_workers,
+                'commit_queue': self.commit_queue.stats(),
+                'history': self.git_manager.history.stats(),
+            }
+    
+    async def start_watcher(self) -> None:
+        """Index the vault, then keep it indexed from file change events."""
+        if self.watcher is None:
+            return
+        await self._run_blocking(self._refresh_all)
+        await self.watcher.start()
+    
+    def _refresh_all(self) -> None:
+        """Catch the catalog up, and index the vault for search.
+        
+        With git catch-up the search index, which is held in memory and
+        has to read every note, is built by the first search instead, so
+        startup costs only the notes git reports as changed. Embeddings
+        saved by the last run are reused for notes unchanged since.
+        """
+        with self.index_lock:
+            if self.git_catch_up:
+                self._catch_up_catalog()
+                self._index_deferred = True
+            else:
+                self.note_index.refresh()
+                self.catalog.refresh()
+    
+    def _catch_up_catalog(self) -> None:
+        """Bring the catalog up to date using git instead of rescanning the vault.
+        
+        Notes can only differ from the catalog if they changed in git since
+        its checkpoint, are dirty now, or were unsynced at the checkpoint;
+        just those are checked. Without a usable checkpoint the vault is
+        rescanned. A new checkpoint is recorded afterwards.
+        """
+        head = self.git_manager.head_commit()
+        if head is None:
+            self.catalog.refresh()
+            return
+        
+        ignore = self.file_manager.walker.ignore
+        dirty = self._notes_in(self.git_manager.dirty_paths())
+        changes = None
+        checkpoint = self.catalog.checkpoint(ignore)
+        if checkpoint is not None:
+            commit, unsynced = checkpoint
+            changed = self.git_manager.changed_paths(commit)
+            if changed is not None:
+                changes = self._notes_in(changed) | dirty | set(unsynced)
+        
+        self.catalog.refresh(changes)
+        self.catalog.set_checkpoint(head, dirty, ignore)
+    
+    def _notes_in(self, paths: Set[str]) -> Set[str]:
+        """The paths that are notes the walker would list."""
+        return {
+            path for path in paths
+            if path.endswith('.md') and not self.file_manager.walker.is_ignored(path)
+        }
+    
+    async def stop_watcher(self) -> None:
+        """Stop watching and go back to rescanning per request."""
+        if self.watcher is None:
+            return
+        await self.watcher.stop()
+    
     async def run(self) -> None:
         """Run the MCP server."""
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(read_stream, write_stream, self.server.create_initialization_options())
+        try:
+            await self.start_watcher()
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(read_stream, write_stream, self.server.create_initialization_options())
+        finally:
+            await self.stop_watcher()
+            # Let running tool calls and background reindexing finish,
+            # then commit any notes still queued
+            self.executor.shutdown(wait=True)
+            self.commit_queue.close()
+            if self.search_engine.vectors is not None:
+                self.search_engine.vectors.save()
+            self.catalog.close()
+            self.git_manager.history.close()
 
 
 async def main():
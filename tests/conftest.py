@@ -12,9 +12,30 @@ import sys
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
+from mcp_notes.lib.file_manager import FileManager
 from mcp_notes.main import MCPNotesServer
 
 
+def make_note(
+    title: str,
+    body: str = "",
+    tags=None,
+    summary: str = "A note",
+    created: str = "2025-06-14T10:30:00"
+) -> str:
+    """Build note content with frontmatter."""
+    return f"""---
+created: '{created}'
+updated: '{created}'
+tags: [{', '.join(tags or [])}]
+summary: {summary}
+---
+
+# {title}
+
+{body}"""
+
+
 @pytest.fixture
 def temp_vault():
     """Create a temporary vault directory for testing."""
@@ -42,10 +63,27 @@ def temp_vault():
     shutil.rmtree(temp_dir)
 
 
+@pytest.fixture
+def seed_notes():
+    """Notes written to the vault by file_manager, by filename. Override to seed it."""
+    return {}
+
+
+@pytest.fixture
+def file_manager(temp_vault, seed_notes):
+    """File manager over the temporary vault, holding seed_notes."""
+    manager = FileManager(temp_vault)
+    for filename, content in seed_notes.items():
+        manager.write_note(filename, content)
+    return manager
+
+
 @pytest.fixture
 def mcp_server(temp_vault):
     """Create an MCP server instance for testing."""
-    return MCPNotesServer(temp_vault)
+    server = MCPNotesServer(temp_vault)
+    yield server
+    server.commit_queue.close()
 
 
 @pytest.fixture
@@ -0,0 +1,89 @@
+"""Tests for tool result caching."""
+
+from mcp_notes.lib.cache import ContentCache, ResultCache, make_cache_key
+
+
+class TestResultCache:
+    """Test the generation-tagged LRU result cache."""
+
+    def test_make_cache_key_normalises_tags(self):
+        """Test that tag order does not change the key."""
+        first = make_cache_key("search_notes", {"query": "x", "tags": ["b", "a"], "limit": 10})
+        second = make_cache_key("search_notes", {"limit": 10, "tags": ["a", "b"], "query": "x"})
+
+        assert first == second
+        assert first != make_cache_key("list_notes", {"query": "x", "tags": ["a", "b"], "limit": 10})
+
+    def test_hit_and_miss(self):
+        """Test serving results at the same generation."""
+        cache = ResultCache()
+
+        assert cache.get("k", 0) is None
+        cache.put("k", 0, "value")
+        assert cache.get("k", 0) == "value"
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_stale_generation_is_never_served(self):
+        """Test that results from older generations are dropped."""
+        cache = ResultCache()
+        cache.put("k", 1, "old")
+
+        assert cache.get("k", 2) is None
+        assert len(cache) == 0
+        assert cache.bytes == 0
+
+    def test_evicts_least_recently_used_by_count(self):
+        """Test the entry-count bound."""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", 0, "1")
+        cache.put("b", 0, "2")
+        cache.get("a", 0)
+        cache.put("c", 0, "3")
+
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) == "1"
+        assert cache.stats()['evictions'] == 1
+
+    def test_evicts_by_bytes(self):
+        """Test the byte bound."""
+        cache = ResultCache(max_bytes=10)
+        cache.put("a", 0, "x" * 6)
+        cache.put("b", 0, "y" * 6)
+
+        assert cache.get("a", 0) is None
+        assert cache.get("b", 0) == "y" * 6
+        assert cache.bytes == 6
+
+        cache.put("huge", 0, "z" * 11)
+        assert cache.get("huge", 0) is None
+
+
+class TestContentCache:
+    """Test the stat-validated note content cache."""
+
+    def test_hit_requires_matching_stat(self):
+        """Test that content is only served for an unchanged stat key."""
+        cache = ContentCache(1024)
+        cache.put("a.md", (1, 5, 7), "hello")
+
+        assert cache.get("a.md", (1, 5, 7)) == "hello"
+        assert cache.get("a.md", (2, 5, 7)) is None
+        assert len(cache) == 0
+        assert cache.stats()['hit_ratio'] == 0.5
+
+    def test_byte_budget(self):
+        """Test that the least recently used notes are evicted to fit the budget."""
+        cache = ContentCache(10)
+        cache.put("a.md", (1, 4, 1), "aaaa")
+        cache.put("b.md", (1, 4, 2), "bbbb")
+        cache.get("a.md", (1, 4, 1))
+        cache.put("c.md", (1, 4, 3), "cccc")
+
+        assert cache.get("b.md", (1, 4, 2)) is None
+        assert cache.get("a.md", (1, 4, 1)) == "aaaa"
+        assert cache.bytes == 8
+        assert cache.evictions == 1
+
+        cache.put("big.md", (1, 11, 4), "x" * 11)
+        assert "big.md" not in cache._entries
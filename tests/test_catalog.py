@@ -0,0 +1,169 @@
+"""Tests for the note metadata catalog."""
+
+import os
+import pytest
+from mcp_notes.lib.catalog import NoteCatalog
+from tests.conftest import make_note
+
+
+@pytest.fixture
+def seed_notes():
+    """A few notes with distinct creation dates."""
+    return {
+        "a.md": make_note("Alpha", tags=["python", "async"], created="2025-01-01T00:00:00"),
+        "b.md": make_note("Bravo", tags=["python"], created="2025-03-01T00:00:00"),
+        "c.md": make_note("Charlie", tags=["rust"], created="2025-02-01T00:00:00"),
+    }
+
+
+class TestNoteCatalog:
+    """Test catalog queries and reconciliation."""
+
+    def test_list_sorted_and_paginated(self, file_manager):
+        """Test sorting and offset/limit pagination."""
+        catalog = NoteCatalog(file_manager)
+        assert catalog.refresh()
+
+        notes, total, _ = catalog.list_notes()
+        assert total == 3
+        assert [note.filename for note in notes] == ["b.md", "c.md", "a.md"]
+        assert notes[0].title == "Bravo"
+        assert notes[0].tags == ("python",)
+
+        notes, total, _ = catalog.list_notes(sort_by="title", sort_order="asc", limit=1, offset=1)
+        assert total == 3
+        assert [note.filename for note in notes] == ["b.md"]
+
+    def test_cursor_pagination(self, file_manager):
+        """Test paging with cursors, stable across notes created between pages."""
+        catalog = NoteCatalog(file_manager)
+        catalog.refresh()
+
+        notes, total, cursor = catalog.list_notes(limit=2)
+        assert [note.filename for note in notes] == ["b.md", "c.md"]
+        assert cursor
+
+        # A newer note lands before the cursor and doesn't shift the next page
+        file_manager.write_note("d.md", make_note("Delta", created="2025-04-01T00:00:00"))
+        catalog.refresh()
+
+        notes, total, cursor = catalog.list_notes(limit=2, cursor=cursor)
+        assert [note.filename for note in notes] == ["a.md"]
+        assert total == 4
+        assert cursor is None
+
+    def test_cursor_breaks_ties_by_filename(self, file_manager):
+        """Test that notes with equal sort keys are neither skipped nor repeated."""
+        for name in ("e.md", "f.md", "g.md"):
+            file_manager.write_note(name, make_note("Same", created="2025-05-01T00:00:00"))
+        catalog = NoteCatalog(file_manager)
+        catalog.refresh()
+
+        seen = []
+        cursor = None
+        while True:
+            notes, _, cursor = catalog.list_notes(sort_by="title", sort_order="asc", limit=2, cursor=cursor)
+            seen.extend(note.filename for note in notes)
+            if cursor is None:
+                break
+
+        assert seen == ["a.md", "b.md", "c.md", "e.md", "f.md", "g.md"]
+
+    def test_invalid_cursor(self, file_manager):
+        """Test rejecting malformed cursors and cursors for another sort order."""
+        catalog = NoteCatalog(file_manager)
+        catalog.refresh()
+        _, _, cursor = catalog.list_notes(limit=1)
+
+        with pytest.raises(ValueError):
+            catalog.list_notes(cursor="not a cursor!")
+        with pytest.raises(ValueError):
+            catalog.list_notes(sort_by="title", cursor=cursor)
+
+    def test_tag_filters(self, file_manager):
+        """Test any/all/none tag filters."""
+        catalog = NoteCatalog(file_manager)
+        catalog.refresh()
+
+        def filenames(tags, tag_mode):
+            notes, _, _ = catalog.list_notes(tags, tag_mode, sort_order="asc")
+            return [note.filename for note in notes]
+
+        assert filenames(["async", "rust"], "any") == ["a.md", "c.md"]
+        assert filenames(["python", "async"], "all") == ["a.md"]
+        assert filenames(["python"], "none") == ["c.md"]
+
+    def test_refresh_reparses_only_changed_notes(self, file_manager, monkeypatch):
+        """Test reconciling by stat: new, modified and deleted notes."""
+        catalog = NoteCatalog(file_manager)
+        catalog.refresh()
+        assert not catalog.refresh()
+
+        file_manager.write_note("a.md", make_note("Alpha Two", created="2025-01-01T00:00:00"))
+        file_manager.write_note("d.md", make_note("Delta", created="2025-04-01T00:00:00"))
+        file_manager.delete_note("c.md")
+
+        reads = []
+        original_read = file_manager.read_header
+        monkeypatch.setattr(file_manager, "read_header", lambda name: reads.append(name) or original_read(name))
+        assert catalog.refresh()
+
+        assert sorted(reads) == ["a.md", "d.md"]
+        notes, total, _ = catalog.list_notes(sort_order="asc")
+        assert total == 3
+        assert [note.title for note in notes] == ["Alpha Two", "Bravo", "Delta"]
+
+    def test_invalid_notes_are_skipped(self, file_manager):
+        """Test that unreadable notes are not listed or reparsed."""
+        path = file_manager.get_note_path("broken.md")
+        path.write_bytes(b"---\n\xff\xfe not utf-8\n")
+
+        catalog = NoteCatalog(file_manager)
+        catalog.refresh()
+
+        assert len(catalog) == 3
+        assert not catalog.refresh()
+
+    def test_persists_across_instances(self, file_manager, temp_vault):
+        """Test reopening a catalog stored on disk."""
+        path = os.path.join(temp_vault, "catalog.sqlite3")
+        catalog = NoteCatalog(file_manager, path)
+        catalog.refresh()
+        catalog.close()
+
+        catalog = NoteCatalog(file_manager, path)
+        assert len(catalog) == 3
+        assert not catalog.refresh()
+        catalog.close()
+
+    def test_corrupt_database_is_rebuilt(self, file_manager, temp_vault):
+        """Test that an unreadable catalog file is recreated."""
+        path = os.path.join(temp_vault, "catalog.sqlite3")
+        with open(path, 'wb') as f:
+            f.write(b"not a database" * 100)
+
+        catalog = NoteCatalog(file_manager, path)
+        assert catalog.refresh()
+        assert len(catalog) == 3
+        catalog.close()
+
+    def test_checkpoint_tracks_unsynced_notes(self, file_manager, temp_vault):
+        """Test that notes stored after a checkpoint are recorded as unsynced."""
+        path = os.path.join(temp_vault, "catalog.sqlite3")
+        catalog = NoteCatalog(file_manager, path)
+        catalog.refresh()
+        assert catalog.checkpoint() is None
+
+        catalog.set_checkpoint("abc123", ["b.md"])
+        assert catalog.checkpoint() == ("abc123", ["b.md"])
+
+        file_manager.write_note("d.md", make_note("Delta", created="2025-04-01T00:00:00"))
+        catalog.refresh(["d.md"])
+        catalog.remove_note("c.md")
+        catalog.close()
+
+        catalog = NoteCatalog(file_manager, path)
+        commit, unsynced = catalog.checkpoint()
+        assert (commit, sorted(unsynced)) == ("abc123", ["b.md", "c.md", "d.md"])
+        assert catalog.checkpoint(["drafts"]) is None
+        catalog.close()
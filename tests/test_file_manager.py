@@ -3,6 +3,7 @@
 import pytest
 from pathlib import Path
 from mcp_notes.lib.file_manager import FileManager
+from mcp_notes.lib.markdown import parse_markdown
 
 
 class TestFileManager:
@@ -132,4 +133,49 @@ class TestFileManager:
         file_manager = FileManager(temp_vault)
         
         with pytest.raises(FileNotFoundError):
-            file_manager.get_note_stats("nonexistent.md")
\ No newline at end of file
+            file_manager.get_note_stats("nonexistent.md")
+    
+    def test_read_header_stops_after_first_heading(self, temp_vault):
+        """Test reading only the frontmatter and first heading."""
+        file_manager = FileManager(temp_vault)
+        content = "---\ncreated: '2025-06-14'\nupdated: '2025-06-14'\nsummary: s\n---\n\n# Title\n\n" + "body\n" * 10000
+        file_manager.write_note("big.md", content)
+        
+        header = file_manager.read_header("big.md")
+        
+        assert header == content[:content.index("# Title\n") + len("# Title\n")]
+        assert parse_markdown(header).frontmatter == parse_markdown(content).frontmatter
+    
+    def test_read_header_falls_back_to_whole_note(self, temp_vault):
+        """Test reading the whole note when the header exceeds the cap."""
+        file_manager = FileManager(temp_vault, header_bytes=1024)
+        content = "---\nsummary: s\n---\n\n" + "no heading\n" * 500
+        file_manager.write_note("plain.md", content)
+        
+        assert file_manager.read_header("plain.md") == content
+    
+    def test_read_header_translates_newlines(self, temp_vault):
+        """Test that CRLF notes read the same as read_note."""
+        file_manager = FileManager(temp_vault)
+        path = file_manager.get_note_path("crlf.md")
+        path.write_bytes(b"---\r\nsummary: s\r\n---\r\n\r\n# T\xc3\xadtle\r\n\r\nbody\r\n")
+        
+        assert file_manager.read_header("crlf.md") == "---\nsummary: s\n---\n\n# Títle\n"
+        assert file_manager.read_note("crlf.md").startswith(file_manager.read_header("crlf.md"))
+    
+    def test_content_cache_serves_repeat_reads(self, temp_vault):
+        """Test that cached content is served until the file changes."""
+        file_manager = FileManager(temp_vault, content_cache_bytes=1024 * 1024)
+        file_manager.write_note("cached.md", "# Cached\r\n\r\nfirst\n")
+        
+        assert file_manager.read_note("cached.md") == "# Cached\n\nfirst\n"
+        assert file_manager.content_cache.hits == 1
+        
+        file_manager.get_note_path("cached.md").write_text("# Cached\n\nedited elsewhere\n", encoding='utf-8')
+        assert file_manager.read_note("cached.md") == "# Cached\n\nedited elsewhere\n"
+        assert file_manager.content_cache.misses == 1
+        
+        file_manager.delete_note("cached.md")
+        assert len(file_manager.content_cache) == 0
+        with pytest.raises(FileNotFoundError):
+            file_manager.read_note("cached.md")
@@ -0,0 +1,89 @@
+"""Tests for the frontmatter codec."""
+
+import pytest
+import yaml
+from mcp_notes.lib import frontmatter
+from mcp_notes.lib.frontmatter import dump_frontmatter, load_frontmatter
+
+
+SCALARS = [
+    "plain", "Note about Python async", "2025-06-14T10:30:00.123456", "", " leading", "trailing ",
+    "a: b", "a #b", "#hash", "-dash", "- item", "it's", "'quoted'", '"double"', "café", "中文",
+    "multi\nline", "tab\there", "yes", "null", "~", "1.5", "42", "@at", "%p", "[list]", "{map}",
+    "x" * 200, " ".join(["word"] * 30), "claude-desktop", "conv_20250614_001", "a:b", "trailing:",
+    "Résumé of the discussion about naïve caching strategies, where we compared the caching layers",
+    "Résumé — " + " ".join(["naïve"] * 25), "中文 " * 40, "tab\t" + "long " * 30,
+]
+
+
+def yaml_dump(data):
+    """The serialisation format_markdown has always produced."""
+    return yaml.dump(data, default_flow_style=False, sort_keys=False)
+
+
+class TestFrontmatterCodec:
+    """Test that the codec matches PyYAML exactly."""
+
+    @pytest.mark.parametrize("value", SCALARS)
+    def test_dump_matches_pyyaml(self, value):
+        """Test byte-identical output for scalars and tag lists."""
+        data = {'created': value, 'updated': value, 'tags': [value, 'python'], 'summary': value}
+        assert dump_frontmatter(data) == yaml_dump(data)
+        assert dump_frontmatter({'tags': [], 'summary': value}) == yaml_dump({'tags': [], 'summary': value})
+
+    @pytest.mark.parametrize("value", SCALARS)
+    def test_load_matches_pyyaml(self, value):
+        """Test that dumped frontmatter loads back as PyYAML reads it."""
+        text = yaml_dump({'created': value, 'tags': [value, 'python'], 'summary': value})
+        assert load_frontmatter(text) == yaml.safe_load(text)
+
+    @pytest.mark.parametrize("text", [
+        "tags: [python, async]\nsummary: s",
+        "tags: []\nsummary: s",
+        "tags: [a, 'b']\nsummary: s",
+        "tags:\n  - indented\n  - items\nsummary: s",
+        "summary:\ntags:\n- a",
+        "summary: x # comment",
+        "summary: folded\n  continuation",
+        "count: 3\nflag: yes",
+        "created: 2025-06-14",
+        "nested:\n  key: value",
+        "summary: 'it''s'",
+        "summary: 'quoted' # comment",
+        "# comment\nsummary: s",
+        "summary: a\nsummary: b",
+        "",
+    ])
+    def test_load_handwritten(self, text):
+        """Test frontmatter written by hand, including forms the fast path skips."""
+        assert load_frontmatter(text) == yaml.safe_load(text)
+
+    @pytest.mark.skipif(not hasattr(yaml, "CSafeLoader"), reason="PyYAML built without libyaml")
+    def test_load_inconsistent_item_indent(self):
+        """Test that list items at differing indents are read as libyaml reads them."""
+        text = "tags:\n- x\n  - y\nsummary: s"
+        assert load_frontmatter(text) == yaml.load(text, Loader=yaml.CSafeLoader)
+        assert load_frontmatter(text)['tags'] == ['x - y']
+
+        text = "tags:\n  - x\n- y\nsummary: s"
+        with pytest.raises(yaml.YAMLError):
+            yaml.load(text, Loader=yaml.CSafeLoader)
+        with pytest.raises(yaml.YAMLError):
+            load_frontmatter(text)
+
+    def test_fast_path_used_for_note_schema(self, monkeypatch):
+        """Test that notes we write never touch PyYAML."""
+        def fail(*args, **kwargs):
+            raise AssertionError("PyYAML should not be called")
+        monkeypatch.setattr(frontmatter.yaml, "load", fail)
+        monkeypatch.setattr(frontmatter.yaml, "dump", fail)
+
+        data = {
+            'created': '2025-06-14T10:30:00.123456',
+            'updated': '2025-06-14T10:30:00.123456',
+            'tags': ['python', 'async'],
+            'summary': 'Note about Python async',
+            'conversation_id': 'conv_001',
+            'ai_client': 'claude-desktop',
+        }
+        assert load_frontmatter(dump_frontmatter(data)) == data
@@ -0,0 +1,176 @@
+"""Tests for git commits of notes."""
+
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from mcp_notes.lib.git import CommitQueue, GitManager, combine_messages
+
+
+def write(vault: str, filename: str) -> None:
+    (Path(vault) / filename).write_text(f"# {filename}\n", encoding='utf-8')
+
+
+def git(vault: str, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=vault, check=True, capture_output=True, text=True).stdout
+
+
+class TestGitBackends:
+    """Test that both commit backends record the same trees."""
+
+    @pytest.mark.parametrize("backend", ["index", "plumbing"])
+    def test_commit_nested_notes(self, temp_vault, backend):
+        """Test committing new and changed notes in nested folders."""
+        manager = GitManager(temp_vault, backend)
+        (Path(temp_vault) / "a" / "b").mkdir(parents=True)
+        for filename in ["top.md", "a/b/deep.md", "a/two.md", "a-b.md"]:
+            write(temp_vault, filename)
+        first = manager.commit_notes(["top.md", "a/b/deep.md", "a/two.md", "a-b.md"], "Add notes")
+
+        (Path(temp_vault) / "a/b/deep.md").write_text("changed\n", encoding='utf-8')
+        second = manager.commit_notes(["a/b/deep.md"], "Update note")
+
+        assert git(temp_vault, "rev-parse", "HEAD").strip() == second
+        assert git(temp_vault, "rev-parse", "HEAD^").strip() == first
+        assert git(temp_vault, "show", "HEAD:a/b/deep.md") == "changed\n"
+        assert git(temp_vault, "ls-tree", "-r", "--name-only", "HEAD").split() == [
+            "a-b.md", "a/b/deep.md", "a/two.md", "top.md"
+        ]
+        # Same tree git itself would write from the index
+        assert git(temp_vault, "write-tree") == git(temp_vault, "rev-parse", "HEAD^{tree}")
+        assert git(temp_vault, "status", "--porcelain") == ""
+        git(temp_vault, "fsck", "--strict")
+
+    def test_plumbing_records_deletions(self, temp_vault):
+        """Test that a missing note is removed from the tree."""
+        manager = GitManager(temp_vault, "plumbing")
+        (Path(temp_vault) / "folder").mkdir()
+        write(temp_vault, "keep.md")
+        write(temp_vault, "folder/gone.md")
+        manager.commit_notes(["keep.md", "folder/gone.md"], "Add notes")
+
+        (Path(temp_vault) / "folder/gone.md").unlink()
+        manager.commit_notes(["folder/gone.md"], "Remove note")
+
+        assert git(temp_vault, "ls-tree", "-r", "--name-only", "HEAD").split() == ["keep.md"]
+        assert git(temp_vault, "status", "--porcelain") == ""
+
+    def test_plumbing_locked_index_commits_nothing(self, temp_vault):
+        """Test that a failed index update leaves HEAD and the index untouched."""
+        manager = GitManager(temp_vault, "plumbing")
+        write(temp_vault, "a.md")
+        first = manager.commit_notes(["a.md"], "Add a")
+        
+        write(temp_vault, "b.md")
+        lock = Path(temp_vault) / ".git" / "index.lock"
+        lock.write_text("")
+        with pytest.raises(subprocess.CalledProcessError):
+            manager.commit_notes(["b.md"], "Add b")
+        lock.unlink()
+        
+        assert git(temp_vault, "rev-parse", "HEAD").strip() == first
+        assert git(temp_vault, "status", "--porcelain") == "?? b.md\n"
+        
+        second = manager.commit_notes(["b.md"], "Add b")
+        assert git(temp_vault, "rev-parse", "HEAD^").strip() == first
+        assert git(temp_vault, "log", "-g", "--format=%gs", "-1", "HEAD").strip() == "commit: Add b"
+        assert git(temp_vault, "status", "--porcelain") == ""
+        assert second == git(temp_vault, "rev-parse", "HEAD").strip()
+    
+    def test_changed_and_dirty_paths(self, temp_vault):
+        """Test listing paths changed since a commit and in the working tree."""
+        manager = GitManager(temp_vault, "plumbing")
+        assert manager.head_commit() is None
+        write(temp_vault, "a.md")
+        write(temp_vault, "b.md")
+        first = manager.commit_notes(["a.md", "b.md"], "Add notes")
+
+        (Path(temp_vault) / "b.md").unlink()
+        write(temp_vault, "c.md")
+        manager.commit_notes(["b.md", "c.md"], "Replace b with c")
+        assert manager.changed_paths(first) == {"b.md", "c.md"}
+        assert manager.changed_paths("0" * 40) is None
+
+        (Path(temp_vault) / "a.md").write_text("edited\n", encoding='utf-8')
+        write(temp_vault, "new.md")
+        (Path(temp_vault) / ".gitignore").write_text("skip.md\n", encoding='utf-8')
+        write(temp_vault, "skip.md")
+        assert manager.dirty_paths() == {"a.md", "new.md", ".gitignore", "skip.md"}
+    
+    def test_unknown_backend(self, temp_vault):
+        """Test rejecting an unknown backend name."""
+        with pytest.raises(ValueError):
+            GitManager(temp_vault, "svn")
+
+
+class TestCommitQueue:
+    """Test grouping note commits."""
+
+    def test_burst_becomes_one_commit(self, temp_vault):
+        """Test that notes queued within the window share one commit."""
+        queue = CommitQueue(GitManager(temp_vault), window=10)
+        tickets = []
+        for i in range(5):
+            write(temp_vault, f"note-{i}.md")
+            tickets.append(queue.submit(f"note-{i}.md", f"Add note: {i}"))
+        assert all(ticket.status == "pending" for ticket in tickets)
+
+        queue.flush()
+        commits = list(Repo(temp_vault).iter_commits())
+        assert len(commits) == 1
+        assert commits[0].message.startswith("Add 5 notes\n\n- Add note: 0\n")
+        assert {ticket.sha for ticket in tickets} == {commits[0].hexsha}
+        assert queue.stats()['batches'] == 1
+        queue.close()
+
+    def test_batch_size_limit(self, temp_vault):
+        """Test that a full batch is committed without waiting for the window."""
+        queue = CommitQueue(GitManager(temp_vault), window=10, max_batch=2)
+        for i in range(2):
+            write(temp_vault, f"note-{i}.md")
+            ticket = queue.submit(f"note-{i}.md", f"Add note: {i}")
+
+        assert ticket.wait(5)
+        assert ticket.status == "committed"
+        queue.close()
+
+    def test_wait_commits_immediately(self, temp_vault):
+        """Test that waiting for a commit doesn't wait for the window."""
+        queue = CommitQueue(GitManager(temp_vault), window=10)
+        write(temp_vault, "note.md")
+
+        ticket = queue.submit("note.md", "Add note: note", wait=True)
+
+        assert ticket.status == "committed"
+        assert queue.status("note.md") is ticket
+        queue.close()
+
+    def test_close_flushes(self, temp_vault):
+        """Test that closing commits notes still queued."""
+        queue = CommitQueue(GitManager(temp_vault), window=10)
+        write(temp_vault, "note.md")
+        ticket = queue.submit("note.md", "Add note: note")
+
+        queue.close()
+
+        assert ticket.status == "committed"
+        assert not [t for t in threading.enumerate() if t.name == "mcp-notes-commits" and t.is_alive()]
+
+    def test_failed_commit_is_reported(self, temp_vault):
+        """Test that a failing batch marks each note as failed."""
+        queue = CommitQueue(GitManager(temp_vault), window=0)
+
+        ticket = queue.submit("missing.md", "Add note: missing", wait=True)
+
+        assert ticket.status == "failed"
+        assert ticket.error
+        assert queue.stats()['failed'] == 1
+        queue.close()
+
+    def test_combine_messages(self):
+        """Test the message of single and grouped commits."""
+        assert combine_messages(["Add note: A"]) == "Add note: A"
+        assert combine_messages(["Add note: A", "Add note: B"]) == "Add 2 notes\n\n- Add note: A\n- Add note: B"
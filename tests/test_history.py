@@ -0,0 +1,97 @@
+"""Tests for the per-file commit history index."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from mcp_notes.lib.git import GitManager
+from mcp_notes.lib.history import HistoryIndex
+
+
+def commit(vault: str, files: dict, message: str) -> None:
+    for filename, content in files.items():
+        path = Path(vault) / filename
+        if content is None:
+            path.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding='utf-8')
+    subprocess.run(["git", "add", "-A"], cwd=vault, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", message], cwd=vault, check=True)
+
+
+def expected_history(repo: Repo, filename: str) -> list:
+    return [
+        {
+            'sha': c.hexsha[:8],
+            'message': c.message.strip(),
+            'author': str(c.author),
+            'date': c.committed_datetime.isoformat(),
+        }
+        for c in repo.iter_commits(paths=filename)
+    ]
+
+
+@pytest.fixture
+def vault_with_history(temp_vault):
+    commit(temp_vault, {"a.md": "one\n", "projects/plan.md": "plan\n"}, "First\n\nWith a body.")
+    commit(temp_vault, {"a.md": "two\n", "b c.md": "spaced\n"}, "Second")
+    commit(temp_vault, {"projects/plan.md": None, "projects/é.md": "accent\n"}, "Third")
+    return temp_vault
+
+
+class TestHistoryIndex:
+    """Test indexing which commits touched each file."""
+
+    def test_matches_git_log(self, vault_with_history):
+        """Test that lookups agree with iter_commits(paths=...)."""
+        repo = Repo(vault_with_history)
+        history = HistoryIndex(repo)
+
+        for filename in ["a.md", "b c.md", "projects/plan.md", "projects/é.md", "missing.md"]:
+            assert history.lookup(filename, 10) == expected_history(repo, filename)
+        assert history.lookup("a.md", 1)[0]['message'] == "Second"
+
+    def test_incremental_update(self, vault_with_history, tmp_path):
+        """Test that only new commits are read, and the index persists."""
+        repo = Repo(vault_with_history)
+        path = str(tmp_path / "history.sqlite3")
+        history = HistoryIndex(repo, path)
+        assert history.update() == 3
+        assert history.update() == 0
+        history.close()
+
+        commit(vault_with_history, {"a.md": "three\n"}, "Fourth")
+        history = HistoryIndex(repo, path)
+        assert history.update() == 1
+        assert [c['message'] for c in history.lookup("a.md")] == ["Fourth", "Second", "First\n\nWith a body."]
+        assert history.stats()['indexed_commits'] == 4
+
+    def test_rewritten_history_rebuilds(self, vault_with_history):
+        """Test that a reset to an unrelated commit replaces the index."""
+        repo = Repo(vault_with_history)
+        history = HistoryIndex(repo)
+        history.update()
+
+        subprocess.run(["git", "reset", "-q", "--hard", "HEAD~2"], cwd=vault_with_history, check=True)
+        commit(vault_with_history, {"a.md": "rewritten\n"}, "Rewritten")
+
+        assert history.update() == 2
+        assert history.lookup("a.md") == expected_history(repo, "a.md")
+        assert history.lookup("b c.md") == []
+
+    def test_empty_repository(self, temp_vault):
+        """Test looking up history before the first commit."""
+        assert HistoryIndex(Repo(temp_vault)).lookup("a.md") == []
+
+    def test_git_manager_uses_index(self, vault_with_history):
+        """Test that get_commit_history follows commits made through the manager."""
+        manager = GitManager(vault_with_history, "plumbing")
+        assert len(manager.get_commit_history("a.md")) == 2
+
+        (Path(vault_with_history) / "a.md").write_text("four\n", encoding='utf-8')
+        manager.commit_notes(["a.md"], "Update a")
+        assert manager.get_commit_history("a.md")[0]['message'] == "Update a"
+        assert len(manager.get_commit_history(limit=10)) == 4
@@ -4,7 +4,8 @@ import pytest
 from datetime import datetime
 from mcp_notes.lib.markdown import (
     parse_markdown, format_markdown, create_default_frontmatter,
-    extract_title_from_content, kebab_case, generate_filename
+    extract_title_from_content, header_length, kebab_case, generate_filename,
+    scan_note
 )
 from mcp_notes.lib.types import NoteFrontmatter
 
@@ -77,13 +78,56 @@ This is the content."""
             ("# Main Title\n\nContent here", "Main Title"),
             ("## Not a main title\n# This is the title", "This is the title"),
             ("No title here\nJust content", "Untitled Note"),
-            ("", "Untitled Note")
+            ("", "Untitled Note"),
+            ("  #   Indented  \r\nBody", "Indented"),
+            ("#   \n#NoSpace\n# Real", "Real"),
         ]
         
         for content, expected in test_cases:
             result = extract_title_from_content(content)
             assert result == expected
     
+    def test_scan_note(self):
+        """Test finding frontmatter, header, title and body in one pass."""
+        content = "---\ncreated: '2025-06-14'\nupdated: '2025-06-14'\ntags: [a, b]\nsummary: s\n---\n\n# Title\n\nBody"
+        
+        scanned = scan_note(content)
+        
+        start, end = scanned.frontmatter_span
+        assert content[start:end].startswith("created:")
+        assert content[end:].startswith("\n---")
+        assert scanned.header.tags == ("a", "b")
+        assert scanned.title == "Title"
+        assert content[scanned.body_offset:] == scanned.body == "# Title\n\nBody"
+    
+    def test_scan_note_without_valid_frontmatter(self):
+        """Test that invalid frontmatter leaves the whole note as body."""
+        for content in ("# Only body", "---\nsummary: [unclosed\n---\n# Title\n"):
+            scanned = scan_note(content)
+            
+            assert scanned.body_offset == 0
+            assert scanned.body == content
+            assert scanned.header.summary == "Note content"
+            assert scanned.title is not None
+        
+        assert scan_note("no heading").title is None
+    
+    def test_header_length(self):
+        """Test finding the end of the frontmatter and first heading."""
+        note = "---\nsummary: s\n---\n\n# Title\n\nBody\n"
+        end = header_length(note)
+        
+        assert note[:end] == "---\nsummary: s\n---\n\n# Title\n"
+        # Header is incomplete until the heading line ends
+        assert header_length("---\nsummary: s\n---\n\n# Ti") is None
+        assert header_length("---\nsummary: s\n") is None
+        assert header_length("No frontmatter\n# Heading\nBody") == len("No frontmatter\n# Heading\n")
+        # A heading-like line inside the frontmatter still needs the closing ---
+        assert header_length("---\n# comment\nsummary: s\n---\nBody\n") == len("---\n# comment\nsummary: s\n---\n")
+        
+        title_end = header_length(note)
+        assert extract_title_from_content(note[:title_end]) == extract_title_from_content(note)
+    
     def test_kebab_case(self):
         """Test kebab case conversion."""
         test_cases = [
@@ -1,7 +1,12 @@
 """Tests for MCP server functionality."""
 
+import asyncio
+import subprocess
+import threading
+
 import pytest
 from datetime import datetime, timedelta
+from pathlib import Path
 from mcp_notes.main import MCPNotesServer
 from mcp_notes.lib.date_parser import format_date_for_backlink
 
@@ -17,7 +22,42 @@ class TestMCPServer:
         assert len(result) == 1
         assert "Note created successfully" in result[0].text
         assert "test-note-" in result[0].text
+        assert "queued for git commit" in result[0].text
+    
+    @pytest.mark.asyncio
+    async def test_create_note_wait_for_commit(self, mcp_server, sample_note_params):
+        """Test that callers can wait for the git commit."""
+        result = await mcp_server._create_note({**sample_note_params, "wait_for_commit": True})
+        
         assert "committed to git" in result[0].text
+        assert mcp_server.git_manager.is_repo_clean()
+    
+    @pytest.mark.asyncio
+    async def test_commit_status(self, mcp_server, sample_note_params):
+        """Test reporting queued and committed notes."""
+        await mcp_server._create_note(sample_note_params)
+        filename = mcp_server.file_manager.list_notes()[0]
+        
+        result = await mcp_server._get_commit_status({})
+        assert f"{filename}: pending" in result[0].text
+        
+        mcp_server.commit_queue.flush()
+        result = await mcp_server._get_commit_status({"filenames": [filename, "other.md"]})
+        assert f"{filename}: committed (" in result[0].text
+        assert "other.md: unknown" in result[0].text
+    
+    @pytest.mark.asyncio
+    async def test_note_history(self, mcp_server, sample_note_params):
+        """Test listing the commits that changed a note."""
+        await mcp_server._create_note({**sample_note_params, "wait_for_commit": True})
+        filename = mcp_server.file_manager.list_notes()[0]
+        
+        result = await mcp_server._get_note_history({"filename": filename})
+        assert f"History of {filename} (1 commit(s))" in result[0].text
+        assert "Add note: Test Note" in result[0].text
+        
+        result = await mcp_server._get_note_history({"filename": "missing.md"})
+        assert "No commits found for missing.md" in result[0].text
     
     @pytest.mark.asyncio
     async def test_create_note_with_custom_date(self, mcp_server, sample_note_params):
@@ -123,7 +163,32 @@ class TestMCPServer:
         assert len(result) == 1
         assert "Found 1 total note(s)" in result[0].text
         assert "Test Note" in result[0].text
-    
+
+    @pytest.mark.asyncio
+    async def test_list_notes_tag_modes(self, mcp_server, sample_note_params):
+        """Test listing notes with all/none tag filters."""
+        await mcp_server._create_note(sample_note_params)
+
+        result = await mcp_server._list_notes({"tags": ["test", "sample"], "tag_mode": "all"})
+        assert "Found 1 total note(s)" in result[0].text
+
+        result = await mcp_server._list_notes({"tags": ["test"], "tag_mode": "none"})
+        assert "No notes found" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_list_notes_cursor(self, mcp_server, sample_note_params):
+        """Test paging through notes with next_cursor."""
+        await mcp_server._create_note(sample_note_params)
+        await mcp_server._create_note({**sample_note_params, "title": "Second Note"})
+
+        result = await mcp_server._list_notes({"limit": 1})
+        assert "Next cursor: " in result[0].text
+        cursor = result[0].text.split("Next cursor: ")[1].strip()
+
+        result = await mcp_server._list_notes({"limit": 1, "cursor": cursor})
+        assert "showing 1" in result[0].text
+        assert "Next cursor" not in result[0].text
+
     @pytest.mark.asyncio
     async def test_get_note_existing(self, mcp_server, sample_note_params):
         """Test getting an existing note."""
@@ -138,8 +203,8 @@ class TestMCPServer:
             parts = text.split(":")
             if len(parts) > 1:
                 filename_part = parts[1].strip()
-                if filename_part.endswith(".md (committed to git)"):
-                    filename = filename_part.replace(" (committed to git)", "")
+                if filename_part.endswith(" (queued for git commit)"):
+                    filename = filename_part.replace(" (queued for git commit)", "")
                 elif filename_part.endswith(".md"):
                     filename = filename_part
         
@@ -160,6 +225,51 @@ class TestMCPServer:
         assert len(result) == 1
         assert "Note not found" in result[0].text
     
+    @pytest.mark.asyncio
+    async def test_get_note_during_long_search(self, mcp_server, sample_note_params):
+        """Test that get_note completes while a slow search is still running."""
+        await mcp_server._create_note(sample_note_params)
+        filename = mcp_server.file_manager.list_notes()[0]
+        
+        started = threading.Event()
+        release = threading.Event()
+        search = mcp_server.search_engine.search
+        
+        def slow_search(*args):
+            started.set()
+            release.wait(5)
+            return search(*args)
+        
+        mcp_server.search_engine.search = slow_search
+        search_task = asyncio.create_task(mcp_server._search_notes({"query": "test"}))
+        try:
+            assert await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            
+            result = await asyncio.wait_for(mcp_server._get_note({"filename": filename}), 2)
+            assert "Test Note" in result[0].text
+            assert not search_task.done()
+        finally:
+            release.set()
+        
+        result = await search_task
+        assert "Found 1 note(s)" in result[0].text
+    
+    @pytest.mark.asyncio
+    async def test_get_note_section(self, mcp_server, sample_note_params):
+        """Test getting one section of a note with a character budget."""
+        params = sample_note_params.copy()
+        params["content"] = "# Test Note\n\n## Details\n\nLong details here.\n\n## Other\n\nElsewhere."
+        await mcp_server._create_note(params)
+        filename = mcp_server.file_manager.list_notes()[0]
+        
+        result = await mcp_server._get_note({"filename": filename, "section": "Details"})
+        assert "section 'Details'" in result[0].text
+        assert "Long details here." in result[0].text
+        assert "Elsewhere" not in result[0].text
+        
+        result = await mcp_server._get_note({"filename": filename, "section": "Details", "max_chars": 10})
+        assert "## Details\n\n[Truncated; continue with start_byte=" in result[0].text
+    
     @pytest.mark.asyncio
     async def test_note_contains_date_backlink(self, mcp_server, sample_note_params):
         """Test that created notes contain date backlinks."""
@@ -211,4 +321,128 @@ class TestMCPServer:
         # Check for correct date backlink
         two_days_ago = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')
         expected_backlink = f"Created: [[{two_days_ago}]]"
-        assert expected_backlink in content
\ No newline at end of file
+        assert expected_backlink in content
+    
+    @pytest.mark.asyncio
+    async def test_search_results_are_cached_until_vault_changes(self, mcp_server, sample_note_params):
+        """Test that repeated searches hit the cache and writes invalidate it."""
+        await mcp_server._create_note(sample_note_params)
+        
+        first = await mcp_server._search_notes({"query": "test"})
+        second = await mcp_server._search_notes({"query": "test", "limit": 10})
+        assert first[0].text == second[0].text
+        assert mcp_server.result_cache.hits == 1
+        
+        params = sample_note_params.copy()
+        params["title"] = "Another Test"
+        await mcp_server._create_note(params)
+        
+        third = await mcp_server._search_notes({"query": "test"})
+        assert "Found 2 note(s)" in third[0].text
+        assert mcp_server.result_cache.hits == 1
+    
+    @pytest.mark.asyncio
+    async def test_list_notes_reads_only_headers(self, mcp_server, monkeypatch):
+        """Test that listing doesn't read whole notes into the search index."""
+        vault = Path(mcp_server.file_manager.vault_path)
+        for i in range(3):
+            (vault / f"note-{i}.md").write_text(f"# Note {i}\n\n" + "body text " * 1000)
+        reads = []
+        monkeypatch.setattr(mcp_server.file_manager, "read_note", reads.append)
+        
+        result = await mcp_server._list_notes({})
+        assert "Found 3 total note(s)" in result[0].text
+        assert reads == []
+        assert len(mcp_server.note_index) == 0
+    
+    @pytest.mark.asyncio
+    async def test_cache_invalidated_by_external_edit(self, mcp_server, sample_note_params):
+        """Test that files changed outside the server invalidate cached results."""
+        await mcp_server._create_note(sample_note_params)
+        await mcp_server._list_notes({})
+        
+        (Path(mcp_server.file_manager.vault_path) / "external.md").write_text(
+            "# External Note\n\nWritten by another editor."
+        )
+        
+        result = await mcp_server._list_notes({})
+        assert "Found 2 total note(s)" in result[0].text
+    
+    @pytest.mark.asyncio
+    async def test_get_server_stats(self, mcp_server):
+        """Test reporting cache statistics."""
+        await mcp_server._search_notes({"query": "test"})
+        await mcp_server._search_notes({"query": "test"})
+        
+        result = await mcp_server._get_server_stats({})
+        assert '"hits": 1' in result[0].text
+        assert '"misses": 1' in result[0].text
+
+
+class TestGitCatchUp:
+    """Test bringing the catalog up to date from git on startup."""
+    
+    def test_restart_checks_only_changed_notes(self, mcp_server, temp_vault, monkeypatch):
+        """Test that a restarted server refreshes just the notes git reports."""
+        vault = Path(temp_vault)
+        for name in ["kept", "edited", "removed", "reverted"]:
+            (vault / f"{name}.md").write_text(f"# {name.title()}\n")
+        mcp_server.git_manager.commit_notes(["kept.md", "edited.md", "removed.md", "reverted.md"], "Add notes")
+        mcp_server._refresh_all()
+        
+        # Cataloged by this run while dirty, then reverted after it stopped
+        (vault / "reverted.md").write_text("# Changed\n")
+        mcp_server.catalog.refresh(["reverted.md"])
+        mcp_server.catalog.close()
+        (vault / "reverted.md").write_text("# Reverted\n")
+        
+        (vault / "edited.md").write_text("# Edited Elsewhere\n")
+        (vault / "removed.md").unlink()
+        # As a pull from another clone would
+        subprocess.run(["git", "add", "-A", "edited.md", "removed.md"], cwd=vault, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "Pulled changes"], cwd=vault, check=True)
+        (vault / "untracked.md").write_text("# Untracked\n")
+        
+        server = MCPNotesServer(temp_vault)
+        refreshed = []
+        original_refresh = server.catalog.refresh
+        monkeypatch.setattr(
+            server.catalog, "refresh", lambda names=None: refreshed.append(names) or original_refresh(names)
+        )
+        try:
+            server._refresh_all()
+            notes, total, _ = server.catalog.list_notes(sort_by="title", sort_order="asc")
+        finally:
+            server.commit_queue.close()
+            server.catalog.close()
+        
+        assert sorted(refreshed[0]) == ["edited.md", "removed.md", "reverted.md", "untracked.md"]
+        assert [note.title for note in notes] == ["Edited Elsewhere", "Kept", "Reverted", "Untracked"]
+    
+    def test_no_checkpoint_rescans(self, mcp_server):
+        """Test that a catalog without a checkpoint is rebuilt by scanning."""
+        (Path(mcp_server.file_manager.vault_path) / "note.md").write_text("# Note\n")
+        mcp_server.git_manager.commit_notes(["note.md"], "Add note")
+        
+        mcp_server._refresh_all()
+        assert len(mcp_server.catalog) == 1
+        assert mcp_server.catalog.checkpoint() == (mcp_server.git_manager.head_commit(), [])
+    
+    @pytest.mark.asyncio
+    async def test_search_index_built_by_first_search(self, mcp_server, monkeypatch):
+        """Test that startup reads no notes and the first search indexes the vault."""
+        (Path(mcp_server.file_manager.vault_path) / "note.md").write_text("# Note\n\nAsyncio event loops\n")
+        mcp_server.git_manager.commit_notes(["note.md"], "Add note")
+        
+        reads = []
+        read_note = mcp_server.file_manager.read_note_with_crlf
+        monkeypatch.setattr(
+            mcp_server.file_manager, "read_note_with_crlf", lambda name: reads.append(name) or read_note(name)
+        )
+        mcp_server._refresh_all()
+        assert reads == []
+        assert len(mcp_server.note_index) == 0
+        
+        result = await mcp_server._search_notes({"query": "asyncio"})
+        assert "note.md" in result[0].text
+        assert reads == ["note.md"]
@@ -0,0 +1,96 @@
+"""Tests for the search query language."""
+
+import pytest
+from mcp_notes.lib.index import NoteIndex
+from mcp_notes.lib.query import QueryEvaluator, parse_query
+from tests.conftest import make_note
+
+
+class TestParseQuery:
+    """Test query parsing."""
+
+    def test_parse_terms_and_phrases(self):
+        """Test parsing bare terms and quoted phrases."""
+        query = parse_query('asyncio "event loop"')
+
+        assert [[c.terms for c in group] for group in query.groups] == [[["asyncio"]], [["event", "loop"]]]
+        assert query.groups[1][0].is_phrase
+
+    def test_parse_exclusions_and_tags(self):
+        """Test parsing exclusions and tag qualifiers."""
+        query = parse_query('python -threading -"thread pool" tag:async -tag:draft')
+
+        assert [c.terms for c in query.excluded] == [["threading"], ["thread", "pool"]]
+        assert query.tags == ["async"]
+        assert query.excluded_tags == ["draft"]
+
+    def test_parse_or_and_fields(self):
+        """Test parsing OR groups and field qualifiers."""
+        query = parse_query('title:asyncio OR summary:"event loop" deadlock')
+
+        assert len(query.groups) == 2
+        first, second = query.groups[0]
+        assert (first.field, first.terms) == ("title", ["asyncio"])
+        assert (second.field, second.terms) == ("summary", ["event", "loop"])
+        assert query.terms() == ["asyncio", "event", "loop", "deadlock"]
+
+    def test_parse_unknown_qualifier_is_text(self):
+        """Test that unknown qualifiers are treated as text."""
+        query = parse_query("https://example.com")
+
+        clause = query.groups[0][0]
+        assert clause.field is None
+        assert clause.terms == ["https", "example", "com"]
+
+    def test_parse_empty(self):
+        """Test parsing queries with no usable terms."""
+        assert parse_query("").is_empty()
+        assert parse_query('- "" OR').is_empty()
+
+
+class TestQueryEvaluator:
+    """Test evaluating queries against the index."""
+
+    @pytest.fixture
+    def seed_notes(self):
+        return {
+            "a.md": make_note("Asyncio Deadlock", "the event loop blocked", ["python", "async"]),
+            "b.md": make_note("Loop Events", "an event and a loop", ["python"]),
+            "c.md": make_note("Rust Threads", "thread pool deadlock", ["rust", "draft"]),
+        }
+
+    @pytest.fixture
+    def evaluator(self, file_manager):
+        index = NoteIndex(file_manager)
+        index.refresh()
+        return QueryEvaluator(index)
+
+    def filenames(self, evaluator, text):
+        return sorted(evaluator.index.docs[doc_id].filename for doc_id in evaluator.evaluate(parse_query(text)))
+
+    def test_terms_are_intersected(self, evaluator):
+        assert self.filenames(evaluator, "deadlock") == ["a.md", "c.md"]
+        assert self.filenames(evaluator, "deadlock asyncio") == ["a.md"]
+        assert self.filenames(evaluator, "deadlock missing") == []
+
+    def test_phrase_requires_adjacent_terms(self, evaluator):
+        assert self.filenames(evaluator, "event loop") == ["a.md", "b.md"]
+        assert self.filenames(evaluator, '"event loop"') == ["a.md"]
+
+    def test_or_unions_clauses(self, evaluator):
+        assert self.filenames(evaluator, "asyncio OR rust") == ["a.md", "c.md"]
+        assert self.filenames(evaluator, "deadlock asyncio OR thread") == ["a.md", "c.md"]
+
+    def test_exclusions(self, evaluator):
+        assert self.filenames(evaluator, "deadlock -rust") == ["a.md"]
+        assert self.filenames(evaluator, '-"event loop"') == ["b.md", "c.md"]
+
+    def test_tag_filters(self, evaluator):
+        assert self.filenames(evaluator, "tag:python") == ["a.md", "b.md"]
+        assert self.filenames(evaluator, "deadlock -tag:draft") == ["a.md"]
+        assert self.filenames(evaluator, "tag:python tag:async") == ["a.md"]
+
+    def test_field_qualifiers(self, evaluator):
+        assert self.filenames(evaluator, "title:loop") == ["b.md"]
+        assert self.filenames(evaluator, "body:loop") == ["a.md", "b.md"]
+        assert self.filenames(evaluator, 'title:"asyncio deadlock"') == ["a.md"]
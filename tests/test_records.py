@@ -0,0 +1,62 @@
+"""Tests for compact note records."""
+
+import pytest
+from pydantic import ValidationError
+from mcp_notes.lib.markdown import parse_markdown, scan_note
+from mcp_notes.lib.records import NoteHeader, NoteRecord
+from mcp_notes.lib.types import NoteFrontmatter
+
+
+VALID = {'created': '2025-06-14', 'updated': '2025-06-14', 'summary': 's'}
+
+
+class TestNoteHeader:
+    """Test NoteHeader validation and conversion."""
+
+    @pytest.mark.parametrize("data", [
+        VALID,
+        dict(VALID, tags=['a', 'b'], conversation_id='c', ai_client=None, extra=1),
+        dict(VALID, tags=None),
+        dict(VALID, tags='a'),
+        dict(VALID, tags=['a', 1]),
+        dict(VALID, created=None),
+        dict(VALID, summary=3),
+        dict(VALID, ai_client=5),
+        {'created': 'x', 'updated': 'y'},
+    ])
+    def test_accepts_what_frontmatter_model_accepts(self, data):
+        """Test that validation matches the pydantic model."""
+        try:
+            expected = NoteFrontmatter(**data)
+        except ValidationError:
+            with pytest.raises(ValueError):
+                NoteHeader.from_dict(data)
+            return
+
+        assert NoteHeader.from_dict(data).to_frontmatter() == expected
+
+    def test_tags_are_interned(self):
+        """Test that equal tags from different notes share one string."""
+        first = NoteHeader.from_dict(dict(VALID, tags=['python']))
+        second = NoteHeader.from_dict(dict(VALID, tags=[''.join(['py', 'thon'])]))
+
+        assert first.tags == ('python',)
+        assert first.tags[0] is second.tags[0]
+
+    def test_records_have_no_instance_dict(self):
+        """Test that records are slotted."""
+        header = NoteHeader.from_dict(VALID)
+        record = NoteRecord('a.md', 'A', 's', ['x'], 'c', 'u')
+
+        assert not hasattr(header, '__dict__')
+        assert not hasattr(record, '__dict__')
+
+    def test_scanned_header_matches_parse_markdown(self):
+        """Test that the internal parser agrees with the model-based one."""
+        content = "---\ncreated: '2025-06-14'\nupdated: '2025-06-14'\ntags: [a]\nsummary: s\n---\n\n# T\n\nBody"
+
+        scanned = scan_note(content)
+        parsed = parse_markdown(content)
+
+        assert scanned.header.to_frontmatter() == parsed.frontmatter
+        assert scanned.body == parsed.body
@@ -0,0 +1,351 @@
+"""Tests for search index and search engine functionality."""
+
+import hashlib
+import os
+import pytest
+from mcp_notes.lib.fuzzy import FuzzyIndex, edit_distance, is_fuzzy_term
+from mcp_notes.lib.index import NoteIndex, tokenize
+from mcp_notes.lib.ranking import BM25FScorer
+from mcp_notes.lib.search import SearchEngine
+from mcp_notes.lib.trigram import TrigramIndex
+from tests.conftest import make_note
+
+
+class TestNoteIndex:
+    """Test inverted index functionality."""
+
+    def test_tokenize(self):
+        """Test splitting text into lowercase tokens."""
+        assert tokenize("Asyncio Deadlock, in_python!") == ["asyncio", "deadlock", "in_python"]
+
+    def test_refresh_indexes_notes(self, file_manager):
+        """Test building the index from the vault."""
+        file_manager.write_note("a.md", make_note("Asyncio Guide", "event loop deadlock", ["python"]))
+        file_manager.write_note("b.md", make_note("Rust Notes", "ownership", ["rust"]))
+
+        index = NoteIndex(file_manager)
+        assert index.refresh()
+        assert len(index) == 2
+
+        doc = index.get("a.md")
+        assert doc.title == "Asyncio Guide"
+        assert "title" in index.postings_for("asyncio")[doc.doc_id]
+        assert "tags" in index.postings_for("python")[doc.doc_id]
+        assert index.document_frequency("ownership") == 1
+
+        # Nothing changed on disk
+        assert not index.refresh()
+
+    def test_refresh_detects_stale_and_deleted_notes(self, file_manager):
+        """Test reindexing modified notes and dropping deleted ones."""
+        file_manager.write_note("a.md", make_note("First", "alpha"))
+        file_manager.write_note("b.md", make_note("Second", "beta"))
+        index = NoteIndex(file_manager)
+        index.refresh()
+
+        file_manager.write_note("a.md", make_note("First", "gamma delta"))
+        file_manager.delete_note("b.md")
+        assert index.refresh()
+
+        assert index.document_frequency("alpha") == 0
+        assert index.document_frequency("gamma") == 1
+        assert index.get("b.md") is None
+        assert "beta" not in index.postings
+
+    def test_update_note_with_content(self, file_manager):
+        """Test indexing a freshly written note without rereading it."""
+        content = make_note("Fresh", "brand new note")
+        file_manager.write_note("fresh.md", content)
+
+        index = NoteIndex(file_manager)
+        index.update_note("fresh.md", content)
+
+        assert index.match_all(["brand", "new"]) == [index.get("fresh.md").doc_id]
+        assert not index.refresh()
+
+
+class TestSearchEngine:
+    """Test search engine functionality."""
+
+    def test_search_ranks_title_matches_first(self, file_manager):
+        """Test that title matches outrank body matches."""
+        file_manager.write_note("a.md", make_note("Other", "mentions asyncio once"))
+        file_manager.write_note("b.md", make_note("Asyncio Guide", "all about asyncio"))
+
+        results = SearchEngine(file_manager).search_notes("asyncio")
+
+        assert [r.filename for r in results] == ["b.md", "a.md"]
+
+    def test_search_multiple_terms(self, file_manager):
+        """Test that every query term must match."""
+        file_manager.write_note("a.md", make_note("Deadlocks", "asyncio deadlock in the loop"))
+        file_manager.write_note("b.md", make_note("Loops", "asyncio event loop"))
+
+        results = SearchEngine(file_manager).search_notes("asyncio deadlock")
+
+        assert [r.filename for r in results] == ["a.md"]
+
+    def test_search_sees_external_edits(self, file_manager):
+        """Test that notes edited outside the server are reindexed."""
+        engine = SearchEngine(file_manager)
+        file_manager.write_note("a.md", make_note("Note", "original text"))
+        assert engine.search_notes("original")
+
+        path = file_manager.get_note_path("a.md")
+        path.write_text(make_note("Note", "rewritten body text"), encoding='utf-8')
+        os.utime(path, ns=(1, 1))
+
+        assert not engine.search_notes("original")
+        assert engine.search_notes("rewritten")
+
+    def test_search_returns_top_k_and_total(self, file_manager):
+        """Test that only the best matches are returned, with the total count."""
+        for i in range(1, 8):
+            file_manager.write_note(f"note-{i}.md", make_note(f"Note {i}", " ".join(["asyncio"] * i)))
+
+        response = SearchEngine(file_manager).search("asyncio", limit=3)
+
+        assert response.total == 7
+        assert [r.filename for r in response.results] == ["note-7.md", "note-6.md", "note-5.md"]
+        scores = [r.relevance_score for r in response.results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_search_ties_keep_index_order(self, file_manager):
+        """Test that equally scored notes keep a stable order."""
+        engine = SearchEngine(file_manager)
+        for name in ("a.md", "b.md", "c.md"):
+            file_manager.write_note(name, make_note("Same", "identical body"))
+            engine.index.update_note(name)
+
+        response = engine.search("identical", limit=2)
+
+        assert response.total == 3
+        assert [r.filename for r in response.results] == ["a.md", "b.md"]
+
+
+class TestRanking:
+    """Test relevance scoring."""
+
+    def test_corpus_statistics_are_incremental(self, file_manager):
+        """Test that field lengths are maintained as notes change."""
+        file_manager.write_note("a.md", make_note("One", "two three"))
+        index = NoteIndex(file_manager)
+        index.refresh()
+        assert index.total_field_lengths['body'] == 3  # heading + body
+        assert index.average_field_length('title') == 1.0
+
+        file_manager.write_note("b.md", make_note("Four Five", "six"))
+        index.refresh()
+        assert index.total_field_lengths['title'] == 3
+        assert index.average_field_length('title') == 1.5
+
+        file_manager.delete_note("a.md")
+        index.refresh()
+        assert index.total_field_lengths['title'] == 2
+
+    def test_bm25f_prefers_rare_terms(self, file_manager):
+        """Test that rare terms carry more weight than common ones."""
+        for i in range(5):
+            file_manager.write_note(f"common-{i}.md", make_note(f"Note {i}", "python code"))
+        file_manager.write_note("rare.md", make_note("Note rare", "python asyncio"))
+
+        index = NoteIndex(file_manager)
+        index.refresh()
+        scorer = BM25FScorer(index)
+
+        assert scorer.idf("asyncio") > scorer.idf("python")
+        weights = scorer.term_weights(["asyncio"])
+        assert scorer.score(weights, index.get("rare.md").doc_id) > 0
+        assert scorer.score(weights, index.get("common-0.md").doc_id) == 0
+
+    def test_bm25f_weights_title_above_body(self, file_manager):
+        """Test that title hits score higher than equal body hits."""
+        file_manager.write_note("title.md", make_note("Deadlock", "unrelated words here"))
+        file_manager.write_note("body.md", make_note("Unrelated", "deadlock words here"))
+
+        results = SearchEngine(file_manager).search_notes("deadlock")
+        assert [r.filename for r in results] == ["title.md", "body.md"]
+
+    def test_unknown_ranking(self, file_manager):
+        """Test that an unknown ranking mode is rejected."""
+        with pytest.raises(ValueError):
+            SearchEngine(file_manager).search_notes("x", ranking="nope")
+
+
+class TestSubstringSearch:
+    """Test substring search and the trigram index."""
+
+    def test_trigram_candidates(self, file_manager):
+        """Test narrowing candidates by trigrams."""
+        file_manager.write_note("a.md", make_note("Paths", "see src/mcp_notes/lib/search.py"))
+        file_manager.write_note("b.md", make_note("Other", "nothing relevant"))
+        trigrams = TrigramIndex()
+        index = NoteIndex(file_manager)
+        index.add_extension(trigrams)
+        index.refresh()
+
+        assert trigrams.candidates("notes/lib") == {index.get("a.md").doc_id}
+        assert trigrams.candidates("zzz") == set()
+        assert trigrams.candidates("ab") is None
+
+        file_manager.delete_note("a.md")
+        index.refresh()
+        assert trigrams.candidates("notes/lib") == set()
+
+    def test_substring_matches_partial_identifiers(self, file_manager):
+        """Test that substring mode matches inside words."""
+        file_manager.write_note("a.md", make_note("Code", "call parse_markdown_fast here"))
+        file_manager.write_note("b.md", make_note("Other", "markdown notes"))
+        engine = SearchEngine(file_manager, trigrams=TrigramIndex())
+
+        assert not engine.search_notes("rse_mark")
+        results = engine.search_notes("rse_mark", mode="substring")
+        assert [r.filename for r in results] == ["a.md"]
+
+    def test_substring_results_match_without_trigram_index(self, file_manager):
+        """Test that the trigram index does not change substring results."""
+        file_manager.write_note("a.md", make_note("Async IO", "asyncio.gather and asyncio.run"))
+        file_manager.write_note("b.md", make_note("Sync", "synchronous code", ["async"]))
+        file_manager.write_note("c.md", make_note("Rust", "tokio runtime"))
+        # Titled from the filename, which the content never mentions
+        file_manager.write_note("meeting-notes.md", (
+            "---\ncreated: '2025-06-14T10:30:00'\nupdated: '2025-06-14T10:30:00'\nsummary: Minutes\n---\n\n"
+            "Agenda and action items.\n"
+        ))
+
+        with_index = SearchEngine(file_manager, trigrams=TrigramIndex())
+        without_index = SearchEngine(file_manager)
+
+        for query in ("sync", "asyncio.g", "io", "tokio runtime", "missing", "meeting"):
+            expected = without_index.search(query, mode="substring")
+            actual = with_index.search(query, mode="substring")
+            assert actual == expected
+
+    def test_unknown_mode(self, file_manager):
+        """Test that an unknown search mode is rejected."""
+        with pytest.raises(ValueError):
+            SearchEngine(file_manager).search_notes("x", mode="nope")
+
+
+class TestFuzzySearch:
+    """Test typo-tolerant search."""
+
+    def test_edit_distance(self):
+        """Test optimal string alignment distance with a limit."""
+        assert edit_distance("deadlock", "deadlock", 2) == 0
+        assert edit_distance("deadlock", "dedlock", 2) == 1
+        assert edit_distance("deadlock", "daedlock", 2) == 1  # transposition
+        assert edit_distance("deadlock", "dedlokc", 2) == 2
+        assert edit_distance("deadlock", "lock", 2) == 3
+
+    def test_expand_uses_vocabulary(self, file_manager):
+        """Test expanding terms to nearby vocabulary terms."""
+        file_manager.write_note("a.md", make_note("Asyncio", "deadlock in the event loop"))
+        index = NoteIndex(file_manager)
+        fuzzy = FuzzyIndex(index)
+        index.add_extension(fuzzy)
+        index.refresh()
+
+        assert fuzzy.expand("dedlock") == {"deadlock": 1}
+        assert fuzzy.expand("asnycoi") == {"asyncio": 2}
+        assert fuzzy.expand("evnt") == {"event": 1}
+        assert fuzzy.expand("th") == {}  # too short to expand
+
+        file_manager.delete_note("a.md")
+        index.refresh()
+        assert fuzzy.expand("dedlock") == {}
+
+    def test_dictionary_size_is_bounded(self, file_manager):
+        """Test that long and hash-like terms don't bloat the deletion dictionary."""
+        for i in range(10):
+            hashes = " ".join(hashlib.sha1(f"{i}-{j}".encode()).hexdigest() for j in range(20))
+            body = f"internationalisation commit {hashes} 20250614"
+            file_manager.write_note(f"n{i}.md", make_note("Transcript", body))
+        index = NoteIndex(file_manager)
+        fuzzy = FuzzyIndex(index)
+        index.add_extension(fuzzy)
+        index.refresh()
+
+        fuzzy_terms = [term for term in index.postings if is_fuzzy_term(term)]
+        assert len(index.postings) > 200
+        assert len(fuzzy_terms) < 10
+        assert len(fuzzy.deletes) <= 29 * len(fuzzy_terms)
+        assert fuzzy.expand("internationalisaton") == {"internationalisation": 1}
+        assert fuzzy.expand("20250615") == {}
+
+    def test_fuzzy_search_ranks_exact_matches_first(self, file_manager):
+        """Test that fuzzy matches are found but scored below exact ones."""
+        file_manager.write_note("exact.md", make_note("Notes", "a deadlock here"))
+        file_manager.write_note("typo.md", make_note("Notes", "a deadlocks here"))
+        index = NoteIndex(file_manager)
+        engine = SearchEngine(file_manager, index, fuzzy=FuzzyIndex(index))
+
+        assert [r.filename for r in engine.search_notes("deadlock")] == ["exact.md"]
+        assert [r.filename for r in engine.search_notes("deadlock", mode="fuzzy")] == ["exact.md", "typo.md"]
+        assert [r.filename for r in engine.search_notes("dedlocks", mode="fuzzy")] == ["typo.md", "exact.md"]
+
+    def test_fuzzy_search_disabled(self, file_manager):
+        """Test that fuzzy mode needs a fuzzy index."""
+        with pytest.raises(ValueError):
+            SearchEngine(file_manager).search_notes("x", mode="fuzzy")
+
+
+class TestSnippets:
+    """Test match snippets in search results."""
+
+    def test_snippet_highlights_match_offsets(self, file_manager):
+        """Test that highlight ranges point at the matched terms."""
+        body = "Intro text. " * 30 + "The asyncio loop hit a deadlock today. " + "Filler words. " * 30
+        file_manager.write_note("a.md", make_note("Notes", body))
+
+        result = SearchEngine(file_manager).search("asyncio deadlock").results[0]
+
+        assert len(result.snippets) == 1
+        snippet = result.snippets[0]
+        assert [snippet.text[s:e] for s, e in snippet.highlights] == ["asyncio", "deadlock"]
+
+        raw = file_manager.get_note_path("a.md").read_bytes()
+        assert raw[snippet.offset:].decode('utf-8').startswith(snippet.text.split(' ')[0])
+
+    def test_snippet_offsets_with_multibyte_text(self, file_manager):
+        """Test byte offsets when the note contains non-ASCII characters."""
+        body = "Café résumé naïve — " * 20 + "the ünïcode deadlock appears here"
+        file_manager.write_note("a.md", make_note("Notes", body))
+
+        snippet = SearchEngine(file_manager).search("deadlock").results[0].snippets[0]
+
+        start, end = snippet.highlights[0]
+        assert snippet.text[start:end] == "deadlock"
+        raw = file_manager.get_note_path("a.md").read_bytes()
+        assert raw[snippet.offset:].decode('utf-8').startswith(snippet.text)
+
+    def test_snippet_offsets_with_crlf_line_endings(self, file_manager):
+        """Test that offsets point into the file when lines end in CRLF."""
+        body = "Café line of filler text.\n" * 20 + "the needle is here\n" + "more filler\n" * 5
+        file_manager.write_note("a.md", make_note("Notes", body).replace("\n", "\r\n"))
+
+        snippet = SearchEngine(file_manager).search("needle").results[0].snippets[0]
+
+        start, end = snippet.highlights[0]
+        assert snippet.text[start:end] == "needle"
+        raw = file_manager.get_note_path("a.md").read_bytes()
+        assert raw[snippet.offset:].decode('utf-8').startswith(snippet.text.split(' ')[0])
+
+    def test_snippet_count_and_length(self, file_manager):
+        """Test that snippet count and length are configurable."""
+        body = " ".join(f"deadlock {'x' * 5} " + "pad " * 60 for _ in range(5))
+        file_manager.write_note("a.md", make_note("Notes", body))
+        engine = SearchEngine(file_manager)
+
+        assert len(engine.search("deadlock").results[0].snippets) == 3
+        assert len(engine.search("deadlock", snippet_count=1).results[0].snippets) == 1
+        assert engine.search("deadlock", snippet_count=0).results[0].snippets == []
+        snippet = engine.search("deadlock", snippet_length=40).results[0].snippets[0]
+        assert len(snippet.text) <= 40 + 64
+
+    def test_no_snippets_for_title_only_matches(self, file_manager):
+        """Test that notes matching outside the body get no snippets."""
+        file_manager.write_note("a.md", make_note("Notes", "body text", summary="deadlock summary"))
+
+        result = SearchEngine(file_manager).search("deadlock").results[0]
+        assert result.snippets == []
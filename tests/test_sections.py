@@ -0,0 +1,122 @@
+"""Tests for reading parts of notes."""
+
+import pytest
+
+from mcp_notes.lib.file_manager import FileManager
+from mcp_notes.lib.sections import SectionReader, decode_span, find_headings, line_span
+
+
+NOTE = (
+    "---\n"
+    "summary: '# not a heading'\n"
+    "---\n"
+    "\n"
+    "# Title\n"
+    "\n"
+    "Intro.\n"
+    "\n"
+    "## Key Learnings ##\n"
+    "\n"
+    "```python\n"
+    "# a comment, not a heading\n"
+    "```\n"
+    "\n"
+    "### Detail\n"
+    "\n"
+    "More.\n"
+    "\n"
+    "## Follow-up\n"
+    "\n"
+    "Questions.\n"
+)
+
+
+@pytest.fixture
+def reader(temp_vault):
+    file_manager = FileManager(temp_vault)
+    file_manager.write_note("note.md", NOTE)
+    return SectionReader(file_manager)
+
+
+class TestHeadings:
+    """Test building the heading-offset table."""
+
+    def test_find_headings(self):
+        """Test that frontmatter and fenced code are skipped and sections nest."""
+        data = NOTE.encode('utf-8')
+        headings = find_headings(data)
+
+        assert [(h.level, h.title) for h in headings] == [
+            (1, "Title"), (2, "Key Learnings"), (3, "Detail"), (2, "Follow-up")
+        ]
+        key_learnings = headings[1]
+        assert data[key_learnings.start:].startswith(b"## Key Learnings")
+        assert key_learnings.end == data.index(b"## Follow-up")
+        assert headings[0].end == len(data)
+
+    def test_line_span(self):
+        """Test 1-based inclusive line ranges."""
+        data = b"one\ntwo\nthree\n"
+
+        assert data[slice(*line_span(data, 2, 2))] == b"two\n"
+        assert data[slice(*line_span(data, 2))] == b"two\nthree\n"
+        assert line_span(data, 10) == (len(data), len(data))
+        with pytest.raises(ValueError):
+            line_span(data, 0)
+
+    def test_decode_span_keeps_characters_whole(self):
+        """Test that max_chars never splits a character or a CRLF pair."""
+        data = "héllo\r\nworld".encode('utf-8')
+
+        assert decode_span(data, 0, len(data), 2) == ("hé", 3)
+        assert decode_span(data, 0, len(data), 6) == ("héllo\n", 8)
+        assert decode_span(data, 0, len(data)) == ("héllo\nworld", len(data))
+
+
+class TestSectionReader:
+    """Test serving ranges and sections of notes."""
+
+    def test_read_section(self, reader):
+        """Test returning a section with its subsections."""
+        excerpt = reader.read("note.md", section="key learnings")
+
+        assert excerpt.text.startswith("## Key Learnings ##\n")
+        assert "### Detail" in excerpt.text
+        assert "Follow-up" not in excerpt.text
+        assert not excerpt.truncated
+
+    def test_unknown_section(self, reader):
+        """Test that a missing section is an error."""
+        with pytest.raises(ValueError, match="Section not found"):
+            reader.read("note.md", section="Nope")
+
+    def test_read_lines_and_bytes(self, reader):
+        """Test line and byte ranges."""
+        assert reader.read("note.md", start_line=5, end_line=5).text == "# Title\n"
+        assert reader.read("note.md", start_byte=0, end_byte=3).text == "---"
+
+    def test_max_chars_and_continuation(self, reader):
+        """Test that a truncated excerpt can be continued from its end."""
+        first = reader.read("note.md", section="Follow-up", max_chars=5)
+        assert first.text == "## Fo"
+        assert first.truncated
+
+        rest = reader.read("note.md", start_byte=first.end, end_byte=first.requested_end)
+        assert first.text + rest.text == "## Follow-up\n\nQuestions.\n"
+
+    def test_rejects_mixed_selectors(self, reader):
+        """Test that only one kind of range is accepted."""
+        with pytest.raises(ValueError):
+            reader.read("note.md", section="Title", start_line=1)
+
+    def test_heading_table_follows_edits(self, reader):
+        """Test that the cached heading table is rebuilt when the note changes."""
+        assert len(reader.headings("note.md")) == 4
+
+        reader.file_manager.write_note("note.md", NOTE + "\n## Added\n\nNew section.\n")
+        assert reader.read("note.md", section="Added").text == "## Added\n\nNew section.\n"
+
+    def test_missing_note(self, reader):
+        """Test reading a note that does not exist."""
+        with pytest.raises(FileNotFoundError):
+            reader.read("missing.md", section="Title")
@@ -0,0 +1,126 @@
+"""Tests for the tag bitmap index."""
+
+import pytest
+from mcp_notes.lib.index import NoteIndex
+from mcp_notes.lib.search import SearchEngine
+from mcp_notes.lib.tags import bitmap_ids
+from tests.conftest import make_note
+
+
+@pytest.fixture
+def seed_notes():
+    """A few tagged notes, and one without tags."""
+    return {
+        "a.md": make_note("Asyncio", "asyncio event loop", ["python", "async"]),
+        "b.md": make_note("Threads", "asyncio versus threads", ["python"]),
+        "c.md": make_note("Tokio", "asyncio in rust terms", ["rust", "async"]),
+        "d.md": make_note("Untagged", "asyncio without tags"),
+    }
+
+
+def filenames(index: NoteIndex, doc_ids) -> set:
+    return {index.docs[doc_id].filename for doc_id in doc_ids}
+
+
+class TestTagIndex:
+    """Test tag bitmaps."""
+
+    def test_bitmap_ids(self):
+        """Test decoding a bitmap into doc ids."""
+        assert bitmap_ids(0) == []
+        assert bitmap_ids(0b101001) == [0, 3, 5]
+
+    def test_filter_modes(self, file_manager):
+        """Test any/all/none tag filters."""
+        index = NoteIndex(file_manager)
+        index.refresh()
+        tags = index.tag_index
+
+        assert filenames(index, tags.filter(["python", "rust"], "any")) == {"a.md", "b.md", "c.md"}
+        assert filenames(index, tags.filter(["python", "async"], "all")) == {"a.md"}
+        assert filenames(index, tags.filter(["python"], "none")) == {"c.md", "d.md"}
+        assert tags.filter(["missing"], "all") == []
+        assert tags.tags() == {"python": 2, "async": 2, "rust": 1}
+
+        with pytest.raises(ValueError):
+            tags.filter(["python"], "some")
+
+    def test_bitmaps_follow_edits(self, file_manager):
+        """Test that retagging and deleting notes update the bitmaps."""
+        index = NoteIndex(file_manager)
+        index.refresh()
+        doc_id = index.get("b.md").doc_id
+
+        file_manager.write_note("b.md", make_note("Threads", "now about rust", ["rust"]))
+        file_manager.delete_note("c.md")
+        index.refresh()
+
+        # Reindexed notes keep their doc id
+        assert index.get("b.md").doc_id == doc_id
+        assert filenames(index, index.tag_index.filter(["python"])) == {"a.md"}
+        assert filenames(index, index.tag_index.filter(["rust"])) == {"b.md"}
+        assert "async" in index.tag_index.bitmaps
+        assert bitmap_ids(index.tag_index.all_docs) == sorted(index.docs)
+
+
+class TestTagFilters:
+    """Test tag filters in the search engine."""
+
+    def test_search_tag_modes(self, file_manager):
+        """Test search results filtered with each tag mode."""
+        engine = SearchEngine(file_manager)
+
+        def search(tags, tag_mode):
+            return {r.filename for r in engine.search_notes("asyncio", tags=tags, tag_mode=tag_mode)}
+
+        assert search(["async"], "any") == {"a.md", "c.md"}
+        assert search(["python", "async"], "all") == {"a.md"}
+        assert search(["async"], "none") == {"b.md", "d.md"}
+
+    def test_substring_search_reads_only_tagged_notes(self, file_manager, monkeypatch):
+        """Test that the tag filter is applied before any note is read."""
+        engine = SearchEngine(file_manager)
+        engine.index.refresh()
+        reads = []
+        original_read = file_manager.read_note
+        monkeypatch.setattr(file_manager, "read_note", lambda name: reads.append(name) or original_read(name))
+
+        results = engine.search_notes("asyncio", tags=["rust"], mode="substring")
+
+        assert [r.filename for r in results] == ["c.md"]
+        assert reads == ["c.md"]
+
+    @pytest.mark.parametrize("ranking", ["bm25f", "classic"])
+    def test_term_search_scores_only_tagged_notes(self, file_manager, monkeypatch, ranking):
+        """Test that the tag filter is applied before any note is scored."""
+        engine = SearchEngine(file_manager)
+        scorer = engine.scorers[ranking]
+        scored = []
+        original_score = scorer.score
+        monkeypatch.setattr(
+            scorer, "score", lambda weights, doc_id: scored.append(doc_id) or original_score(weights, doc_id)
+        )
+
+        results = engine.search_notes("asyncio", tags=["rust"], ranking=ranking)
+
+        assert [r.filename for r in results] == ["c.md"]
+        assert filenames(engine.index, scored) == {"c.md"}
+
+    def test_query_tag_qualifiers(self, file_manager):
+        """Test tag: and -tag: qualifiers resolved through the bitmaps."""
+        engine = SearchEngine(file_manager)
+
+        results = engine.search_notes("asyncio tag:async -tag:rust")
+
+        assert [r.filename for r in results] == ["a.md"]
+
+    def test_get_notes_by_tags(self, file_manager):
+        """Test listing notes by tag from the index."""
+        engine = SearchEngine(file_manager)
+
+        notes = engine.get_notes_by_tags(["async"])
+        assert {note['filename'] for note in notes} == {"a.md", "c.md"}
+        assert {note['title'] for note in notes} == {"Asyncio", "Tokio"}
+
+        notes = engine.get_notes_by_tags(["python", "async"], tag_mode="all")
+        assert [note['filename'] for note in notes] == ["a.md"]
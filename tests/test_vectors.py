@@ -0,0 +1,116 @@
+"""Tests for vector similarity search."""
+
+import pytest
+from mcp_notes.lib.index import NoteIndex
+from mcp_notes.lib.search import SearchEngine
+from tests.conftest import make_note
+
+np = pytest.importorskip("numpy")
+
+from mcp_notes.lib.vectors import VectorIndex, MATRIX_FILENAME
+
+
+@pytest.fixture
+def seed_notes():
+    """A few notes to embed."""
+    return {
+        "asyncio.md": make_note("Asyncio", "event loop coroutines await tasks"),
+        "rust.md": make_note("Rust", "ownership borrow checker lifetimes"),
+        "threads.md": make_note("Threads", "thread pool locks and event queues", ["python"]),
+    }
+
+
+def build(file_manager, directory=None):
+    index = NoteIndex(file_manager)
+    vectors = VectorIndex(index, directory, dim=64)
+    index.add_extension(vectors)
+    index.refresh()
+    return index, vectors
+
+
+class TestVectorIndex:
+    """Test the embedding matrix."""
+
+    def test_rows_are_normalised_float32(self, file_manager):
+        """Test that each note gets one unit-length float32 row."""
+        index, vectors = build(file_manager)
+
+        assert vectors.matrix.dtype == np.float32
+        assert len(vectors.rows) == 3
+        for row in vectors.rows.values():
+            assert np.linalg.norm(vectors.matrix[row]) == pytest.approx(1.0, abs=1e-5)
+
+    def test_search_ranks_by_similarity(self, file_manager):
+        """Test top-k ranking by cosine similarity."""
+        index, vectors = build(file_manager)
+
+        ranked, total = vectors.search("event loop coroutines", 2)
+
+        assert total >= 1
+        assert len(ranked) <= 2
+        assert index.docs[ranked[0][1]].filename == "asyncio.md"
+        assert vectors.search("", 2) == ([], 0)
+
+    def test_search_restricted_to_doc_ids(self, file_manager):
+        """Test limiting the search to a subset of notes."""
+        index, vectors = build(file_manager)
+
+        ranked, total = vectors.search("event", 5, [index.get("threads.md").doc_id])
+
+        assert [index.docs[doc_id].filename for _, doc_id in ranked] == ["threads.md"]
+        assert total == 1
+
+    def test_incremental_update_and_removal(self, file_manager):
+        """Test that new and deleted notes update the matrix."""
+        index, vectors = build(file_manager)
+
+        file_manager.write_note("go.md", make_note("Go", "goroutines channels select"))
+        file_manager.delete_note("rust.md")
+        index.refresh()
+
+        assert "go.md" in vectors.rows
+        assert "rust.md" not in vectors.rows
+        ranked, _ = vectors.search("goroutines", 1)
+        assert index.docs[ranked[0][1]].filename == "go.md"
+        assert vectors.search("borrow checker", 3) == ([], 0)
+
+    def test_persisted_matrix_is_memory_mapped(self, file_manager, tmp_path):
+        """Test saving the matrix and loading it back with mmap."""
+        index, vectors = build(file_manager, str(tmp_path))
+        vectors.save()
+        assert (tmp_path / MATRIX_FILENAME).exists()
+
+        reloaded = VectorIndex(NoteIndex(file_manager), str(tmp_path), dim=64)
+        assert isinstance(reloaded.matrix, np.memmap)
+        assert reloaded.rows == vectors.rows
+        np.testing.assert_array_equal(reloaded.matrix[:3], vectors.matrix[:3])
+
+    def test_reload_reuses_unchanged_rows(self, file_manager, tmp_path, monkeypatch):
+        """Test that only notes changed since the save are embedded again."""
+        index, vectors = build(file_manager, str(tmp_path))
+        vectors.save()
+        file_manager.write_note("rust.md", make_note("Rust", "traits and generics"))
+
+        embedded = []
+        embed_document = VectorIndex.embed_document
+        monkeypatch.setattr(
+            VectorIndex, "embed_document",
+            lambda self, doc_id: embedded.append(self.index.docs[doc_id].filename) or embed_document(self, doc_id)
+        )
+        index, reloaded = build(file_manager, str(tmp_path))
+
+        assert embedded == ["rust.md"]
+        assert reloaded.active[:3].all()
+        ranked, _ = reloaded.search("coroutines", 1)
+        assert index.docs[ranked[0][1]].filename == "asyncio.md"
+        assert reloaded.search("borrow checker", 3) == ([], 0)
+
+    def test_semantic_search_mode(self, file_manager):
+        """Test semantic mode through the search engine."""
+        index = NoteIndex(file_manager)
+        engine = SearchEngine(file_manager, index, vectors=VectorIndex(index, dim=64))
+
+        response = engine.search("ownership lifetimes", mode="semantic")
+
+        assert response.results[0].filename == "rust.md"
+        assert not engine.search("ownership", mode="semantic", tags=["python"]).results
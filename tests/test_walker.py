@@ -0,0 +1,99 @@
+"""Tests for recursive vault listing."""
+
+import os
+from pathlib import Path
+
+from mcp_notes.lib.file_manager import FileManager
+from mcp_notes.lib.walker import VaultWalker
+
+
+def make_vault(root: Path) -> None:
+    for relpath in [
+        "top.md",
+        "projects/plan.md",
+        "projects/deep/nested.md",
+        "templates/daily.md",
+        ".obsidian/workspace.md",
+        ".git/notes.md",
+        "projects/image.png",
+    ]:
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# Note\n", encoding='utf-8')
+
+
+def settle(root: Path) -> None:
+    """Backdate directory mtimes so their snapshots are trusted."""
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, ns=(0, 10**18))
+
+
+class TestVaultWalker:
+    """Test listing notes with os.scandir."""
+
+    def test_lists_nested_notes_and_prunes(self, temp_vault):
+        """Test that hidden folders and ignore patterns are skipped."""
+        root = Path(temp_vault)
+        make_vault(root)
+
+        assert VaultWalker(root).list_notes() == [
+            "projects/deep/nested.md", "projects/plan.md", "templates/daily.md", "top.md"
+        ]
+        assert VaultWalker(root, ["templates"]).list_notes() == [
+            "projects/deep/nested.md", "projects/plan.md", "top.md"
+        ]
+        assert VaultWalker(root, ["projects/*"]).list_notes() == ["templates/daily.md", "top.md"]
+
+    def test_scan_returns_stats(self, temp_vault):
+        """Test that scan reports each note's stat key."""
+        root = Path(temp_vault)
+        make_vault(root)
+
+        stats = VaultWalker(root).scan()
+        stat = (root / "projects/plan.md").stat()
+        assert stats["projects/plan.md"] == (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        assert len(stats) == 4
+
+    def test_unchanged_directories_are_not_rescanned(self, temp_vault):
+        """Test resuming from the directory mtime snapshot."""
+        root = Path(temp_vault)
+        make_vault(root)
+        settle(root)
+        walker = VaultWalker(root)
+        walker.list_notes()
+        scanned = walker.dirs_scanned
+
+        assert len(walker.list_notes()) == 4
+        assert walker.dirs_scanned == scanned
+        assert walker.dirs_reused == scanned
+
+        (root / "projects/deep/added.md").write_text("# Added\n", encoding='utf-8')
+        assert "projects/deep/added.md" in walker.list_notes()
+        assert walker.dirs_scanned == scanned + 1
+
+    def test_recently_modified_directory_is_rescanned(self, temp_vault):
+        """Test that a snapshot taken in the same mtime tick isn't trusted."""
+        root = Path(temp_vault)
+        walker = VaultWalker(root)
+        walker.list_notes()
+
+        (root / "new.md").write_text("# New\n", encoding='utf-8')
+        os.utime(root, ns=(0, walker._snapshot[''].mtime_ns))
+        assert walker.list_notes() == ["new.md"]
+
+    def test_is_ignored(self, temp_vault):
+        """Test the ignore check used for watcher events."""
+        walker = VaultWalker(temp_vault, ["*.draft.md"])
+
+        assert walker.is_ignored(".obsidian/x.md")
+        assert walker.is_ignored("a/b.draft.md")
+        assert not walker.is_ignored("a/b.md")
+
+    def test_file_manager_reads_nested_notes(self, temp_vault):
+        """Test that nested filenames work throughout the file manager."""
+        root = Path(temp_vault)
+        make_vault(root)
+        file_manager = FileManager(temp_vault)
+
+        assert "projects/plan.md" in file_manager.list_notes()
+        assert file_manager.read_note("projects/plan.md") == "# Note\n"
@@ -0,0 +1,234 @@
+"""Tests for vault change watching."""
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from mcp_notes.lib.file_manager import FileManager
+from mcp_notes.lib.index import NoteIndex
+from mcp_notes.lib.watcher import RESCAN, PollingBackend, VaultWatcher, inotify_available
+
+
+requires_inotify = pytest.mark.skipif(not inotify_available(), reason="inotify is not available")
+
+
+def write_note(vault: str, filename: str, title: str) -> None:
+    (Path(vault) / filename).write_text(f"# {title}\n\nSome body text.")
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out waiting for watcher"
+        await asyncio.sleep(0.01)
+
+
+class TestVaultWatcher:
+    """Test debounced change reporting."""
+
+    @requires_inotify
+    @pytest.mark.asyncio
+    async def test_inotify_batches_burst(self, temp_vault):
+        """Test that a burst of writes is delivered as a single batch."""
+        batches = []
+        watcher = VaultWatcher(FileManager(temp_vault), batches.append, "inotify", debounce=0.05)
+        await watcher.start()
+        try:
+            for i in range(5):
+                write_note(temp_vault, f"note-{i}.md", f"Note {i}")
+            (Path(temp_vault) / "ignored.txt").write_text("not a note")
+
+            await wait_for(lambda: batches)
+            await asyncio.sleep(0.1)
+        finally:
+            await watcher.stop()
+
+        assert batches == [{f"note-{i}.md" for i in range(5)}]
+        assert watcher.stats()['batches'] == 1
+
+    @requires_inotify
+    @pytest.mark.asyncio
+    async def test_flush_delivers_pending_changes(self, temp_vault):
+        """Test that flush delivers events that were not read yet."""
+        batches = []
+        watcher = VaultWatcher(FileManager(temp_vault), batches.append, "inotify", debounce=10)
+        await watcher.start()
+        try:
+            write_note(temp_vault, "note.md", "Note")
+            watcher.flush()
+        finally:
+            await watcher.stop()
+
+        assert batches == [{"note.md"}]
+
+    @requires_inotify
+    @pytest.mark.asyncio
+    async def test_overflow_requests_rescan(self, temp_vault):
+        """Test that a lost watch is reported as a rescan."""
+        batches = []
+        watcher = VaultWatcher(FileManager(temp_vault), batches.append, "inotify", debounce=10)
+        await watcher.start()
+        try:
+            write_note(temp_vault, "note.md", "Note")
+            watcher.backend.libc.inotify_rm_watch(watcher.backend.fd, 1)
+            watcher.flush()
+        finally:
+            await watcher.stop()
+
+        assert batches == [RESCAN]
+
+    @pytest.mark.asyncio
+    async def test_polling_fallback(self, temp_vault):
+        """Test that the polling backend reports created and deleted notes."""
+        write_note(temp_vault, "old.md", "Old")
+        batches = []
+        watcher = VaultWatcher(FileManager(temp_vault), batches.append, "poll", debounce=0.01, poll_interval=0.02)
+        await watcher.start()
+        try:
+            assert isinstance(watcher.backend, PollingBackend)
+            write_note(temp_vault, "new.md", "New")
+            (Path(temp_vault) / "old.md").unlink()
+            await wait_for(lambda: batches)
+        finally:
+            await watcher.stop()
+
+        assert batches[0] == {"new.md", "old.md"}
+        assert not watcher.running
+
+    @pytest.mark.asyncio
+    async def test_polling_scans_off_the_event_loop(self, temp_vault, monkeypatch):
+        """Test that polling scans the vault on another thread."""
+        file_manager = FileManager(temp_vault)
+        threads = []
+        scan_notes = file_manager.scan_notes
+        monkeypatch.setattr(
+            file_manager, "scan_notes", lambda: threads.append(threading.get_ident()) or scan_notes()
+        )
+        watcher = VaultWatcher(file_manager, lambda changes: None, "poll", poll_interval=0.01)
+        await watcher.start()
+        try:
+            await wait_for(lambda: len(threads) >= 2)
+        finally:
+            await watcher.stop()
+
+        assert threading.get_ident() not in threads
+
+
+class TestTargetedRefresh:
+    """Test refreshing only the notes a watcher reported."""
+
+    def test_refresh_given_filenames(self, temp_vault):
+        """Test that only the named notes are checked."""
+        file_manager = FileManager(temp_vault)
+        write_note(temp_vault, "a.md", "Alpha")
+        index = NoteIndex(file_manager)
+        index.refresh()
+
+        write_note(temp_vault, "b.md", "Beta")
+        (Path(temp_vault) / "a.md").unlink()
+        generation = file_manager.generation
+
+        assert index.refresh(["b.md"])
+        assert index.get("a.md") is not None
+        assert index.get("b.md").title == "Beta"
+        assert file_manager.generation > generation
+
+        assert index.refresh(["a.md"])
+        assert index.get("a.md") is None
+        assert not index.refresh(["a.md", "b.md"])
+
+
+class TestServerWatching:
+    """Test the server keeping its indexes current from watcher events."""
+
+    @pytest.mark.asyncio
+    async def test_external_note_found_while_watching(self, mcp_server, sample_note_params):
+        """Test that notes written by another editor are indexed by the watcher."""
+        await mcp_server._create_note(sample_note_params)
+        await mcp_server.start_watcher()
+        try:
+            assert mcp_server.watching
+
+            write_note(mcp_server.file_manager.vault_path, "external.md", "External Note")
+            result = await mcp_server._list_notes({})
+            assert "Found 2 total note(s)" in result[0].text
+
+            result = await mcp_server._search_notes({"query": "external"})
+            assert "External Note" in result[0].text
+        finally:
+            await mcp_server.stop_watcher()
+
+        assert not mcp_server.watching
+
+    @pytest.mark.asyncio
+    async def test_search_refreshes_once_without_watcher(self, mcp_server, sample_note_params, monkeypatch):
+        """Test that a search without the watcher rescans the vault once."""
+        await mcp_server._create_note(sample_note_params)
+        refreshes = []
+        refresh = mcp_server.note_index.refresh
+        monkeypatch.setattr(
+            mcp_server.note_index, "refresh", lambda filenames=None: refreshes.append(filenames) or refresh(filenames)
+        )
+
+        await mcp_server._search_notes({"query": "test"})
+
+        assert refreshes == [None]
+
+
+class TestNestedWatching:
+    """Test watching notes in subfolders."""
+
+    @requires_inotify
+    @pytest.mark.asyncio
+    async def test_inotify_watches_subfolders(self, temp_vault):
+        """Test that notes in existing and new subfolders are reported."""
+        (Path(temp_vault) / "projects").mkdir()
+        batches = []
+        watcher = VaultWatcher(FileManager(temp_vault), batches.append, "inotify", debounce=10)
+        await watcher.start()
+        try:
+            write_note(temp_vault, "projects/plan.md", "Plan")
+            watcher.flush()
+
+            (Path(temp_vault) / "archive").mkdir()
+            watcher.flush()
+            # Watches are re-synced off the event loop
+            await wait_for(lambda: "archive" in watcher.backend.watches.values())
+            watcher.flush()
+            write_note(temp_vault, "archive/old.md", "Old")
+            watcher.flush()
+        finally:
+            await watcher.stop()
+
+        assert batches == [{"projects/plan.md"}, RESCAN, {"archive/old.md"}]
+
+    @requires_inotify
+    @pytest.mark.asyncio
+    async def test_vault_walks_stay_off_the_event_loop(self, temp_vault, monkeypatch):
+        """Test that re-syncing watches and falling back to polling walk the vault off the loop."""
+        file_manager = FileManager(temp_vault)
+        threads = []
+        directories = file_manager.walker.directories
+        scan_notes = file_manager.scan_notes
+        monkeypatch.setattr(
+            file_manager.walker, "directories", lambda: threads.append(threading.get_ident()) or directories()
+        )
+        monkeypatch.setattr(
+            file_manager, "scan_notes", lambda: threads.append(threading.get_ident()) or scan_notes()
+        )
+        batches = []
+        watcher = VaultWatcher(file_manager, batches.append, "inotify", debounce=10, poll_interval=0.01)
+        await watcher.start()
+        try:
+            (Path(temp_vault) / "archive").mkdir()
+            watcher.flush()
+            await wait_for(lambda: "archive" in watcher.backend.watches.values())
+
+            watcher._fall_back_to_polling()
+            await wait_for(lambda: len(threads) >= 4)
+        finally:
+            await watcher.stop()
+
+        assert threading.get_ident() not in threads